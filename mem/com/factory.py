@@ -1,6 +1,7 @@
 import importlib
 from typing import Optional
 
+from mem.embeddings.cache import CachedEmbedding, shared_cache
 from mem.embeddings.configs import BaseEmbedderConfig
 from mem.llms.configs import BaseLlmConfig
 
@@ -38,7 +39,11 @@ class EmbedderFactory:
         if class_type:
             embedder_instance = load_class(class_type)
             base_config = BaseEmbedderConfig(**config)
-            return embedder_instance(base_config)
+            embedder = embedder_instance(base_config)
+            if base_config.cache_max_bytes or base_config.cache_path:
+                cache = shared_cache(max_bytes=base_config.cache_max_bytes or 64 * 1024 * 1024, path=base_config.cache_path)
+                embedder = CachedEmbedding(embedder, cache, provider=provider_name)
+            return embedder
         else:
             raise ValueError(f"Unsupported Embedder provider: {provider_name}")
 
@@ -47,6 +52,10 @@ class VectorStoreFactory:
     provider_to_class = {
         "qdrant": "mem.vector_stores.qdrant.Qdrant",
         "milvus": "mem.vector_stores.milvus.MilvusDB",
+        "faiss": "mem.vector_stores.faiss.FAISS",
+        "faiss_sharded": "mem.vector_stores.faiss_sharded.ShardedFAISS",
+        "numpy": "mem.vector_stores.numpy_store.NumpyStore",
+        "cached": "mem.vector_stores.cached.CachedVectorStore",
     }
 
     @classmethod
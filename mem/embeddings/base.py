@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
 
 from mem.embeddings.configs import BaseEmbedderConfig
 
@@ -11,6 +14,10 @@ class EmbeddingBase(ABC):
     :type config: Optional[BaseEmbedderConfig], optional
     """
 
+    # Request limits of the provider, used when the config does not set its own
+    max_batch_size = 1
+    max_batch_tokens = None
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         if config is None:
             self.config = BaseEmbedderConfig()
@@ -29,3 +36,64 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None) -> np.ndarray:
+        """
+        Get the embeddings for several texts, in as few requests as the provider allows.
+
+        The texts are split into chunks within the provider's batch size and token limit, and the
+        chunks are embedded concurrently.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            np.ndarray: One float32 embedding row per text, in the order of the texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.config.embedding_dims or 0), dtype=np.float32)
+        chunks = self._chunks(texts)
+        if len(chunks) == 1:
+            embeddings = [self._embed_chunk(chunks[0], memory_action)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.config.max_concurrency, len(chunks))) as pool:
+                embeddings = list(pool.map(lambda chunk: self._embed_chunk(chunk, memory_action), chunks))
+        return np.asarray([vector for chunk in embeddings for vector in chunk], dtype=np.float32)
+
+    def embed_unique(
+        self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None
+    ) -> Dict[str, List[float]]:
+        """
+        Get the embeddings of several texts by text, embedding each distinct text once.
+
+        Args:
+            texts (list[str]): The texts to embed; duplicates are embedded once.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            dict: Embedding of each text, by text.
+        """
+        texts = list(dict.fromkeys(texts))
+        if not texts:
+            return {}
+        return dict(zip(texts, self.embed_batch(texts, memory_action).tolist()))
+
+    def _chunks(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized chunks, keeping their order."""
+        batch_size = self.config.batch_size or self.max_batch_size
+        max_tokens = self.config.max_batch_tokens or self.max_batch_tokens
+        chunks, chunk, tokens = [], [], 0
+        for text in texts:
+            # A token covers at least one byte, so the UTF-8 length bounds the token count
+            size = len(text.encode("utf-8"))
+            if chunk and (len(chunk) >= batch_size or (max_tokens and tokens + size > max_tokens)):
+                chunks.append(chunk)
+                chunk, tokens = [], 0
+            chunk.append(text)
+            tokens += size
+        chunks.append(chunk)
+        return chunks
+
+    def _embed_chunk(self, texts: List[str], memory_action=None) -> List[List[float]]:
+        """Embed one chunk of texts; providers with a batch endpoint override this to send one request."""
+        return [self.embed(text, memory_action) for text in texts]
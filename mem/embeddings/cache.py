@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Literal, Optional
+
+import numpy as np
+from loguru import logger
+
+from mem.embeddings.base import EmbeddingBase
+
+
+class EmbeddingCache:
+    """
+    Embeddings by key, in an in-memory LRU bounded in bytes, backed by an optional SQLite file.
+
+    The SQLite file is opened in WAL mode, so several processes, e.g. gunicorn workers, can
+    share it: each keeps its own in-memory tier and they all read and fill the same file.
+    The file is only accessed outside the lock of the in-memory tier, and writes give up
+    after `busy_timeout` seconds, so a busy writer never stalls lookups served from memory.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None, busy_timeout: float = 0.5):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.nbytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the shared connection, separately from the in-memory tier
+        self._db_lock = threading.Lock()
+        self._conn = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Add an entry to the in-memory tier, evicting the least recently used ones beyond the budget."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        size = vector.nbytes + len(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = vector
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            old_key, old_vector = self._entries.popitem(last=False)
+            self.nbytes -= old_vector.nbytes + len(old_key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look embeddings up, in memory first and then on disk.
+
+        Args:
+            keys (Iterable[str]): Cache keys.
+
+        Returns:
+            Dict[str, np.ndarray]: The embeddings found, by key.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            self.memory_hits += len(found)
+        missing = [key for key in keys if key not in found]
+        loaded = {}
+        if missing and self._conn is not None:
+            try:
+                with self._db_lock:
+                    for start in range(0, len(missing), self.BATCH_SIZE):
+                        batch = missing[start : start + self.BATCH_SIZE]
+                        rows = self._conn.execute(
+                            f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                        )
+                        for key, blob in rows:
+                            loaded[key] = np.frombuffer(blob, dtype=np.float32)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Could not read cached embeddings: {e}")
+        found.update(loaded)
+        with self._lock:
+            for key, vector in loaded.items():
+                self._remember(key, vector)
+            self.disk_hits += len(loaded)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, np.ndarray]):
+        """
+        Store embeddings in memory and, when configured, on disk.
+
+        Args:
+            entries (Dict[str, np.ndarray]): Embeddings by key.
+        """
+        entries = {key: np.asarray(vector, dtype=np.float32) for key, vector in entries.items()}
+        with self._lock:
+            for key, vector in entries.items():
+                self._remember(key, vector)
+        if self._conn is not None and entries:
+            try:
+                with self._db_lock:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, vector.tobytes()) for key, vector in entries.items()],
+                    )
+            except sqlite3.OperationalError as e:
+                # Another process holding the write lock only costs a later re-embedding
+                logger.warning(f"Could not persist {len(entries)} embeddings: {e}")
+
+    def stats(self) -> Dict:
+        """Hit and miss counts of this process, and the size of the in-memory tier."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+            }
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_CACHES: Dict[tuple, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def shared_cache(max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None) -> EmbeddingCache:
+    """
+    The process-wide cache for these settings, so that every embedder using them shares one.
+
+    Args:
+        max_bytes (int, optional): Budget of the in-memory tier. Defaults to 64 MiB.
+        path (str, optional): SQLite file backing the cache. Defaults to None, memory only.
+
+    Returns:
+        EmbeddingCache: The shared cache.
+    """
+    key = (max_bytes, os.path.abspath(path) if path else None)
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = EmbeddingCache(max_bytes=max_bytes, path=path)
+        return _CACHES[key]
+
+
+class CachedEmbedding(EmbeddingBase):
+    """Serve repeated texts from an `EmbeddingCache` and embed only the rest with the wrapped embedder.
+
+    Keys hash the provider, model, embedding dimensions and NFC-normalised text, so caches can be
+    shared by embedders of different models. Whitespace is kept as is, since providers embed
+    texts differing only in whitespace differently. The memory action is not part of the key, as no
+    provider embeds differently per action.
+
+    :param embedder: Embedder to wrap
+    :type embedder: EmbeddingBase
+    :param cache: Cache to use
+    :type cache: EmbeddingCache
+    :param provider: Provider name of the embedder, defaults to its class name
+    :type provider: Optional[str], optional
+    """
+
+    def __init__(self, embedder: EmbeddingBase, cache: EmbeddingCache, provider: Optional[str] = None):
+        super().__init__(embedder.config)
+        self.embedder = embedder
+        self.cache = cache
+        self.provider = provider or type(embedder).__name__
+
+    def _key(self, text: str) -> str:
+        normalized = unicodedata.normalize("NFC", text)
+        identity = [self.provider, self.config.model, self.config.embedding_dims, normalized]
+        return hashlib.sha256(json.dumps(identity, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embedding for the given text, from the cache when it was embedded before.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return self.embed_batch([text], memory_action)[0].tolist()
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None) -> np.ndarray:
+        """
+        Get the embeddings for several texts, embedding only the ones not cached, in one batch.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            np.ndarray: One float32 embedding row per text, in the order of the texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return self.embedder.embed_batch([], memory_action)
+        keys = [self._key(text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            embedded = self.embedder.embed_batch(list(missing.values()), memory_action)
+            new_entries = dict(zip(missing, embedded))
+            self.cache.put_many(new_entries)
+            found.update(new_entries)
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+    def stats(self) -> Dict:
+        """Hit and miss counts of the cache."""
+        return self.cache.stats()
@@ -19,6 +19,13 @@ class BaseEmbedderConfig(ABC):
         embedding_dims: Optional[int] = None,
         # Openai specific
         openai_base_url: Optional[str] = None,
+        # Batching
+        batch_size: Optional[int] = None,
+        max_batch_tokens: Optional[int] = None,
+        max_concurrency: int = 4,
+        # Caching
+        cache_max_bytes: Optional[int] = None,
+        cache_path: Optional[str] = None,
     ):
         """
         Initializes a configuration class instance for the Embeddings.
@@ -30,12 +37,27 @@ class BaseEmbedderConfig(ABC):
         :param embedding_dims: The number of dimensions in the embedding, defaults to None
         :type embedding_dims: Optional[int], optional
         :type openai_base_url: Optional[str], optional
+        :param batch_size: Most texts per embedding request, defaults to the provider's limit
+        :type batch_size: Optional[int], optional
+        :param max_batch_tokens: Most tokens per embedding request, defaults to the provider's limit
+        :type max_batch_tokens: Optional[int], optional
+        :param max_concurrency: Embedding requests sent at the same time by `embed_batch`, defaults to 4
+        :type max_concurrency: int, optional
+        :param cache_max_bytes: Budget of the in-memory embedding cache, which is enabled by setting it or cache_path, defaults to None
+        :type cache_max_bytes: Optional[int], optional
+        :param cache_path: SQLite file persisting cached embeddings, shareable between processes, defaults to None
+        :type cache_path: Optional[str], optional
         """
 
         self.model = model
         self.api_key = api_key
         self.openai_base_url = openai_base_url
         self.embedding_dims = embedding_dims
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_path = cache_path
 
 
 class EmbedderConfig(BaseModel):
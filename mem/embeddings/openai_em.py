@@ -1,6 +1,6 @@
 import os
 import warnings
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import OpenAI
 
@@ -9,6 +9,10 @@ from mem.embeddings.base import EmbeddingBase
 
 
 class OpenAIEmbedding(EmbeddingBase):
+    # Inputs and tokens the embeddings endpoint accepts per request
+    max_batch_size = 2048
+    max_batch_tokens = 300000
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         super().__init__(config)
 
@@ -47,3 +51,20 @@ class OpenAIEmbedding(EmbeddingBase):
             .data[0]
             .embedding
         )
+
+    def _embed_chunk(self, texts: List[str], memory_action=None) -> List[List[float]]:
+        """
+        Embed a chunk of texts with one request.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in the order of the texts.
+        """
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model=self.config.model,
+            dimensions=self.config.embedding_dims,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -237,8 +237,9 @@ class MemoryGraph:
     def _search_graph_db(self, node_list, filters, limit=100):
         """Search similar nodes among and their respective incoming and outgoing relations."""
         result_relations = []
+        node_embeddings = self.embedding_model.embed_unique(node_list)
         for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
+            n_embedding = node_embeddings[node]
 
             cypher_query = f"""
             MATCH (n {self.node_label})
@@ -327,6 +328,9 @@ class MemoryGraph:
     def _add_entities(self, to_be_added, user_id, entity_type_map):
         """Add the new entities to the graph. Merge the nodes if they already exist."""
         results = []
+        entity_embeddings = self.embedding_model.embed_unique(
+            [item["source"] for item in to_be_added] + [item["destination"] for item in to_be_added]
+        )
         for item in to_be_added:
             # entities
             source = item["source"]
@@ -342,8 +346,8 @@ class MemoryGraph:
             destination_extra_set = f", destination:`{destination_type}`" if self.node_label else ""
 
             # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
+            source_embedding = entity_embeddings[source]
+            dest_embedding = entity_embeddings[destination]
 
             # search for the nodes with the closest embeddings
             source_node_search_result = self._search_source_node(source_embedding, user_id, threshold=0.9)
@@ -352,6 +352,7 @@ class Memory(MemoryBase):
         if not infer:
             """原始文本，直接写入."""
             returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -363,7 +364,13 @@ class Memory(MemoryBase):
 
                 if message_dict["role"] == "system":
                     continue
+                valid_messages.append(message_dict)
 
+            # All messages are embedded with one batched request
+            msg_embeddings = self.embedding_model.embed_unique(
+                [message_dict["content"] for message_dict in valid_messages], "add"
+            )
+            for message_dict in valid_messages:
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -372,8 +379,7 @@ class Memory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = self.embedding_model.embed(msg_content, "add")
-                mem_id = self._create_memory(msg_content, msg_embeddings, per_msg_meta)
+                mem_id = self._create_memory(msg_content, msg_embeddings[msg_content], per_msg_meta)
 
                 returned_memories.append(
                     {
@@ -425,18 +431,20 @@ class Memory(MemoryBase):
             new_retrieved_facts = []
 
         retrieved_old_memory = []
-        new_message_embeddings = {}
-        for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem, "add")
-            new_message_embeddings[new_mem] = messages_embeddings
-            existing_memories = self.vector_store.search(
-                query=new_mem,
-                vectors=messages_embeddings,
-                limit=3,
+        new_message_embeddings = self.embedding_model.embed_unique(new_retrieved_facts, "add")
+
+        # All facts are looked up in one round trip to the vector store
+        existing_memories = []
+        if new_message_embeddings:
+            existing_memories = self.vector_store.search_batch(
+                queries=list(new_message_embeddings),
+                vectors=list(new_message_embeddings.values()),
+                limits=3,
                 filters=filters,
                 threshold=0.6
             )
-            for mem in existing_memories:
+        for fact_memories in existing_memories:
+            for mem in fact_memories:
                 if mem.payload["type"] == mtype:
                     retrieved_old_memory.append({"id": mem.id, "text": mem.payload["data"]})
 
@@ -480,10 +488,9 @@ class Memory(MemoryBase):
                              update=new_memories_with_actions)
         logger.info(f"{sid} | update result:{json.dumps(update_result, ensure_ascii=False)}")
 
-        returned_memories = []
+        adds, updates, deletes = [], [], []
         try:
             for resp in new_memories_with_actions.get("memory", []):
-                # logger.info(resp)
                 try:
                     action_text = resp.get("text")
                     if not action_text:
@@ -492,38 +499,11 @@ class Memory(MemoryBase):
 
                     event_type = resp.get("event")
                     if event_type == "ADD":
-                        memory_id = self._create_memory(
-                            data=action_text,
-                            existing_embeddings=new_message_embeddings,
-                            metadata=deepcopy(metadata),
-                        )
-                        returned_memories.append({"id": memory_id, "memory": action_text, "event": event_type, "type": mtype})
+                        adds.append(action_text)
                     elif event_type == "UPDATE":
-                        self._update_memory(
-                            memory_id=temp_uuid_mapping[resp.get("id")],
-                            data=action_text,
-                            existing_embeddings=new_message_embeddings,
-                            metadata=deepcopy(metadata),
-                        )
-                        returned_memories.append(
-                            {
-                                "id": temp_uuid_mapping[resp.get("id")],
-                                "memory": action_text,
-                                "type": mtype,
-                                "event": event_type,
-                                "previous_memory": resp.get("old_memory"),
-                            }
-                        )
+                        updates.append((temp_uuid_mapping[resp.get("id")], action_text, resp.get("old_memory")))
                     elif event_type == "DELETE":
-                        self._delete_memory(memory_id=temp_uuid_mapping[resp.get("id")])
-                        returned_memories.append(
-                            {
-                                "id": temp_uuid_mapping[resp.get("id")],
-                                "memory": action_text,
-                                "event": event_type,
-                                "type": mtype
-                            }
-                        )
+                        deletes.append((temp_uuid_mapping[resp.get("id")], action_text))
                     elif event_type == "NONE":
                         logger.info(f"{sid} | extract | NOOP for Memory.")
                 except Exception as e:
@@ -531,6 +511,89 @@ class Memory(MemoryBase):
         except Exception as e:
             logger.error(f"{sid} | extract | Error iterating new_memories_with_actions: {e}")
 
+        return self._apply_memory_actions(adds, updates, deletes, new_message_embeddings, metadata, mtype, sid)
+
+    def _apply_memory_actions(self, adds, updates, deletes, existing_embeddings, metadata, mtype, sid=None):
+        """
+        Apply one extraction's memory actions with a bulk call per kind of action.
+
+        Args:
+            adds (list[str]): Texts of the memories to add.
+            updates (list[tuple]): (memory id, new text, previous text) of the memories to update.
+            deletes (list[tuple]): (memory id, text) of the memories to delete.
+            existing_embeddings (dict): Embeddings already computed, by text.
+            metadata (dict): Metadata of the new and updated memories.
+            mtype (str): Memory type.
+            sid (str, optional): ID of the request. Defaults to None.
+
+        Returns:
+            list: The applied actions, in the format returned by `add`.
+        """
+        returned_memories = []
+
+        # Texts the LLM rewrote were not embedded during extraction; embed them in one batch per action
+        existing_embeddings = dict(existing_embeddings)
+        existing_embeddings.update(
+            self.embedding_model.embed_unique([data for data in adds if data not in existing_embeddings], "add")
+        )
+        existing_embeddings.update(
+            self.embedding_model.embed_unique([data for _, data, _ in updates if data not in existing_embeddings], "update")
+        )
+
+        # UPDATE needs the current payloads and DELETE only applies to stored memories: one lookup for both
+        lookup_ids = list(dict.fromkeys([update[0] for update in updates] + [delete[0] for delete in deletes]))
+        existing = {}
+        if lookup_ids:
+            try:
+                found = self.vector_store.get_many(lookup_ids)
+                existing = {memory_id: memory for memory_id, memory in zip(lookup_ids, found) if memory is not None}
+            except Exception as e:
+                logger.error(f"{sid} | extract | Error getting memories {lookup_ids}: {e}")
+            for memory_id in lookup_ids:
+                if memory_id not in existing:
+                    logger.error(f"{sid} | extract | Memory {memory_id} not found, skipping its action.")
+
+        if adds:
+            memory_ids, vectors, payloads = [], [], []
+            for data in adds:
+                memory_ids.append(str(uuid.uuid4()))
+                vectors.append(self._embedding_for(data, existing_embeddings, "add"))
+                payloads.append(self._new_memory_payload(data, deepcopy(metadata)))
+            try:
+                self.vector_store.insert_many(vectors, payloads=payloads, ids=memory_ids)
+                returned_memories.extend(
+                    {"id": memory_id, "memory": data, "event": "ADD", "type": mtype}
+                    for memory_id, data in zip(memory_ids, adds)
+                )
+            except Exception as e:
+                logger.error(f"{sid} | extract | Error adding memories: {e}")
+
+        updates = [update for update in updates if update[0] in existing]
+        if updates:
+            vectors = [self._embedding_for(data, existing_embeddings, "update") for _, data, _ in updates]
+            payloads = [
+                self._updated_memory_payload(existing[memory_id], data, deepcopy(metadata))
+                for memory_id, data, _ in updates
+            ]
+            try:
+                self.vector_store.update_many([update[0] for update in updates], vectors=vectors, payloads=payloads)
+                returned_memories.extend(
+                    {"id": memory_id, "memory": data, "type": mtype, "event": "UPDATE", "previous_memory": previous}
+                    for memory_id, data, previous in updates
+                )
+            except Exception as e:
+                logger.error(f"{sid} | extract | Error updating memories: {e}")
+
+        deletes = [delete for delete in deletes if delete[0] in existing]
+        if deletes:
+            try:
+                self.vector_store.delete_many([delete[0] for delete in deletes])
+                returned_memories.extend(
+                    {"id": memory_id, "memory": data, "event": "DELETE", "type": mtype} for memory_id, data in deletes
+                )
+            except Exception as e:
+                logger.error(f"{sid} | extract | Error deleting memories: {e}")
+
         return returned_memories
 
     def _add_to_graph(self, messages, filters):
@@ -650,11 +713,15 @@ class Memory(MemoryBase):
             return {"results": all_memories_result}
 
     def _get_all_from_vector_store(self, filters, limit, sid=None):
+        if limit <= 0:
+            return []
         t0 = time.time()
-        memories_result = self.vector_store.list(filters=filters, limit=limit)
-        actual_memories = (
-            memories_result[0] if isinstance(memories_result, tuple) and len(memories_result) > 0 else memories_result
-        )
+        actual_memories = []
+        # Page through the store so large limits do not turn into one oversized request
+        for page in self.vector_store.iter_list(filters=filters, page_size=min(limit, 1000)):
+            actual_memories.extend(page[: limit - len(actual_memories)])
+            if len(actual_memories) >= limit:
+                break
 
         promoted_payload_keys = [
             "user_id",
@@ -835,11 +902,12 @@ class Memory(MemoryBase):
                 "At least one filter is required to delete all memories. If you want to delete all memories, use the `reset()` method."
             )
 
-        memories = self.vector_store.list(filters=filters)
-        for memory in memories:
-            self._delete_memory(memory.id)
+        # Collect the ids first so deletions do not shift the pages still to be read
+        memory_ids = [memory.id for page in self.vector_store.iter_list(filters=filters) for memory in page]
+        if memory_ids:
+            self.vector_store.delete_many(memory_ids)
 
-        logger.info(f"Deleted {len(memories)} memories")
+        logger.info(f"Deleted {len(memory_ids)} memories")
 
         if self.enable_graph:
             self.graph.delete_all(filters)
@@ -858,17 +926,41 @@ class Memory(MemoryBase):
         """
         pass
 
-    def _create_memory(self, data, existing_embeddings, metadata=None):
-        # logger.debug(f"Creating memory with {data=}")
+    def _embedding_for(self, data, existing_embeddings, memory_action):
+        """Reuse the embedding computed during extraction, or embed the text now."""
         if data in existing_embeddings:
-            embeddings = existing_embeddings[data]
-        else:
-            embeddings = self.embedding_model.embed(data, memory_action="add")
-        memory_id = str(uuid.uuid4())
+            return existing_embeddings[data]
+        return self.embedding_model.embed(data, memory_action=memory_action)
+
+    @staticmethod
+    def _new_memory_payload(data, metadata=None):
+        """Payload of a new memory."""
         metadata = metadata or {}
         metadata["data"] = data
         metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
         metadata["created_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        return metadata
+
+    @staticmethod
+    def _updated_memory_payload(existing_memory, data, metadata=None):
+        """Payload of an updated memory, keeping its creation time and the ids it belongs to."""
+        new_metadata = deepcopy(metadata) if metadata is not None else {}
+
+        new_metadata["data"] = data
+        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
+        new_metadata["created_at"] = existing_memory.payload.get("created_at")
+        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+
+        for key in ("user_id", "agent_id", "run_id", "actor_id", "role"):
+            if key in existing_memory.payload:
+                new_metadata[key] = existing_memory.payload[key]
+        return new_metadata
+
+    def _create_memory(self, data, existing_embeddings, metadata=None):
+        # logger.debug(f"Creating memory with {data=}")
+        embeddings = self._embedding_for(data, existing_embeddings, "add")
+        memory_id = str(uuid.uuid4())
+        metadata = self._new_memory_payload(data, metadata)
 
         self.vector_store.insert(
             vectors=[embeddings],
@@ -886,30 +978,8 @@ class Memory(MemoryBase):
             logger.error(f"Error getting memory with ID {memory_id} during update.")
             raise ValueError(f"Error getting memory with ID {memory_id}. Please provide a valid 'memory_id'")
 
-        prev_value = existing_memory.payload.get("data")
-
-        new_metadata = deepcopy(metadata) if metadata is not None else {}
-
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
-
-        if "user_id" in existing_memory.payload:
-            new_metadata["user_id"] = existing_memory.payload["user_id"]
-        if "agent_id" in existing_memory.payload:
-            new_metadata["agent_id"] = existing_memory.payload["agent_id"]
-        if "run_id" in existing_memory.payload:
-            new_metadata["run_id"] = existing_memory.payload["run_id"]
-        if "actor_id" in existing_memory.payload:
-            new_metadata["actor_id"] = existing_memory.payload["actor_id"]
-        if "role" in existing_memory.payload:
-            new_metadata["role"] = existing_memory.payload["role"]
-
-        if data in existing_embeddings:
-            embeddings = existing_embeddings[data]
-        else:
-            embeddings = self.embedding_model.embed(data, "update")
+        new_metadata = self._updated_memory_payload(existing_memory, data, metadata)
+        embeddings = self._embedding_for(data, existing_embeddings, "update")
 
         self.vector_store.update(
             vector_id=memory_id,
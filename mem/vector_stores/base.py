@@ -18,6 +18,39 @@ class VectorStoreBase(ABC):
         """Search for similar vectors."""
         pass
 
+    def search_batch(self, queries, vectors, limits=None, filters=None, **kwargs):
+        """Search for several query vectors at once.
+
+        Stores that can answer many queries in one call override this; the default runs them one by one.
+
+        Args:
+            queries (list[str]): Queries.
+            vectors (list[list[float]]): One query vector per query.
+            limits (int | list[int], optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (dict | list[dict], optional): Filters, shared by all queries or per query. Defaults to None.
+
+        Returns:
+            list[list]: Search results, one list per query.
+        """
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        return [
+            self.search(query, vector, limit=limit, filters=query_filters, **kwargs)
+            for query, vector, limit, query_filters in zip(queries, vectors, limits, filters)
+        ]
+
+    @staticmethod
+    def _expand_batch_args(num_queries, limits=None, filters=None):
+        """Expand shared ``search_batch`` arguments to one value per query."""
+        if limits is None:
+            limits = 5
+        if isinstance(limits, int):
+            limits = [limits] * num_queries
+        if filters is None or isinstance(filters, dict):
+            filters = [filters] * num_queries
+        if len(limits) != num_queries or len(filters) != num_queries:
+            raise ValueError("limits and filters must have one entry per query vector")
+        return list(limits), list(filters)
+
     @abstractmethod
     def delete(self, vector_id):
         """Delete a vector by ID."""
@@ -33,6 +66,66 @@ class VectorStoreBase(ABC):
         """Retrieve a vector by ID."""
         pass
 
+    def insert_many(self, vectors, payloads=None, ids=None):
+        """Insert several vectors in one write.
+
+        Args:
+            vectors (list[list[float]]): Vectors to insert.
+            payloads (list[dict], optional): One payload per vector. Defaults to None.
+            ids (list[str], optional): One id per vector. Defaults to None.
+        """
+        self.insert(vectors, payloads=payloads, ids=ids)
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """Update several vectors and their payloads.
+
+        Stores that can apply many updates in one call override this; the default updates them one by one.
+
+        Args:
+            vector_ids (list[str]): IDs of the vectors to update.
+            vectors (list[list[float] | None], optional): Updated vectors, None to keep a vector. Defaults to None.
+            payloads (list[dict | None], optional): Updated payloads, None to keep a payload. Defaults to None.
+        """
+        vectors = vectors if vectors is not None else [None] * len(vector_ids)
+        payloads = payloads if payloads is not None else [None] * len(vector_ids)
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            self.update(vector_id, vector=vector, payload=payload)
+
+    def delete_many(self, vector_ids):
+        """Delete several vectors by ID.
+
+        Stores that can delete many ids in one call override this; the default deletes them one by one.
+
+        Args:
+            vector_ids (list[str]): IDs of the vectors to delete.
+        """
+        for vector_id in vector_ids:
+            self.delete(vector_id)
+
+    def get_many(self, vector_ids):
+        """Retrieve several vectors by ID.
+
+        Stores that can fetch many ids in one call override this; the default fetches them one by one.
+
+        Args:
+            vector_ids (list[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            list: One result per id, None where the id does not exist.
+        """
+        return [self.get(vector_id) for vector_id in vector_ids]
+
+    def get_vectors(self, vector_ids):
+        """Read the stored vectors of several ids back, e.g. to copy them to another store.
+
+        Args:
+            vector_ids (list[str]): IDs of the vectors to read.
+
+        Returns:
+            list: One vector per id, None where the id does not exist.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot read stored vectors back")
+
     @abstractmethod
     def list_cols(self):
         """List all collections."""
@@ -53,7 +146,44 @@ class VectorStoreBase(ABC):
         """List all memories."""
         pass
 
+    def list_page(self, filters=None, limit=100, cursor=None):
+        """List one page of memories.
+
+        Stores that can resume a listing override this; the default returns everything ``list``
+        gives back as a single page.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page, or None for the first page.
+
+        Returns:
+            tuple[list, Any]: The page, and the cursor of the next page or None after the last one.
+        """
+        if cursor is not None:
+            return [], None
+        return self.list(filters=filters, limit=limit), None
+
+    def iter_list(self, filters=None, page_size=100):
+        """Stream memories page by page, holding one page in memory at a time.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            page_size (int, optional): Number of memories per page. Defaults to 100.
+
+        Yields:
+            list: One page of memories.
+        """
+        cursor = None
+        while True:
+            page, cursor = self.list_page(filters=filters, limit=page_size, cursor=cursor)
+            if page:
+                yield page
+            if cursor is None:
+                return
+
     @abstractmethod
     def reset(self):
         """Reset by delete the collection and recreate it."""
         pass
+
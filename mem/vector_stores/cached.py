@@ -0,0 +1,615 @@
+from loguru import logger
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+from mem.com.factory import VectorStoreFactory
+from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.configs import VectorStoreConfig
+from mem.vector_stores.filters import compile_filter, matches
+
+
+class OutputData(BaseModel):
+    id: Optional[str]  # memory id
+    score: Optional[float]  # similarity, or squared distance for euclidean
+    payload: Optional[Dict]  # metadata
+
+
+class CachedConfig(BaseModel):
+    backend: Dict = Field(..., description="Config of the store the cache sits in front of, with provider and config")
+    collection_name: Optional[str] = Field(None, description="Name of the collection, the backend's by default")
+    max_bytes: int = Field(256 * 1024 * 1024, description="Memory budget of the cache, in bytes")
+    tenant_key: str = Field("user_id", description="Payload key whose values are cached as a unit")
+    distance: Optional[str] = Field(
+        None, description="Metric the backend scores with: cosine, dot or euclidean, read from the backend by default"
+    )
+    ttl: float = Field(10.0, description="Seconds a cached tenant is trusted before it is reloaded")
+    page_size: int = Field(1000, description="Memories read per request when loading a tenant")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
+
+    @model_validator(mode="after")
+    def validate_cache(self) -> "CachedConfig":
+        if self.distance not in (None, *_DISTANCES):
+            raise ValueError(f"Unsupported distance: {self.distance}. Use cosine, dot or euclidean")
+        backend = VectorStoreConfig(**self.backend)
+        self.backend = {"provider": backend.provider, "config": backend.config.model_dump()}
+        if self.collection_name is None:
+            self.collection_name = self.backend["config"].get("collection_name")
+        return self
+
+
+# Metric names of the backends, as the similarity the cache scores with
+_DISTANCES = {
+    "cosine": "cosine",
+    "dot": "dot",
+    "inner_product": "dot",
+    "ip": "dot",
+    "euclidean": "euclidean",
+    "l2": "euclidean",
+}
+
+
+def _backend_distance(backend) -> Optional[str]:
+    """The metric a backend scores with, if it exposes one (FAISS ``distance_strategy``, Milvus ``metric_type``)."""
+    metric = getattr(backend, "distance_strategy", None) or getattr(backend, "metric_type", None)
+    if metric is None:
+        return None
+    distance = _DISTANCES.get(str(metric).lower())
+    if distance is None:
+        raise ValueError(f"Cannot cache a backend scoring with {metric}")
+    return distance
+
+
+class _Tenant:
+    """
+    The memories of one tenant: ids, payloads and a float32 matrix of their vectors.
+
+    Writes replace ``ids``, ``payloads`` and ``vectors`` instead of changing them in place, so a
+    search can take the three under the lock and score them after releasing it.
+    """
+
+    def __init__(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict]):
+        self.ids = list(ids)
+        self.vectors = vectors
+        self.payloads = list(payloads)
+        self.row_of = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self.payload_bytes = sum(_payload_size(payload) for payload in self.payloads)
+        self.loaded_at = time.monotonic()
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + self.payload_bytes + 64 * len(self.ids)
+
+    def put(self, vector_id: str, vector: Optional[np.ndarray], payload: Dict):
+        """Add a memory, or replace the vector and payload of a cached one."""
+        row = self.row_of.get(vector_id)
+        if row is None:
+            self.row_of[vector_id] = len(self.ids)
+            self.ids = self.ids + [vector_id]
+            self.payloads = self.payloads + [payload]
+            self.vectors = np.vstack([self.vectors, vector[None, :]]) if len(self.vectors) else vector[None, :]
+        else:
+            self.payload_bytes -= _payload_size(self.payloads[row])
+            self.payloads = list(self.payloads)
+            self.payloads[row] = payload
+            if vector is not None:
+                self.vectors = self.vectors.copy()
+                self.vectors[row] = vector
+        self.payload_bytes += _payload_size(payload)
+
+    def remove(self, vector_id: str):
+        """Drop a memory, moving the last row into its place."""
+        row = self.row_of.pop(vector_id)
+        last = len(self.ids) - 1
+        self.payload_bytes -= _payload_size(self.payloads[row])
+        ids, payloads, vectors = self.ids[:last], self.payloads[:last], self.vectors[:last].copy()
+        if row != last:
+            ids[row], payloads[row] = self.ids[last], self.payloads[last]
+            vectors[row] = self.vectors[last]
+            self.row_of[ids[row]] = row
+        self.ids, self.payloads, self.vectors = ids, payloads, vectors
+
+
+def _payload_size(payload: Dict) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str))
+
+
+class CachedVectorStore(VectorStoreBase):
+    def __init__(
+        self,
+        backend: Dict,
+        collection_name: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        tenant_key: str = "user_id",
+        distance: Optional[str] = None,
+        ttl: float = 10.0,
+        page_size: int = 1000,
+    ):
+        """
+        Keep the memories of recently active tenants in process, in front of another store.
+
+        Reads whose filters name a single tenant are served from the cache, loading the tenant
+        first if needed; writes go to the backend and are then applied to the cached copy.
+        Tenants are evicted least recently used first once the cache exceeds ``max_bytes``, and
+        reloaded after ``ttl`` seconds in case another process changed them. Writes made by other
+        processes, such as the other workers of a gunicorn server, are seen only once a tenant is
+        reloaded: keep ``ttl`` short when several workers share the backend, or serve from a single
+        worker to use a long one.
+
+        Cached tenants are scored with the metric of the backend, so results match its own: higher
+        is better for cosine and dot, while euclidean scores are squared distances, lower is better.
+
+        Args:
+            backend (Dict): Store config, with ``provider`` and ``config``, or a store instance.
+            collection_name (str, optional): Name of the collection. Defaults to the backend's.
+            max_bytes (int, optional): Memory budget of the cache. Defaults to 256 MiB.
+            tenant_key (str, optional): Payload key whose values are cached as a unit. Defaults to "user_id".
+            distance (str, optional): Metric the backend scores with, "cosine", "dot" or "euclidean". Defaults to
+                the backend's ``distance_strategy`` or ``metric_type``, or "cosine" if it exposes neither.
+            ttl (float, optional): Seconds a cached tenant is trusted. Defaults to 10.
+            page_size (int, optional): Memories read per request when loading a tenant. Defaults to 1000.
+        """
+        if isinstance(backend, VectorStoreBase):
+            self.backend = backend
+        else:
+            self.backend = VectorStoreFactory.create(backend["provider"], backend["config"])
+        if distance not in (None, *_DISTANCES):
+            raise ValueError(f"Unsupported distance: {distance}. Use cosine, dot or euclidean")
+        backend_distance = _backend_distance(self.backend)
+        distance = _DISTANCES.get(distance) if distance else None
+        if distance and backend_distance and distance != backend_distance:
+            raise ValueError(f"Distance {distance} does not match the backend's {backend_distance}")
+
+        self.collection_name = collection_name or getattr(self.backend, "collection_name", None)
+        self.max_bytes = max_bytes
+        self.tenant_key = tenant_key
+        self.distance = distance or backend_distance or "cosine"
+        # The backend stores and searches unit vectors for cosine, and for euclidean with normalize_L2
+        self._unit = self.distance == "cosine" or (
+            self.distance == "euclidean" and bool(getattr(self.backend, "normalize_L2", False))
+        )
+        self.ttl = ttl
+        self.page_size = page_size
+        self.default_threshold = self._default_arg(self.backend.search, "threshold")
+
+        self._lock = threading.RLock()
+        self.tenants: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self.tenant_of: Dict[str, str] = {}
+        self.nbytes = 0
+        # Bumped on every write to a tenant, so a load that raced with a write is not kept
+        self._versions: Dict[str, int] = {}
+        # Tenants too large to cache, and when that was found out
+        self._oversized: Dict[str, float] = {}
+
+    def __getattr__(self, name):
+        # Backend-specific methods and attributes are passed through
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    @staticmethod
+    def _default_arg(method, name: str):
+        parameter = inspect.signature(method).parameters.get(name)
+        return None if parameter is None or parameter.default is inspect.Parameter.empty else parameter.default
+
+    def _normalize(self, vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if self._unit and len(vectors):
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+    def _tenant_in(self, filters: Optional[Dict]) -> Optional[str]:
+        """The tenant a read is limited to, if its filters name exactly one."""
+        value = (filters or {}).get(self.tenant_key)
+        if value is None or isinstance(value, (list, tuple, set, dict)):
+            return None
+        return str(value)
+
+    def _resident(self, tenant: Optional[str]) -> Optional[_Tenant]:
+        """A cached tenant, loading it from the backend when it is missing or stale."""
+        if tenant is None:
+            return None
+        with self._lock:
+            cached = self.tenants.get(tenant)
+            if cached is not None and time.monotonic() - cached.loaded_at < self.ttl:
+                self.tenants.move_to_end(tenant)
+                return cached
+            if time.monotonic() - self._oversized.get(tenant, -self.ttl) < self.ttl:
+                return None
+            version = self._versions.get(tenant, 0)
+
+        ids, payloads = [], []
+        for page in self.backend.iter_list(filters={self.tenant_key: tenant}, page_size=self.page_size):
+            for record in page:
+                ids.append(str(record.id))
+                payloads.append(record.payload or {})
+        vectors = self.backend.get_vectors(ids) if ids else []
+        kept = [row for row, vector in enumerate(vectors) if vector is not None]
+        matrix = self._normalize([vectors[row] for row in kept]) if kept else np.empty((0, 0), dtype=np.float32)
+        loaded = _Tenant([ids[row] for row in kept], matrix, [payloads[row] for row in kept])
+        if loaded.nbytes > self.max_bytes:
+            logger.warning(f"Memories of {self.tenant_key}={tenant} exceed the cache budget, reading them from the backend")
+            with self._lock:
+                self._oversized[tenant] = time.monotonic()
+            return None
+
+        with self._lock:
+            if self._versions.get(tenant, 0) != version:
+                return None
+            self._drop(tenant)
+            self.tenants[tenant] = loaded
+            self.tenant_of.update((vector_id, tenant) for vector_id in loaded.ids)
+            self.nbytes += loaded.nbytes
+            self._evict()
+        return loaded
+
+    def _drop(self, tenant: str):
+        cached = self.tenants.pop(tenant, None)
+        if cached is not None:
+            self.nbytes -= cached.nbytes
+            for vector_id in cached.ids:
+                self.tenant_of.pop(vector_id, None)
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self.tenants:
+            tenant = next(iter(self.tenants))
+            logger.debug(f"Evicting {self.tenant_key}={tenant} from the vector cache")
+            self._drop(tenant)
+
+    def _apply(self, vector_id: str, vector=None, payload: Optional[Dict] = None, deleted: bool = False):
+        """Mirror a write that reached the backend in the cache."""
+        with self._lock:
+            current = self.tenant_of.get(vector_id)
+            tenant = current if payload is None else self._tenant_in(payload)
+            for name in {current, tenant} - {None}:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+            if current is not None and (deleted or tenant != current):
+                cached = self.tenants[current]
+                self.nbytes -= cached.nbytes
+                cached.remove(vector_id)
+                self.nbytes += cached.nbytes
+                del self.tenant_of[vector_id]
+            if deleted or tenant not in self.tenants:
+                return
+
+            cached = self.tenants[tenant]
+            if vector is None and vector_id not in cached.row_of:
+                # The memory moved in from another tenant without its vector; reload on next use
+                self._drop(tenant)
+                return
+            self.nbytes -= cached.nbytes
+            if payload is None:
+                payload = cached.payloads[cached.row_of[vector_id]]
+            cached.put(vector_id, None if vector is None else self._normalize(vector)[0], payload)
+            self.nbytes += cached.nbytes
+            self.tenant_of[vector_id] = tenant
+            self._evict()
+
+    def _search_local(self, cached: _Tenant, vector, limit: int, filters: Optional[Dict], threshold) -> List[OutputData]:
+        # Writes replace these instead of changing them, so they are scored without holding the lock
+        with self._lock:
+            ids, vectors, payloads = cached.ids, cached.vectors, cached.payloads
+        node = compile_filter(filters)
+        rows = np.array([row for row, payload in enumerate(payloads) if matches(node, payload)], dtype=np.int64)
+        if not len(rows):
+            return []
+        query = self._normalize(vector)[0]
+        candidates = vectors[rows]
+        if self.distance == "euclidean":
+            scores = ((candidates - query) ** 2).sum(axis=1)
+            order = scores
+        else:
+            scores = candidates @ query
+            order = -scores
+        if limit < len(rows):
+            top = np.argpartition(order, limit)[:limit]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(order[top], kind="stable")]
+        hits = []
+        for position in top:
+            score = float(scores[position])
+            if threshold is not None and (score > threshold if self.distance == "euclidean" else score < threshold):
+                break
+            row = rows[position]
+            hits.append(OutputData(id=ids[row], score=score, payload=payloads[row]))
+        return hits
+
+    def create_col(self, name, vector_size=None, distance=None):
+        """Create a collection in the backend."""
+        return self.backend.create_col(name, vector_size, distance)
+
+    def insert(self, vectors: list, payloads: list = None, ids: list = None, **kwargs):
+        """
+        Insert vectors into the backend, and into the cached copies of their tenants.
+
+        Args:
+            vectors (list): List of vectors to insert.
+            payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        self.insert_many(vectors, payloads=payloads, ids=ids, **kwargs)
+
+    def insert_many(self, vectors: list, payloads: list = None, ids: list = None, **kwargs):
+        """
+        Insert vectors into the backend in one bulk write, and into the cached copies of their tenants.
+
+        Args:
+            vectors (list): List of vectors to insert.
+            payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        payloads = payloads or [{} for _ in vectors]
+        self.backend.insert_many(vectors, payloads=payloads, ids=ids, **kwargs)
+        if ids is None:
+            # Ids are chosen by the backend, so the cached tenants cannot be patched
+            with self._lock:
+                for tenant in {self._tenant_in(payload) for payload in payloads} - {None}:
+                    self._versions[tenant] = self._versions.get(tenant, 0) + 1
+                    self._drop(tenant)
+            return
+        for vector_id, vector, payload in zip(ids, vectors, payloads):
+            self._apply(str(vector_id), vector, payload)
+
+    def search(self, query: str, vectors: list, limit: int = 5, filters: Dict = None, threshold=..., **kwargs) -> list:
+        """
+        Search for similar vectors, in the cache when the filters name a single tenant.
+
+        Args:
+            query (str): Query.
+            vectors (list): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Dict, optional): Filters to apply to the search. Defaults to None.
+            threshold (float, optional): Minimum score. Defaults to the backend's default.
+
+        Returns:
+            list: Search results.
+        """
+        threshold = self.default_threshold if threshold is ... else threshold
+        cached = self._resident(self._tenant_in(filters))
+        if cached is None:
+            return self.backend.search(query, vectors, limit=limit, filters=filters, threshold=threshold, **kwargs)
+        return self._search_local(cached, vectors, limit, filters, threshold)
+
+    def search_batch(self, queries: list, vectors: list, limits=None, filters=None, threshold=..., **kwargs) -> list:
+        """
+        Search for several query vectors, answering cached tenants locally and the rest in one backend call.
+
+        Args:
+            queries (list): Queries.
+            vectors (list): One query vector per query.
+            limits (int | list, optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (dict | list, optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold (float, optional): Minimum score. Defaults to the backend's default.
+
+        Returns:
+            list: Search results, one list per query.
+        """
+        threshold = self.default_threshold if threshold is ... else threshold
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        results = [None] * len(vectors)
+        remote = []
+        for row, query_filters in enumerate(filters):
+            cached = self._resident(self._tenant_in(query_filters))
+            if cached is None:
+                remote.append(row)
+                continue
+            results[row] = self._search_local(cached, vectors[row], limits[row], query_filters, threshold)
+        if remote:
+            found = self.backend.search_batch(
+                [queries[row] for row in remote],
+                [vectors[row] for row in remote],
+                limits=[limits[row] for row in remote],
+                filters=[filters[row] for row in remote],
+                threshold=threshold,
+                **kwargs,
+            )
+            for row, hits in zip(remote, found):
+                results[row] = hits
+        return results
+
+    def delete(self, vector_id):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id: ID of the vector to delete.
+        """
+        self.backend.delete(vector_id)
+        self._apply(str(vector_id), deleted=True)
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors by ID in one backend call.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        self.backend.delete_many(vector_ids)
+        for vector_id in vector_ids:
+            self._apply(str(vector_id), deleted=True)
+
+    def update(self, vector_id, vector: list = None, payload: Dict = None):
+        """
+        Update a vector and its payload.
+
+        Args:
+            vector_id: ID of the vector to update.
+            vector (list, optional): Updated vector. Defaults to None.
+            payload (Dict, optional): Updated payload. Defaults to None.
+        """
+        self.backend.update(vector_id, vector=vector, payload=payload)
+        self._apply(str(vector_id), vector, payload)
+
+    def update_many(self, vector_ids: list, vectors: list = None, payloads: list = None):
+        """
+        Update several vectors in one backend call.
+
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): One new vector per id, None to keep it. Defaults to None.
+            payloads (list, optional): One new payload per id, None to keep it. Defaults to None.
+        """
+        self.backend.update_many(vector_ids, vectors=vectors, payloads=payloads)
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            self._apply(str(vector_id), vector, payload)
+
+    def _cached_record(self, vector_id) -> Optional[OutputData]:
+        tenant = self.tenant_of.get(str(vector_id))
+        if tenant is None:
+            return None
+        cached = self.tenants[tenant]
+        if time.monotonic() - cached.loaded_at >= self.ttl:
+            return None
+        self.tenants.move_to_end(tenant)
+        return OutputData(id=str(vector_id), score=None, payload=cached.payloads[cached.row_of[str(vector_id)]])
+
+    def get(self, vector_id):
+        """
+        Retrieve a vector by ID, from the cache when its tenant is cached.
+
+        Args:
+            vector_id: ID of the vector to retrieve.
+
+        Returns:
+            Retrieved vector, or None if it does not exist.
+        """
+        with self._lock:
+            record = self._cached_record(vector_id)
+        return record if record is not None else self.backend.get(vector_id)
+
+    def get_many(self, vector_ids: list) -> list:
+        """
+        Retrieve several vectors by ID, fetching the ones not cached in one backend call.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+
+        Returns:
+            list: One result per id, None where the id does not exist.
+        """
+        with self._lock:
+            results = [self._cached_record(vector_id) for vector_id in vector_ids]
+        missing = [row for row, record in enumerate(results) if record is None]
+        if missing:
+            for row, record in zip(missing, self.backend.get_many([vector_ids[row] for row in missing])):
+                results[row] = record
+        return results
+
+    def get_vectors(self, vector_ids: list) -> list:
+        """
+        Read stored vectors back from the backend.
+
+        Args:
+            vector_ids (list): IDs of the vectors to read.
+
+        Returns:
+            list: One vector per id, None where the id does not exist.
+        """
+        return self.backend.get_vectors(vector_ids)
+
+    def list_cols(self):
+        """List all collections of the backend."""
+        return self.backend.list_cols()
+
+    def delete_col(self):
+        """Delete the backend collection and empty the cache."""
+        self.clear()
+        return self.backend.delete_col()
+
+    def col_info(self):
+        """Get information about the backend collection."""
+        return self.backend.col_info()
+
+    def list(self, filters: Dict = None, limit: int = 100) -> list:
+        """
+        List memories, from the cache when the filters name a single tenant.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of memories to return. Defaults to 100.
+
+        Returns:
+            list: List of memories.
+        """
+        cached = self._resident(self._tenant_in(filters))
+        if cached is None:
+            return self.backend.list(filters=filters, limit=limit)
+        with self._lock:
+            ids, payloads = cached.ids, cached.payloads
+        node = compile_filter(filters)
+        return [
+            OutputData(id=vector_id, score=None, payload=payload)
+            for vector_id, payload in zip(ids, payloads)
+            if matches(node, payload)
+        ][:limit]
+
+    def list_page(self, filters: Dict = None, limit: int = 100, cursor=None):
+        """
+        List one page of memories from the backend; cursors are the backend's.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple: The page, and the next cursor or None after the last page.
+        """
+        return self.backend.list_page(filters=filters, limit=limit, cursor=cursor)
+
+    def iter_list(self, filters: Dict = None, page_size: int = 100):
+        """
+        Stream memories page by page, from the cache when the filters name a single tenant.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list. Defaults to None.
+            page_size (int, optional): Number of memories per page. Defaults to 100.
+
+        Yields:
+            list: One page of memories.
+        """
+        cached = self._resident(self._tenant_in(filters))
+        if cached is None:
+            yield from self.backend.iter_list(filters=filters, page_size=page_size)
+            return
+        memories = self.list(filters=filters, limit=len(cached.ids))
+        for start in range(0, len(memories), page_size):
+            yield memories[start : start + page_size]
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            for tenant in list(self.tenants):
+                self._versions[tenant] = self._versions.get(tenant, 0) + 1
+            self.tenants.clear()
+            self.tenant_of.clear()
+            self._oversized.clear()
+            self.nbytes = 0
+
+    def reset(self):
+        """Reset the backend collection and empty the cache."""
+        self.clear()
+        return self.backend.reset()
@@ -13,6 +13,15 @@ class VectorStoreConfig(BaseModel):
     _provider_configs: Dict[str, str] = {
         "qdrant": "QdrantConfig",
         "milvus": "MilvusDBConfig",
+        "faiss": "FAISSConfig",
+        "faiss_sharded": "ShardedFAISSConfig",
+        "numpy": "NumpyConfig",
+        "cached": "CachedConfig",
+    }
+
+    # Providers whose module is not named after them
+    _provider_modules: Dict[str, str] = {
+        "numpy": "numpy_store",
     }
 
     @model_validator(mode="after")
@@ -24,7 +33,7 @@ class VectorStoreConfig(BaseModel):
             raise ValueError(f"Unsupported vector store provider: {provider}")
 
         module = __import__(
-            f"mem.vector_stores.{provider}",
+            f"mem.vector_stores.{self._provider_modules.get(provider, provider)}",
             fromlist=[self._provider_configs[provider]],
         )
         config_class = getattr(module, self._provider_configs[provider])
@@ -1,12 +1,19 @@
 from loguru import logger
+import heapq
+import itertools
+import json
+import math
 import os
 import pickle
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 try:
     import faiss
@@ -18,6 +25,11 @@ except ImportError:
     )
 
 from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.faiss_storage import PayloadStore, VectorFile
+from mem.vector_stores.filters import And, Eq, In, Node, Not, Or, Range, compile_filter, matches
+from mem.vector_stores.locks import FileLock, RWLock
+from mem.vector_stores.maintenance import shared_maintenance
+from mem.vector_stores.wal import WriteAheadLog, write_atomic
 
 
 class OutputData(BaseModel):
@@ -26,6 +38,59 @@ class OutputData(BaseModel):
     payload: Optional[Dict]  # metadata
 
 
+class FAISSConfig(BaseModel):
+    collection_name: str = Field("mem0", description="Name of the collection")
+    path: Optional[str] = Field(None, description="Directory holding the collection files")
+    distance_strategy: str = Field(
+        "euclidean", description="Distance strategy: 'euclidean', 'inner_product' or 'cosine'"
+    )
+    normalize_L2: bool = Field(False, description="Normalize vectors for euclidean distance")
+    embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
+    compact_threshold: float = Field(0.2, description="Ratio of deleted vectors that triggers compaction")
+    checkpoint_interval: float = Field(60.0, description="Seconds between index checkpoints")
+    checkpoint_ops: int = Field(1000, description="Logged mutations that trigger an early checkpoint")
+    indexed_fields: Optional[List[str]] = Field(None, description="Payload keys kept in the filter index")
+    index_type: str = Field("flat", description="Index type: 'flat', 'hnsw', 'ivf_flat' or 'ivf_pq'")
+    ann_threshold: int = Field(100000, description="Live vectors at which the flat index is upgraded")
+    hnsw_m: int = Field(32, description="HNSW graph neighbours per node")
+    ef_construction: int = Field(40, description="HNSW candidate list size while building")
+    ef_search: int = Field(64, description="HNSW candidate list size while searching")
+    nlist: Optional[int] = Field(None, description="Number of IVF cells")
+    nprobe: int = Field(16, description="IVF cells visited per query")
+    pq_m: int = Field(16, description="PQ sub-quantizers")
+    pq_nbits: int = Field(8, description="Bits per PQ code")
+    exact_search_limit: int = Field(4096, description="Filtered candidates scored exactly instead of searched")
+    quantization: Optional[str] = Field(None, description="Vector compression: 'sq8', 'fp16' or 'pq'")
+    rerank_factor: int = Field(4, description="Candidates per result re-ranked with full vectors")
+    mmap: bool = Field(False, description="Memory-map the index and keep writes in a delta index")
+    mmap_delta_limit: int = Field(10000, description="Delta size at which it is merged into the index")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
+
+
+# Payload keys that Memory filters on
+DEFAULT_INDEXED_FIELDS = ["user_id", "agent_id", "run_id", "actor_id", "type", "role"]
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+QUANTIZATION_TYPES = ("sq8", "fp16", "pq")
+
+
+def _indexable(value) -> bool:
+    """Whether a payload value can be stored in the secondary payload index."""
+    return isinstance(value, (str, int, float, bool))
+
+
 class FAISS(VectorStoreBase):
     def __init__(
         self,
@@ -34,6 +99,24 @@ class FAISS(VectorStoreBase):
         distance_strategy: str = "euclidean",
         normalize_L2: bool = False,
         embedding_model_dims: int = 1536,
+        compact_threshold: float = 0.2,
+        checkpoint_interval: float = 60.0,
+        checkpoint_ops: int = 1000,
+        indexed_fields: Optional[List[str]] = None,
+        index_type: str = "flat",
+        ann_threshold: int = 100000,
+        hnsw_m: int = 32,
+        ef_construction: int = 40,
+        ef_search: int = 64,
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        pq_m: int = 16,
+        pq_nbits: int = 8,
+        exact_search_limit: int = 4096,
+        quantization: Optional[str] = None,
+        rerank_factor: int = 4,
+        mmap: bool = False,
+        mmap_delta_limit: int = 10000,
     ):
         """
         Initialize the FAISS vector store.
@@ -45,17 +128,118 @@ class FAISS(VectorStoreBase):
                 Defaults to "euclidean".
             normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
                 Defaults to False.
+            embedding_model_dims (int, optional): Dimensions of the embedding model. Defaults to 1536.
+            compact_threshold (float, optional): Ratio of deleted to stored vectors above which the index is
+                compacted in the background. Defaults to 0.2.
+            checkpoint_interval (float, optional): Seconds between background checkpoints of the index.
+                Mutations in between are only appended to the write-ahead log. Defaults to 60.0.
+            checkpoint_ops (int, optional): Number of logged mutations that triggers an early checkpoint.
+                Defaults to 1000.
+            indexed_fields (List[str], optional): Payload keys kept in an inverted index, so that filters on
+                them are resolved to candidate ids before searching. Defaults to DEFAULT_INDEXED_FIELDS.
+            index_type (str, optional): Index to use once the collection is large enough. Options: 'flat', 'hnsw',
+                'ivf_flat', 'ivf_pq'. Defaults to "flat".
+            ann_threshold (int, optional): Number of live vectors at which a flat index is migrated to
+                ``index_type`` in the background. Defaults to 100000.
+            hnsw_m (int, optional): Number of HNSW graph neighbours per node. Defaults to 32.
+            ef_construction (int, optional): HNSW candidate list size while building. Defaults to 40.
+            ef_search (int, optional): Default HNSW candidate list size while searching. Defaults to 64.
+            nlist (int, optional): Number of IVF cells. Defaults to 4 * sqrt(number of vectors).
+            nprobe (int, optional): Default number of IVF cells visited per query. Defaults to 16.
+            pq_m (int, optional): Number of PQ sub-quantizers for 'ivf_pq'. Must divide the dimension.
+                Defaults to 16.
+            pq_nbits (int, optional): Bits per PQ code for 'ivf_pq'. Defaults to 8.
+            exact_search_limit (int, optional): Filtered searches with at most this many candidates are scored
+                exactly against the candidates instead of going through the index. Defaults to 4096.
+            quantization (str, optional): Compress the vectors held in memory. Options: 'sq8' (int8 scalar
+                quantization), 'fp16', 'pq' (product quantization with ``pq_m`` x ``pq_nbits``). The
+                full-precision vectors are kept on disk to re-rank candidates. Applied together with
+                ``index_type`` once ``ann_threshold`` vectors are stored. Defaults to None.
+            rerank_factor (int, optional): With compressed vectors, ``limit * rerank_factor`` candidates are
+                re-ranked with full-precision vectors. Defaults to 4.
+            mmap (bool, optional): Open the index read-only through a memory map and read the payload
+                store through one too, so that processes opening the same collection share their pages and
+                loading does not read the vectors. Writes go to a small in-memory delta index.
+                Defaults to False.
+            mmap_delta_limit (int, optional): Number of vectors in the delta index at which it is merged
+                into a new index file in the background. Defaults to 10000.
         """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported FAISS index type: {index_type}. Options: {', '.join(INDEX_TYPES)}")
+        if quantization is not None and quantization not in QUANTIZATION_TYPES:
+            raise ValueError(
+                f"Unsupported FAISS quantization: {quantization}. Options: {', '.join(QUANTIZATION_TYPES)}"
+            )
+
         self.collection_name = collection_name
         self.path = path or f"/tmp/faiss/{collection_name}"
         self.distance_strategy = distance_strategy
         self.normalize_L2 = normalize_L2
         self.embedding_model_dims = embedding_model_dims
+        self.compact_threshold = compact_threshold
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_ops = checkpoint_ops
+        self.indexed_fields = list(indexed_fields) if indexed_fields is not None else list(DEFAULT_INDEXED_FIELDS)
+        self.index_type = index_type
+        self.ann_threshold = ann_threshold
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.exact_search_limit = exact_search_limit
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+        self.mmap = mmap
+        self.mmap_delta_limit = mmap_delta_limit
 
         # Initialize storage structures
         self.index = None
-        self.docstore = {}
+        # With mmap, the index is read-only and vectors written since it was saved are kept here
+        self.delta = None
+        self._index_mapped = False
+        # Type of the current index; collections start flat and are upgraded to index_type
+        self.active_index_type = "flat"
+        self.active_quantization = None
+        # Full-precision vectors on disk, kept when the in-memory vectors are compressed
+        self.vector_file = None
+        self.vector_rows = {}
+        self.free_rows = []
+        # Recall of the compressed index measured when it was built
+        self.quantization_stats = {}
+        # Payloads and the secondary payload index, in SQLite
+        self.docstore = None
         self.index_to_id = {}
+        self.id_to_index = {}
+        # Internal ids of deleted vectors that are still physically stored in the index
+        self.tombstones = set()
+        self.next_idx = 0
+        # Sequence number of the last mutation, committed with it to the payload store
+        self.seq = 0
+        # Sorted internal ids matching the filters of the last filtered listing, so that its next
+        # pages bisect them instead of resolving the filters again: (filters, next_idx, ids)
+        self._listing = None
+
+        # Shared by searches and reads, exclusive for writes
+        self._lock = RWLock()
+        # Writers in other processes (and other instances on the same path) are excluded by the
+        # collection lock files; a reader notices their commits through the payload store
+        self._file_lock = FileLock(f"{self.path}/{collection_name}.lock" if self.path else None)
+        self._data_version = None
+        self._rebuild_lock = threading.Lock()
+        # Checkpoints, compactions and rebuilds run on the maintenance threads shared by all stores
+        self._maintenance = shared_maintenance()
+        self._compact_task = None
+        self._rebuild_task = None
+
+        # Write-ahead log state
+        self._wal = WriteAheadLog(self._wal_path, embedding_model_dims) if self.path else None
+        self._wal_ops = 0
+        # Set when the index changes without a logged mutation (compaction, rebuilds)
+        self._index_changed = False
+        self._checkpoint_lock = FileLock(f"{self.path}/{collection_name}.checkpoint.lock" if self.path else None)
 
         # Create directory if it doesn't exist
         if self.path:
@@ -63,88 +247,847 @@ class FAISS(VectorStoreBase):
 
             # Try to load existing index if available
             index_path = f"{self.path}/{collection_name}.faiss"
-            docstore_path = f"{self.path}/{collection_name}.pkl"
-            if os.path.exists(index_path) and os.path.exists(docstore_path):
-                self._load(index_path, docstore_path)
-            else:
-                self.create_col(collection_name)
+            with self._checkpoint_lock, self._file_lock:
+                if os.path.exists(index_path) and (os.path.exists(self._db_path) or os.path.exists(self._pickle_path)):
+                    self._load(index_path)
+                else:
+                    self.create_col(collection_name)
+
+            self._maintenance.every(self._task_key("checkpoint"), checkpoint_interval, self._checkpoint_due)
+
+    def _task_key(self, task: str) -> tuple:
+        """Key of a maintenance task of this store."""
+        return (id(self), task)
+
+    @property
+    def _wal_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.wal"
+
+    @property
+    def _db_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.db"
+
+    @property
+    def _pickle_path(self) -> str:
+        # Docstore of stores written before payloads moved to SQLite
+        return f"{self.path}/{self.collection_name}.pkl"
+
+    @property
+    def _vector_file_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.vectors"
+
+    @property
+    def _keeps_full_vectors(self) -> bool:
+        """Whether full-precision vectors are kept on disk for re-ranking."""
+        return self.quantization is not None or self.index_type == "ivf_pq"
+
+    def _open_vector_file(self, truncate: bool = False):
+        """Open the on-disk full-precision vectors, if this store keeps them."""
+        if self.vector_file is not None:
+            self.vector_file.close()
+            self.vector_file = None
+        if not self._keeps_full_vectors or not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        if truncate and os.path.exists(self._vector_file_path):
+            os.remove(self._vector_file_path)
+        self.vector_file = VectorFile(self._vector_file_path, self.embedding_model_dims)
 
-    def _load(self, index_path: str, docstore_path: str):
+    def _load(self, index_path: str):
         """
-        Load FAISS index and docstore from disk.
+        Load the FAISS index and payload store from disk, then replay the write-ahead log.
 
         Args:
             index_path (str): Path to FAISS index file.
-            docstore_path (str): Path to docstore pickle file.
         """
         try:
-            self.index = faiss.read_index(index_path)
-            with open(docstore_path, "rb") as f:
-                self.docstore, self.index_to_id = pickle.load(f)
+            self.docstore = self._open_docstore()
+            if self.docstore.get_meta("seq") is None and os.path.exists(self._pickle_path):
+                self._migrate_pickle(index_path)
+            else:
+                self._load_state(index_path)
             logger.info(f"Loaded FAISS index from {index_path} with {self.index.ntotal} vectors")
         except Exception as e:
             logger.warning(f"Failed to load FAISS index: {e}")
 
-            self.docstore = {}
+            self.delta = None
             self.index_to_id = {}
+            self.tombstones = set()
+            self.next_idx = 0
+            self._listing = None
+            self.seq = 0
+            self.id_to_index = {}
+
+    def _load_state(self, index_path: str):
+        """Restore the index checkpoint and the id mapping, then replay the write-ahead log."""
+        state = json.loads(self.docstore.get_meta("index_state", "{}"))
+        self.index = self._read_index(index_path)
+        self._load_delta(self.docstore.get_meta("delta"))
+        self.seq = self.docstore.get_meta("seq", 0)
+        self.next_idx = self.docstore.get_meta("next_idx", 0)
+        self._listing = None
+        self.active_index_type = state.get("index_type", "flat")
+        self.active_quantization = state.get("quantization")
+        self.quantization_stats = state.get("quantization_stats", {})
+        rows = self.docstore.get_meta("vector_rows")
+        if rows is not None:
+            rows = np.frombuffer(rows, dtype=np.int64).reshape(-1, 2)
+            self.vector_rows = dict(rows.tolist())
+        self.free_rows = state.get("free_rows", [])
+
+        self.index_to_id = dict(self.docstore.ids())
+        self.id_to_index = {vector_id: internal_id for internal_id, vector_id in self.index_to_id.items()}
+        if json.loads(self.docstore.get_meta("indexed_fields", "null")) != self.indexed_fields:
+            self._rebuild_payload_index()
+
+        self._open_vector_file()
+        self._recover(state.get("seq", 0))
+        if self.vector_file is not None and len(self.vector_rows) < len(self.index_to_id):
+            # Full-precision vectors were not kept so far; take them from the index
+            self._backfill_vector_file()
+
+    def _read_index(self, index_path: str):
+        """Read an index file, through a read-only memory map if ``mmap`` is set."""
+        if not self.mmap:
+            self._index_mapped = False
+            return faiss.read_index(index_path)
+
+        with open(index_path, "rb") as f:
+            fourcc = f.read(4)
+        # Flat codes (also the storage of HNSW graphs) are mapped in place; the inverted lists of
+        # IVF indexes ("Iw.." files) are mapped through OnDiskInvertedLists
+        flags = faiss.IO_FLAG_MMAP if fourcc.startswith(b"Iw") else faiss.IO_FLAG_MMAP_IFC
+        self._index_mapped = True
+        return faiss.read_index(index_path, flags | faiss.IO_FLAG_READ_ONLY)
+
+    def _open_docstore(self) -> PayloadStore:
+        """Open the payload store of the collection."""
+        if self.docstore is not None:
+            self.docstore.close()
+        os.makedirs(self.path, exist_ok=True)
+        return PayloadStore(self._db_path, mmap_size=2**31 if self.mmap else 0)
+
+    def _load_delta(self, delta_bytes: Optional[bytes]):
+        """Restore the in-memory delta index, or fold it into the index when not using mmap."""
+        delta = None
+        if delta_bytes is not None:
+            delta = faiss.deserialize_index(np.frombuffer(delta_bytes, dtype=np.uint8))
+        if not self.mmap:
+            self.delta = None
+            if delta is not None and delta.ntotal:
+                ids = faiss.vector_to_array(delta.id_map)
+                self.index.add_with_ids(delta.reconstruct_batch(ids), ids)
+            return
+        self.delta = delta if delta is not None else self._build_index(self.index.metric_type)
+
+    def _backfill_vector_file(self):
+        """Write the vectors of the index to the on-disk full-precision vectors."""
+        live = np.array([idx for idx in self.index_to_id if idx not in self.vector_rows], dtype=np.int64)
+        if len(live):
+            self._store_full_vectors(live, self._reconstruct_stored(live))
+            self._index_changed = True
+
+    def _store_full_vectors(self, internal_ids: np.ndarray, vectors: np.ndarray):
+        """Assign on-disk rows to new vectors, reusing rows of compacted ones, and write them."""
+        rows = []
+        for internal_id in internal_ids.tolist():
+            row = self.free_rows.pop() if self.free_rows else len(self.vector_rows) + len(self.free_rows)
+            self.vector_rows[internal_id] = row
+            rows.append(row)
+        self.vector_file.write(rows, vectors)
+
+    def _release_full_vectors(self, internal_ids):
+        """Free the on-disk rows of vectors removed from the index."""
+        for internal_id in internal_ids:
+            row = self.vector_rows.pop(internal_id, None)
+            if row is not None:
+                self.free_rows.append(row)
+
+    def _recover(self, index_seq: int):
+        """
+        Bring the index up to date with the payload store and the write-ahead log.
+
+        Logged mutations newer than the payload store are applied in full. Inserts the payload store
+        already holds but the index checkpoint (taken at ``index_seq``) may not, only have their
+        vectors added back. Vectors left in the index whose ids are no longer live are tombstoned.
+
+        Args:
+            index_seq (int): Sequence number of the last mutation included in the index checkpoint.
+        """
+        stored = set(self._stored_ids().tolist())
+        if self.delta is not None and self.delta.ntotal:
+            # A crash right after writing a merged index keeps the previous delta
+            delta_ids = faiss.vector_to_array(self.delta.id_map)
+            merged = np.array([idx for idx in delta_ids.tolist() if idx in stored], dtype=np.int64)
+            if len(merged):
+                self.delta.remove_ids(faiss.IDSelectorBatch(merged))
+            stored.update(delta_ids.tolist())
+
+        replayed = 0
+        with self._mutation():
+            for record, vectors in self._wal.records():
+                if record["seq"] <= min(index_seq, self.seq):
+                    continue
+                if record["op"] == "insert":
+                    internal_ids = np.array(record["internal_ids"], dtype=np.int64)
+                    missing = np.array([idx not in stored for idx in internal_ids.tolist()], dtype=bool)
+                    if missing.any():
+                        self._add_vectors(internal_ids[missing], vectors[missing])
+                        stored.update(internal_ids[missing].tolist())
+                if record["seq"] > self.seq:
+                    self._apply(record)
+                    self.seq = record["seq"]
+                replayed += 1
+
+        self.tombstones = stored - set(self.index_to_id)
+        self._wal_ops = replayed
+        self._wal.open()
+        if replayed:
+            logger.info(f"Replayed {replayed} logged mutations into collection {self.collection_name}")
+
+    def _migrate_pickle(self, index_path: str):
+        """Move a collection whose docstore was pickled into the payload store."""
+        with open(self._pickle_path, "rb") as f:
+            state = pickle.load(f)
+
+        if isinstance(state, tuple):
+            # Stores written before the index was id-mapped only hold (docstore, index_to_id)
+            docstore, self.index_to_id = state
+            self.index = faiss.read_index(index_path)
+            self._migrate_legacy_index()
+            self._open_vector_file(truncate=True)
+        else:
+            docstore = state["docstore"]
+            self.index = faiss.read_index(index_path)
+            self._load_delta(state.get("delta"))
+            self.index_to_id = state["index_to_id"]
+            self.tombstones = state["tombstones"]
+            self.next_idx = state["next_idx"]
+            self.seq = state.get("seq", 0)
+            self.active_index_type = state.get("index_type", "flat")
+            self.active_quantization = state.get("quantization")
+            self.vector_rows = state.get("vector_rows", {})
+            self.free_rows = state.get("free_rows", [])
+            self._open_vector_file()
+
+        self.docstore.clear()
+        self.id_to_index = {}
+        with self._mutation():
+            for internal_id in sorted(self.index_to_id):
+                vector_id = self.index_to_id[internal_id]
+                if vector_id in self.id_to_index:
+                    # Only the most recent vector of an id is live
+                    stale = self.id_to_index[vector_id]
+                    del self.index_to_id[stale]
+                    self.tombstones.add(stale)
+                self.id_to_index[vector_id] = internal_id
+                self.docstore.put(vector_id, internal_id, docstore[vector_id])
+            self._rebuild_payload_index()
+
+        # Replay what was logged after the pickled checkpoint, then replace it with a new one
+        self._recover(self.seq)
+        if self.vector_file is not None and len(self.vector_rows) < len(self.index_to_id):
+            self._backfill_vector_file()
+        if self.mmap and self.delta is None:
+            self.delta = self._build_index(self.index.metric_type)
+        self.checkpoint()
+        os.remove(self._pickle_path)
+        logger.info(f"Moved payloads of collection {self.collection_name} from pickle to {self._db_path}")
+
+    def _migrate_legacy_index(self):
+        """
+        Convert a positional flat index into an id-mapped one.
+
+        Vectors whose position is no longer referenced by ``index_to_id`` were left behind by the old
+        delete implementation and are dropped here.
+        """
+        legacy = self.index
+        live = np.array(sorted(self.index_to_id), dtype=np.int64)
+
+        self.index = self._build_index(metric_type=legacy.metric_type)
+        if len(live):
+            vectors = legacy.reconstruct_n(0, legacy.ntotal)
+            self.index.add_with_ids(vectors[live], live)
+
+        self.tombstones = set()
+        self.next_idx = legacy.ntotal
+        logger.info(f"Migrated FAISS index: kept {len(live)} of {legacy.ntotal} vectors")
+
+    def _log(self, op: str, ids: List[str], payloads: Optional[List[Dict]] = None, internal_ids=None, vectors=None):
+        """
+        Append a mutation to the write-ahead log and fsync it. Must be called while holding the lock.
+
+        Args:
+            op (str): One of "insert", "delete" or "payload".
+            ids (List[str]): Vector ids affected by the mutation.
+            payloads (List[Dict], optional): New payloads, for "insert" and "payload".
+            internal_ids (np.ndarray, optional): Internal ids assigned by "insert".
+            vectors (np.ndarray, optional): Vectors added by "insert".
+        """
+        self.seq += 1
+        if not self.path:
+            return
+
+        record = {"seq": self.seq, "op": op, "ids": ids}
+        if payloads is not None:
+            record["payloads"] = payloads
+        if internal_ids is not None:
+            record["internal_ids"] = internal_ids.tolist()
+        self._wal.append(record, vectors)
+
+        self._wal_ops += 1
+        if self._wal_ops >= self.checkpoint_ops:
+            self._request_checkpoint()
+
+    @contextmanager
+    def _mutation(self):
+        """
+        Apply a mutation in one payload store transaction, committed with its log sequence number.
+
+        Must be used while holding the lock.
+        """
+        with self.docstore.transaction():
+            yield
+            self.docstore.set_meta("seq", self.seq)
+            self.docstore.set_meta("next_idx", self.next_idx)
+
+    @contextmanager
+    def _write(self):
+        """Hold the collection lock and the lock exclusively, caught up with other processes' writes."""
+        with self._file_lock, self._lock:
+            self._sync()
+            yield
+
+    @contextmanager
+    def _read(self):
+        """Hold the lock shared, after catching up with writes other processes committed since the last read."""
+        with self._lock.read():
+            stale = self.docstore is not None and self.docstore.data_version() != self._data_version
+        if stale:
+            with self._file_lock, self._lock:
+                self._sync()
+        with self._lock.read():
+            yield
+
+    def _sync(self):
+        """
+        Catch up with mutations committed by other processes that opened the same collection.
 
-    def _save(self):
-        """Save FAISS index and docstore to disk."""
-        if not self.path or not self.index:
+        Must be called while holding the collection lock and the lock. Their logged mutations are
+        applied to the index and the id mapping, as the payload store already holds them. If the
+        log no longer has them because another process checkpointed, the collection is reloaded.
+        """
+        if not self.path or self.docstore is None:
+            return
+        self._data_version = self.docstore.data_version()
+
+        # Everything before this offset has been applied here, unless another process checkpointed
+        # and replaced the log
+        start = self._wal.applied_offset()
+
+        seq = self.docstore.get_meta("seq", 0)
+        if seq == self.seq:
+            self._wal.seek_end()
+            return
+
+        records = []
+        if seq > self.seq:
+            records = [(record, vectors) for record, vectors in self._wal.records(start) if record["seq"] > self.seq]
+        if not records or records[0][0]["seq"] != self.seq + 1 or records[-1][0]["seq"] != seq:
+            logger.info(f"Reloading collection {self.collection_name} after changes by another process")
+            self._reload()
             return
 
+        for record, vectors in records:
+            self._follow(record, vectors)
+            self.seq = record["seq"]
+        self._wal_ops += len(records)
+        self._wal.seek_end()
+
+    def _follow(self, record: Dict, vectors: Optional[np.ndarray]):
+        """
+        Apply a mutation logged and committed by another process to the index and the id mapping.
+
+        Args:
+            record (Dict): Log record.
+            vectors (np.ndarray, optional): Vectors of an "insert" record.
+        """
+        if record["op"] == "insert":
+            internal_ids = np.array(record["internal_ids"], dtype=np.int64)
+            for internal_id, vector_id in zip(internal_ids.tolist(), record["ids"]):
+                self._forget(vector_id)
+                self.index_to_id[internal_id] = vector_id
+                self.id_to_index[vector_id] = internal_id
+            self._add_vectors(internal_ids, vectors)
+            self.next_idx = max(self.next_idx, int(internal_ids.max()) + 1)
+        elif record["op"] == "delete":
+            for vector_id in record["ids"]:
+                self._forget(vector_id)
+
+    def _reload(self):
+        """Drop the in-memory state and load the collection again from its files."""
+        self._wal.close()
+        self.delta = None
+        self.vector_rows = {}
+        self.free_rows = []
+        self.tombstones = set()
+        self._load_state(f"{self.path}/{self.collection_name}.faiss")
+        self._data_version = self.docstore.data_version()
+
+    def _apply(self, record: Dict):
+        """
+        Apply a logged mutation to the payload store and the id mapping.
+
+        Vectors of "insert" records are added separately, see _recover.
+
+        Args:
+            record (Dict): Log record.
+        """
+        op = record["op"]
+        if op == "insert":
+            internal_ids = np.array(record["internal_ids"], dtype=np.int64)
+            self._register(internal_ids, record["ids"], record["payloads"])
+        elif op == "delete":
+            for vector_id in record["ids"]:
+                if self._tombstone(vector_id):
+                    self.docstore.delete(vector_id)
+        elif op == "payload":
+            for vector_id, payload in zip(record["ids"], record["payloads"]):
+                if vector_id in self.id_to_index:
+                    self._apply_payload(vector_id, payload)
+        else:
+            logger.warning(f"Skipping unknown log record {op}")
+
+    def _apply_insert(self, internal_ids: np.ndarray, vectors: np.ndarray, ids: List[str], payloads: List[Dict]):
+        """
+        Add vectors under the given internal ids and register their payloads.
+
+        Args:
+            internal_ids (np.ndarray): Internal ids of the vectors.
+            vectors (np.ndarray): Vectors to add.
+            ids (List[str]): Vector ids.
+            payloads (List[Dict]): Payloads of the vectors.
+        """
+        self._add_vectors(internal_ids, vectors)
+        self._register(internal_ids, ids, payloads)
+
+    def _add_vectors(self, internal_ids: np.ndarray, vectors: np.ndarray):
+        """Add vectors to the index, or to the delta when the index is read-only."""
+        (self.delta if self.delta is not None else self.index).add_with_ids(vectors, internal_ids)
+        if self.vector_file is not None:
+            self._store_full_vectors(internal_ids, vectors)
+
+    def _register(self, internal_ids: np.ndarray, ids: List[str], payloads: List[Dict]):
+        """Store the payloads of new vectors and map their ids."""
+        self.next_idx = max(self.next_idx, int(internal_ids.max()) + 1)
+        for internal_id, vector_id, payload in zip(internal_ids.tolist(), ids, payloads):
+            if vector_id in self.id_to_index:
+                # Re-inserting an existing id replaces its vector
+                self._tombstone(vector_id)
+            self.docstore.put(vector_id, internal_id, payload)
+            self.index_to_id[internal_id] = vector_id
+            self.id_to_index[vector_id] = internal_id
+            self._index_payload(internal_id, payload)
+
+    def _apply_payload(self, vector_id: str, payload: Dict):
+        """
+        Replace the payload of a stored vector and re-index it.
+
+        Args:
+            vector_id (str): ID of the vector.
+            payload (Dict): New payload.
+        """
+        internal_id = self._internal_id(vector_id)
+        self.docstore.unindex(internal_id)
+        self.docstore.set_payload(vector_id, payload)
+        self._index_payload(internal_id, payload)
+
+    def _index_payload(self, internal_id: int, payload: Dict):
+        """Add a live vector to the secondary payload index."""
+        entries = []
+        for field in self.indexed_fields:
+            value = payload.get(field)
+            if value is None or not _indexable(value):
+                continue
+            entries.append((field, value))
+        if entries:
+            self.docstore.index(internal_id, entries)
+
+    def _rebuild_payload_index(self):
+        """Rebuild the secondary payload index for the configured ``indexed_fields``."""
+        with self.docstore.transaction():
+            self.docstore.clear_index()
+            for internal_id, _, payload in self.docstore.items():
+                self._index_payload(internal_id, payload)
+            self.docstore.set_meta("indexed_fields", json.dumps(self.indexed_fields))
+
+    def _filter_ids(self, filters: Dict) -> set:
+        """
+        Resolve filters to the internal ids of the live vectors that match them.
+
+        Equality, membership and range conditions on indexed fields are answered from the
+        secondary index in the payload store and combined with set algebra; any remaining
+        conditions are checked against the payloads of those candidates only.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            set: Matching internal ids.
+        """
+        return self._resolve_filter(compile_filter(filters))
+
+    def _resolve_filter(self, node: Optional[Node], candidates: Optional[set] = None) -> set:
+        """
+        Internal ids that match a filter, optionally restricted to a candidate set.
+
+        Args:
+            node (Node, optional): Filter.
+            candidates (set, optional): Ids to restrict the result to. Defaults to all live vectors.
+
+        Returns:
+            set: Matching internal ids.
+        """
+        if node is None:
+            return set(self.index_to_id) if candidates is None else candidates
+
+        indexed = self._index_lookup(node)
+        if indexed is not None:
+            return indexed if candidates is None else indexed & candidates
+
+        if isinstance(node, And):
+            # Narrow down with the index-servable conditions first, then the rest
+            residual = []
+            for child in node.nodes:
+                indexed = self._index_lookup(child)
+                if indexed is None:
+                    residual.append(child)
+                else:
+                    candidates = indexed if candidates is None else candidates & indexed
+            for child in residual:
+                if candidates is not None and not candidates:
+                    break
+                candidates = self._resolve_filter(child, candidates)
+            return candidates
+        if isinstance(node, Or):
+            matched = set()
+            for child in node.nodes:
+                matched |= self._resolve_filter(child, candidates)
+            return matched
+        if isinstance(node, Not):
+            universe = set(self.index_to_id) if candidates is None else candidates
+            return universe - self._resolve_filter(node.node, universe)
+
+        universe = sorted(self.index_to_id if candidates is None else candidates)
+        if not universe:
+            return set()
+        payloads = self.docstore.get_many([self.index_to_id[idx] for idx in universe])
+        return {idx for idx in universe if matches(node, payloads.get(self.index_to_id[idx], {}))}
+
+    def _index_lookup(self, node: Node) -> Optional[set]:
+        """Answer a condition on an indexed field from the payload index, or None if it can't be."""
+        field = getattr(node, "field", None)
+        if field not in self.indexed_fields:
+            return None
+        if isinstance(node, Eq):
+            return self.docstore.match([(field, [node.value] if _indexable(node.value) else [])])
+        if isinstance(node, In):
+            return self.docstore.match([(field, [value for value in node.values if _indexable(value)])])
+        if isinstance(node, Range):
+            return self.docstore.match_range(field, node.gte, node.gt, node.lte, node.lt)
+        return None
+
+    def _checkpoint_due(self):
+        """Checkpoint if anything changed since the last one; run by the maintenance threads."""
+        if self.docstore is None or not (self._wal_ops or self._index_changed):
+            return
         try:
+            self.checkpoint()
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint FAISS index: {e}")
+
+    def _request_checkpoint(self):
+        """Checkpoint in the background, without waiting for ``checkpoint_interval``."""
+        if self.path:
+            self._maintenance.submit(self._task_key("checkpoint"), self._checkpoint_due)
+
+    def checkpoint(self):
+        """
+        Snapshot the index to disk and drop the covered part of the write-ahead log.
+
+        The state is serialized in memory while holding the lock shared, so searches go on and
+        only writers wait; nothing is held while the file is written, and writers are blocked
+        again only for the short time it takes to cut the log.
+        """
+        if not self.path:
+            return
+
+        with self._checkpoint_lock:
+            with self._file_lock:
+                with self._lock:
+                    if self.index is None:
+                        return
+                    # The snapshot must cover every logged mutation before the cut, including other processes'
+                    self._sync()
+                with self._lock.read():
+                    # Payloads and ids are already committed; only the index and what describes it
+                    # are written here
+                    state = {
+                        "seq": self.seq,
+                        "index_type": self.active_index_type,
+                        "quantization": self.active_quantization,
+                        "quantization_stats": self.quantization_stats,
+                        "free_rows": list(self.free_rows),
+                    }
+                    rows = np.array(list(self.vector_rows.items()), dtype=np.int64).tobytes()
+                    delta_bytes = faiss.serialize_index(self.delta).tobytes() if self.delta is not None else None
+                    # A mapped index is never modified, so the file on disk is still current
+                    index = self.index
+                    index_bytes = None if self._index_mapped else faiss.serialize_index(index)
+                    wal_offset = self._wal.tell()
+                    wal_ops = self._wal_ops
+                    self._index_changed = False
+                    if self.vector_file is not None:
+                        self.vector_file.flush()
+
             os.makedirs(self.path, exist_ok=True)
             index_path = f"{self.path}/{self.collection_name}.faiss"
-            docstore_path = f"{self.path}/{self.collection_name}.pkl"
+            if index_bytes is not None:
+                write_atomic(index_path, index_bytes)
+
+            with self._file_lock, self._lock:
+                # Records other processes logged meanwhile stay in the log; apply them before cutting it
+                self._sync()
+                with self.docstore.transaction():
+                    self.docstore.set_meta("index_state", json.dumps(state))
+                    self.docstore.set_meta("vector_rows", rows)
+                    self.docstore.set_meta("delta", delta_bytes)
+                self._wal.truncate(wal_offset)
+                self._wal_ops -= wal_ops
+                if self.mmap and index_bytes is not None and self.index is index:
+                    # Serve the index just written from the page cache instead of private memory
+                    self.index = self._read_index(index_path)
+
+    def close(self):
+        """Stop the background maintenance of the store and write a final checkpoint, if anything changed."""
+        for task in ("checkpoint", "compact", "rebuild"):
+            self._maintenance.cancel(self._task_key(task))
+        if self._wal_ops or self._index_changed:
+            self.checkpoint()
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+            if self.vector_file is not None:
+                self.vector_file.close()
+                self.vector_file = None
+            if self.docstore is not None:
+                self.docstore.close()
+                self.docstore = None
+        self._file_lock.close()
+        self._checkpoint_lock.close()
+
+    def _prepare_vectors(self, vectors) -> np.ndarray:
+        """
+        Convert vectors to a float32 matrix, normalized when the distance strategy calls for it.
 
-            faiss.write_index(self.index, index_path)
-            with open(docstore_path, "wb") as f:
-                pickle.dump((self.docstore, self.index_to_id), f)
-        except Exception as e:
-            logger.warning(f"Failed to save FAISS index: {e}")
+        Cosine similarity is the inner product of unit vectors, so 'cosine' collections store and query
+        normalized vectors in an inner product index.
 
-    def _parse_output(self, scores, ids, limit=None) -> List[OutputData]:
+        Args:
+            vectors: One vector or a list of vectors.
+
+        Returns:
+            np.ndarray: Vectors, one per row.
+        """
+        vectors_np = np.array(vectors, dtype=np.float32)
+        if len(vectors_np.shape) == 1:
+            vectors_np = vectors_np.reshape(1, -1)
+
+        distance_strategy = self.distance_strategy.lower()
+        if distance_strategy == "cosine" or (self.normalize_L2 and distance_strategy == "euclidean"):
+            faiss.normalize_L2(vectors_np)
+        return vectors_np
+
+    def _parse_output(self, scores, ids, limit=None, threshold: Optional[float] = None) -> List[OutputData]:
         """
         Parse the output data.
 
         Args:
-            scores: Similarity scores from FAISS.
+            scores: Similarity scores from FAISS, best first.
             ids: Indices from FAISS.
             limit: Maximum number of results to return.
+            threshold: Score cut-off. Results are sorted, so parsing stops at the first one past it.
 
         Returns:
             List[OutputData]: Parsed output data.
         """
         if limit is None:
             limit = len(ids)
+        higher_is_better = self.index.metric_type == faiss.METRIC_INNER_PRODUCT
 
-        results = []
+        hits = []
         for i in range(min(len(ids), limit)):
             if ids[i] == -1:  # FAISS returns -1 for empty results
                 continue
+            if threshold is not None and (scores[i] < threshold if higher_is_better else scores[i] > threshold):
+                break
 
             index_id = int(ids[i])
             vector_id = self.index_to_id.get(index_id)
             if vector_id is None:
                 continue
+            hits.append((vector_id, float(scores[i])))
 
-            payload = self.docstore.get(vector_id)
+        # Only the payloads of the hits are read, in one batch
+        payloads = self.docstore.get_many([vector_id for vector_id, _ in hits])
+
+        results = []
+        for vector_id, score in hits:
+            payload = payloads.get(vector_id)
             if payload is None:
                 continue
 
-            payload_copy = payload.copy()
-
-            score = float(scores[i])
             entry = OutputData(
                 id=vector_id,
                 score=score,
-                payload=payload_copy,
+                payload=payload,
             )
             results.append(entry)
 
         return results
 
+    def _build_index(
+        self,
+        metric_type: int,
+        index_type: str = "flat",
+        training_vectors: Optional[np.ndarray] = None,
+        quantization: Optional[str] = None,
+    ):
+        """
+        Build an empty index addressed by internal ids.
+
+        Vectors are addressed by stable internal ids rather than by their position, so that
+        they can be physically removed without renumbering the remaining ones. Flat and HNSW
+        indexes are wrapped in an IndexIDMap2; IVF indexes store the ids themselves.
+
+        Args:
+            metric_type (int): FAISS metric type.
+            index_type (str, optional): One of INDEX_TYPES. Defaults to "flat".
+            training_vectors (np.ndarray, optional): Vectors to train IVF and quantized indexes on.
+            quantization (str, optional): One of QUANTIZATION_TYPES, or None for float32 vectors.
+
+        Returns:
+            faiss.Index: The empty index.
+        """
+        d = self.embedding_model_dims
+        codec = {
+            None: "Flat",
+            "sq8": "SQ8",
+            "fp16": "SQfp16",
+            "pq": f"PQ{self.pq_m}x{self.pq_nbits}",
+        }[quantization]
+
+        if index_type == "flat" and quantization == "pq":
+            # IndexPQ cannot restrict a search to selected ids; a single IVF cell scans all
+            # codes just the same and can
+            nlist = 1
+        elif index_type in ("flat", "hnsw"):
+            if index_type == "flat":
+                index = faiss.index_factory(d, f"IDMap2,{codec}", metric_type)
+            elif quantization == "pq":
+                index = faiss.index_factory(d, f"IDMap2,HNSW{self.hnsw_m}_PQ{self.pq_m}", metric_type)
+            elif quantization:
+                index = faiss.index_factory(d, f"IDMap2,HNSW{self.hnsw_m},{codec}", metric_type)
+            else:
+                index = faiss.index_factory(d, f"IDMap2,HNSW{self.hnsw_m}", metric_type)
+
+            if index_type == "hnsw":
+                hnsw = faiss.downcast_index(index.index).hnsw
+                hnsw.efConstruction = self.ef_construction
+                hnsw.efSearch = self.ef_search
+            if not index.is_trained:
+                index.train(self._training_sample(training_vectors, 65536))
+            return index
+        else:
+            nlist = self._nlist(len(training_vectors))
+
+        if index_type == "ivf_pq":
+            codec = f"PQ{self.pq_m}x{self.pq_nbits}"
+        index = faiss.index_factory(d, f"IVF{nlist},{codec}", metric_type)
+
+        # k-means does not improve beyond a few hundred points per cell or PQ centroid
+        centroids = max(nlist, 2**self.pq_nbits if codec.startswith("PQ") else 0)
+        index.train(self._training_sample(training_vectors, centroids * 256))
+
+        ivf = faiss.extract_index_ivf(index)
+        # A hashtable direct map allows reconstructing and removing vectors by id
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        ivf.nprobe = self.nprobe
+        return index
+
+    @staticmethod
+    def _training_sample(vectors: np.ndarray, max_size: int) -> np.ndarray:
+        """Sample at most ``max_size`` of ``vectors`` to train on."""
+        if len(vectors) <= max_size:
+            return vectors
+        sample = np.random.default_rng(0).choice(len(vectors), max_size, replace=False)
+        return vectors[np.sort(sample)]
+
+    def _target_quantization(self, index_type: str) -> Optional[str]:
+        """Compression of the vectors held by an index of ``index_type`` built with the configured settings."""
+        if index_type == "ivf_pq":
+            return "pq"
+        return self.quantization
+
+    def _nlist(self, num_vectors: int) -> int:
+        """Number of IVF cells for a collection of ``num_vectors`` vectors."""
+        if self.nlist:
+            return self.nlist
+        return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+    def _min_training_size(self, index_type: str, quantization: Optional[str], num_vectors: int) -> int:
+        """Minimum number of vectors needed to train an index of ``index_type`` with ``quantization``."""
+        size = self._nlist(num_vectors) if index_type.startswith("ivf") else 0
+        if quantization == "pq":
+            size = max(size, 2**self.pq_nbits)
+        elif quantization == "sq8":
+            size = max(size, 1)
+        return size
+
+    def _stored_count(self) -> int:
+        """Number of vectors physically stored in the index and the in-memory delta."""
+        if self.index is None:
+            return 0
+        return self.index.ntotal + (self.delta.ntotal if self.delta is not None else 0)
+
+    def _stored_ids(self) -> np.ndarray:
+        """Internal ids of all vectors physically stored in the index, including tombstoned ones."""
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return faiss.vector_to_array(self.index.id_map)
+
+        invlists = faiss.extract_index_ivf(self.index).invlists
+        ids = [np.empty(0, dtype=np.int64)]
+        for list_no in range(invlists.nlist):
+            size = invlists.list_size(list_no)
+            if size:
+                ids.append(faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy())
+        return np.concatenate(ids)
+
+    def _remove_ids(self, internal_ids: np.ndarray) -> int:
+        """
+        Physically remove vectors from the index.
+
+        Args:
+            internal_ids (np.ndarray): Internal ids to remove.
+
+        Returns:
+            int: Number of vectors removed.
+        """
+        if not isinstance(self.index, faiss.IndexIDMap2):
+            # The hashtable direct map can only remove an explicit id array
+            return self.index.remove_ids(faiss.IDSelectorArray(internal_ids))
+        return self.index.remove_ids(faiss.IDSelectorBatch(internal_ids))
+
     def create_col(self, name: str, vector_size: int = None, distance: str = None):
         """
         Create a new collection.
@@ -162,13 +1105,49 @@ class FAISS(VectorStoreBase):
 
         # Create index based on distance strategy
         if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
-            self.index = faiss.IndexFlatIP(self.embedding_model_dims)
+            metric_type = faiss.METRIC_INNER_PRODUCT
         else:
-            self.index = faiss.IndexFlatL2(self.embedding_model_dims)
+            metric_type = faiss.METRIC_L2
 
-        self.collection_name = name
-
-        self._save()
+        # HNSW and float16 vectors need no training, so they can be used from the start
+        if self.ann_threshold <= 0 and self.index_type in ("flat", "hnsw") and self.quantization in (None, "fp16"):
+            index_type, quantization = self.index_type, self.quantization
+        else:
+            index_type, quantization = "flat", None
+
+        # Other processes must not write to the collection while it is being reset
+        with self._checkpoint_lock, self._file_lock:
+            with self._lock:
+                self.index = self._build_index(metric_type, index_type, quantization=quantization)
+                self._index_mapped = False
+                self.delta = self._build_index(metric_type) if self.mmap else None
+                self.active_index_type = index_type
+                self.active_quantization = quantization
+                self.vector_rows = {}
+                self.free_rows = []
+                self.quantization_stats = {}
+                self.index_to_id = {}
+                self.tombstones = set()
+                self.next_idx = 0
+                self._listing = None
+                self.seq = 0
+                self.id_to_index = {}
+
+                # A log left behind by a previous collection must not be replayed into the new one
+                if self._wal is not None:
+                    self._wal.remove()
+                self._wal_ops = 0
+
+            self.collection_name = name
+            with self._lock:
+                self._wal = WriteAheadLog(self._wal_path, self.embedding_model_dims) if self.path else None
+                self._open_vector_file(truncate=True)
+                self.docstore = self._open_docstore()
+                self.docstore.clear()
+                with self._mutation():
+                    self.docstore.set_meta("indexed_fields", json.dumps(self.indexed_fields))
+
+            self.checkpoint()
 
         return self
 
@@ -199,24 +1178,27 @@ class FAISS(VectorStoreBase):
         if len(vectors) != len(ids) or len(vectors) != len(payloads):
             raise ValueError("Vectors, payloads, and IDs must have the same length")
 
-        vectors_np = np.array(vectors, dtype=np.float32)
-
-        if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
-            faiss.normalize_L2(vectors_np)
-
-        self.index.add(vectors_np)
+        vectors_np = self._prepare_vectors(vectors)
 
-        starting_idx = len(self.index_to_id)
-        for i, (vector_id, payload) in enumerate(zip(ids, payloads)):
-            self.docstore[vector_id] = payload.copy()
-            self.index_to_id[starting_idx + i] = vector_id
-
-        self._save()
+        with self._write(), self._mutation():
+            internal_ids = np.arange(self.next_idx, self.next_idx + len(ids), dtype=np.int64)
+            self._apply_insert(internal_ids, vectors_np, ids, payloads)
+            self._log("insert", ids, payloads=payloads, internal_ids=internal_ids, vectors=vectors_np)
+        self._maybe_compact()
+        self._maybe_upgrade()
+        self._maybe_merge()
 
         logger.info(f"Inserted {len(vectors)} vectors into collection {self.collection_name}")
 
     def search(
-        self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+        self,
+        query: str,
+        vectors: List[list],
+        limit: int = 5,
+        filters: Optional[Dict] = None,
+        threshold: Optional[float] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
     ) -> List[OutputData]:
         """
         Search for similar vectors.
@@ -226,6 +1208,10 @@ class FAISS(VectorStoreBase):
             vectors (List[list]): List of vectors to search.
             limit (int, optional): Number of results to return. Defaults to 5.
             filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            threshold (float, optional): Score cut-off. For 'cosine' and 'inner_product', the minimum similarity;
+                for 'euclidean', the maximum squared L2 distance. Defaults to None.
+            nprobe (int, optional): IVF cells to visit for this query. Defaults to the configured nprobe.
+            ef_search (int, optional): HNSW candidate list size for this query. Defaults to the configured ef_search.
 
         Returns:
             List[OutputData]: Search results.
@@ -233,55 +1219,274 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        query_vectors = np.array(vectors, dtype=np.float32)
+        query_vectors = self._prepare_vectors(vectors)
 
-        if len(query_vectors.shape) == 1:
-            query_vectors = query_vectors.reshape(1, -1)
+        with self._read():
+            return self._search_group(query_vectors[:1], [limit], filters, nprobe, ef_search, threshold)[0]
 
-        if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
-            faiss.normalize_L2(query_vectors)
+    def search_batch(
+        self,
+        queries: List[str],
+        vectors: List[list],
+        limits=None,
+        filters=None,
+        threshold: Optional[float] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[List[OutputData]]:
+        """
+        Search for several query vectors at once.
 
-        fetch_k = limit * 2 if filters else limit
-        scores, indices = self.index.search(query_vectors, fetch_k)
+        Queries that share the same filters are answered by a single matrix search.
 
-        results = self._parse_output(scores[0], indices[0], limit)
+        Args:
+            queries (List[str]): Queries (not used, kept for API compatibility).
+            vectors (List[list]): One query vector per query.
+            limits (int | List[int], optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (Dict | List[Dict], optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold (float, optional): Score cut-off, as in ``search``. Defaults to None.
+            nprobe (int, optional): IVF cells to visit. Defaults to the configured nprobe.
+            ef_search (int, optional): HNSW candidate list size. Defaults to the configured ef_search.
 
-        if filters:
-            filtered_results = []
-            for result in results:
-                if self._apply_filters(result.payload, filters):
-                    filtered_results.append(result)
-                    if len(filtered_results) >= limit:
-                        break
-            results = filtered_results[:limit]
+        Returns:
+            List[List[OutputData]]: Search results, one list per query.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+        if not len(vectors):
+            return []
+
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        query_vectors = self._prepare_vectors(vectors)
+
+        groups = {}
+        for row, query_filters in enumerate(filters):
+            key = json.dumps(query_filters or {}, sort_keys=True, default=str)
+            groups.setdefault(key, []).append(row)
 
+        results = [[] for _ in vectors]
+        with self._read():
+            for rows in groups.values():
+                group_results = self._search_group(
+                    query_vectors[rows], [limits[row] for row in rows], filters[rows[0]], nprobe, ef_search, threshold
+                )
+                for row, hits in zip(rows, group_results):
+                    results[row] = hits
         return results
 
-    def _apply_filters(self, payload: Dict, filters: Dict) -> bool:
+    def _search_group(
+        self,
+        query_vectors: np.ndarray,
+        limits: List[int],
+        filters: Optional[Dict] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        threshold: Optional[float] = None,
+    ) -> List[List[OutputData]]:
         """
-        Apply filters to a payload.
+        Search query vectors that share the same filters in one pass.
 
         Args:
-            payload (Dict): Payload to filter.
-            filters (Dict): Filters to apply.
+            query_vectors (np.ndarray): Query vectors, one per row.
+            limits (List[int]): Number of results for each query.
+            filters (Optional[Dict], optional): Filters shared by all queries. Defaults to None.
+            nprobe (int, optional): IVF cells to visit.
+            ef_search (int, optional): HNSW candidate list size.
+            threshold (float, optional): Score cut-off. Defaults to None.
 
         Returns:
-            bool: True if payload passes filters, False otherwise.
+            List[List[OutputData]]: Search results, one list per query.
         """
-        if not filters or not payload:
-            return True
+        # Only matching live vectors are considered, so the top-k is never crowded out by
+        # other tenants' memories or by deleted vectors
+        if filters:
+            candidates = self._filter_ids(filters)
+            selector = faiss.IDSelectorBatch(np.fromiter(candidates, dtype=np.int64, count=len(candidates)))
+        else:
+            candidates = self.index_to_id
+            selector = self._live_selector()
+
+        fetch_k = min(max(limits), len(candidates))
+        if fetch_k == 0:
+            return [[] for _ in limits]
+
+        if filters and len(candidates) <= self.exact_search_limit:
+            # A handful of candidates is cheaper to score directly, and ANN graphs or cells
+            # may not reach all of them
+            ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            scores, indices = self._search_exact(query_vectors, ids, fetch_k)
+        elif threshold is not None and self.active_index_type == "flat" and self.active_quantization is None:
+            # Vectors outside the threshold are pruned inside the index instead of being ranked first
+            scores, indices = self._range_search(query_vectors, threshold, fetch_k, selector)
+        else:
+            scores, indices = self._search_index(query_vectors, fetch_k, selector, nprobe, ef_search)
+        return [
+            self._parse_output(scores[row], indices[row], limit, threshold) for row, limit in enumerate(limits)
+        ]
 
-        for key, value in filters.items():
-            if key not in payload:
-                return False
+    def _range_search(self, query_vectors: np.ndarray, threshold: float, k: int, selector=None):
+        """
+        Find the stored vectors within the threshold of each query and keep the best k.
 
-            if isinstance(value, list):
-                if payload[key] not in value:
-                    return False
-            elif payload[key] != value:
-                return False
+        Args:
+            query_vectors (np.ndarray): Query vectors.
+            threshold (float): Minimum similarity for inner product, maximum squared distance for L2.
+            k (int): Number of results per query.
+            selector (faiss.IDSelector, optional): Restricts the search to the selected internal ids.
 
-        return True
+        Returns:
+            tuple: Scores and internal ids, shaped like the result of ``index.search``.
+        """
+        params = None
+        if selector is not None:
+            params = faiss.SearchParameters()
+            params.sel = selector
+
+        found = [self.index.range_search(query_vectors, threshold, params=params)]
+        if self.delta is not None and self.delta.ntotal:
+            found.append(self.delta.range_search(query_vectors, threshold, params=params))
+
+        scores = np.full((len(query_vectors), k), np.nan, dtype=np.float32)
+        indices = np.full((len(query_vectors), k), -1, dtype=np.int64)
+        for row in range(len(query_vectors)):
+            row_scores = np.concatenate([D[lims[row] : lims[row + 1]] for lims, D, _ in found])
+            row_ids = np.concatenate([I[lims[row] : lims[row + 1]] for lims, _, I in found])
+            if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                order = np.argsort(-row_scores, kind="stable")[:k]
+            else:
+                order = np.argsort(row_scores, kind="stable")[:k]
+            scores[row, : len(order)] = row_scores[order]
+            indices[row, : len(order)] = row_ids[order]
+        return scores, indices
+
+    def _search_index(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        selector=None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: bool = True,
+    ):
+        """
+        Search the index, re-ranking compressed results with the full-precision vectors.
+
+        Args:
+            query_vectors (np.ndarray): Query vectors.
+            k (int): Number of results per query.
+            selector (faiss.IDSelector, optional): Restricts the search to the selected internal ids.
+            nprobe (int, optional): IVF cells to visit.
+            ef_search (int, optional): HNSW candidate list size.
+            rerank (bool, optional): Re-rank compressed results. Defaults to True.
+
+        Returns:
+            tuple: Scores and internal ids, shaped like the result of ``index.search``.
+        """
+        if not rerank or self.active_quantization is None or self.vector_file is None:
+            return self._search_stored(query_vectors, k, selector, nprobe, ef_search)
+
+        # Distances between compressed codes are approximate: fetch more candidates than asked
+        # and order them by their exact distance
+        _, candidates = self._search_stored(query_vectors, k * self.rerank_factor, selector, nprobe, ef_search)
+        scores = np.full((len(query_vectors), k), np.nan, dtype=np.float32)
+        indices = np.full((len(query_vectors), k), -1, dtype=np.int64)
+        for row, ids in enumerate(candidates):
+            ids = ids[ids >= 0]
+            if len(ids):
+                top_scores, top_ids = self._search_exact(query_vectors[row : row + 1], ids, k)
+                scores[row, : top_ids.shape[1]] = top_scores[0]
+                indices[row, : top_ids.shape[1]] = top_ids[0]
+        return scores, indices
+
+    def _search_stored(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        selector=None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ):
+        """Search the index and the in-memory delta, and merge their results."""
+        params = self._search_params(selector, nprobe=nprobe, ef_search=ef_search)
+        scores, indices = self.index.search(query_vectors, k, params=params)
+        if self.delta is None or not self.delta.ntotal:
+            return scores, indices
+
+        delta_params = None
+        if selector is not None:
+            delta_params = faiss.SearchParameters()
+            delta_params.sel = selector
+        delta_scores, delta_indices = self.delta.search(query_vectors, k, params=delta_params)
+
+        # Missing results are padded with the worst possible score, so they sort last
+        scores = np.concatenate([scores, delta_scores], axis=1)
+        indices = np.concatenate([indices, delta_indices], axis=1)
+        if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        else:
+            order = np.argsort(scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+    def _live_selector(self):
+        """Selector that excludes tombstoned vectors, or None if there are none."""
+        if not self.tombstones:
+            return None
+        dead = np.fromiter(self.tombstones, dtype=np.int64, count=len(self.tombstones))
+        return faiss.IDSelectorNot(faiss.IDSelectorBatch(dead))
+
+    def _search_params(self, selector=None, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Build search parameters for the current index type.
+
+        Args:
+            selector (faiss.IDSelector, optional): Restricts the search to the selected internal ids.
+            nprobe (int, optional): IVF cells to visit.
+            ef_search (int, optional): HNSW candidate list size.
+
+        Returns:
+            faiss.SearchParameters: Search parameters, or None if the defaults apply.
+        """
+        if self.active_index_type == "hnsw":
+            params = faiss.SearchParametersHNSW()
+            params.efSearch = ef_search or self.ef_search
+        elif not isinstance(self.index, faiss.IndexIDMap2):
+            params = faiss.SearchParametersIVF()
+            params.nprobe = nprobe or self.nprobe
+        elif selector is not None:
+            params = faiss.SearchParameters()
+        else:
+            return None
+
+        if selector is not None:
+            params.sel = selector
+        return params
+
+    def _search_exact(self, query_vectors: np.ndarray, internal_ids: np.ndarray, k: int):
+        """
+        Score query vectors against the given stored vectors only.
+
+        Args:
+            query_vectors (np.ndarray): Query vectors.
+            internal_ids (np.ndarray): Internal ids of the vectors to score.
+            k (int): Number of results per query.
+
+        Returns:
+            tuple: Scores and internal ids, shaped like the result of ``index.search``.
+        """
+        stored = self._reconstruct(internal_ids)
+        if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            scores = query_vectors @ stored.T
+            order = -scores
+        else:
+            scores = (
+                (query_vectors**2).sum(axis=1, keepdims=True) - 2 * query_vectors @ stored.T + (stored**2).sum(axis=1)
+            )
+            order = scores
+
+        k = min(k, len(internal_ids))
+        top = np.argpartition(order, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(top, np.argsort(np.take_along_axis(order, top, axis=1), axis=1), axis=1)
+        return np.take_along_axis(scores, top, axis=1), internal_ids[top]
 
     def delete(self, vector_id: str):
         """
@@ -293,22 +1498,358 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        index_to_delete = None
-        for idx, vid in self.index_to_id.items():
-            if vid == vector_id:
-                index_to_delete = idx
-                break
-
-        if index_to_delete is not None:
-            self.docstore.pop(vector_id, None)
-            self.index_to_id.pop(index_to_delete, None)
-
-            self._save()
+        with self._write(), self._mutation():
+            deleted = self._tombstone(vector_id)
+            if deleted:
+                self.docstore.delete(vector_id)
+                self._log("delete", [vector_id])
 
+        if deleted:
+            self._maybe_compact()
             logger.info(f"Deleted vector {vector_id} from collection {self.collection_name}")
         else:
             logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
 
+    def delete_many(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID in one write.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        with self._write(), self._mutation():
+            deleted = [vector_id for vector_id in dict.fromkeys(vector_ids) if self._tombstone(vector_id)]
+            for vector_id in deleted:
+                self.docstore.delete(vector_id)
+            if deleted:
+                self._log("delete", deleted)
+
+        if deleted:
+            self._maybe_compact()
+        logger.info(f"Deleted {len(deleted)} of {len(vector_ids)} vectors from collection {self.collection_name}")
+
+    def _tombstone(self, vector_id: str) -> bool:
+        """
+        Detach a vector id from its slot in the index.
+
+        The vector itself stays in the index, excluded from searches, until the next compaction.
+
+        Args:
+            vector_id (str): ID of the vector.
+
+        Returns:
+            bool: True if the vector was found.
+        """
+        index_to_delete = self._internal_id(vector_id)
+        if index_to_delete is None:
+            return False
+
+        self.docstore.unindex(index_to_delete)
+        self._forget(vector_id)
+        return True
+
+    def _forget(self, vector_id: str):
+        """Unmap a vector id and tombstone its slot, leaving the payload store untouched."""
+        internal_id = self.id_to_index.pop(vector_id, None)
+        if internal_id is not None:
+            self.index_to_id.pop(internal_id, None)
+            self.tombstones.add(internal_id)
+
+    def _internal_id(self, vector_id: str) -> Optional[int]:
+        """
+        Look up the internal id of a live vector.
+
+        Args:
+            vector_id (str): ID of the vector.
+
+        Returns:
+            Optional[int]: The internal id, or None if the vector is not stored.
+        """
+        return self.id_to_index.get(vector_id)
+
+    def _maybe_compact(self):
+        """Start a background compaction once the tombstone ratio crosses ``compact_threshold``."""
+        stored = self._stored_count()
+        if self.index is None or not stored:
+            return
+        if len(self.tombstones) / stored < self.compact_threshold:
+            return
+        self._compact_task = self._maintenance.submit(self._task_key("compact"), self.compact)
+
+    def compact(self) -> int:
+        """
+        Physically remove deleted vectors from the index.
+
+        Returns:
+            int: Number of vectors removed.
+        """
+        if self.active_index_type == "hnsw" or self._index_mapped:
+            # HNSW graphs do not support removal, and a mapped index is read-only; rebuild them
+            # from the live vectors instead
+            dead = len(self.tombstones)
+            return dead if self._rebuild(self.active_index_type, self.active_quantization) else 0
+
+        with self._lock:
+            if self.index is None or not self.tombstones:
+                return 0
+
+            dead = np.fromiter(self.tombstones, dtype=np.int64, count=len(self.tombstones))
+            removed = self._remove_ids(dead)
+            self._release_full_vectors(self.tombstones)
+            self.tombstones.clear()
+            self._index_changed = True
+
+        logger.info(f"Compacted collection {self.collection_name}: removed {removed} vectors")
+        return removed
+
+    def _maybe_upgrade(self):
+        """Start a background migration to ``index_type`` once the collection reaches ``ann_threshold``."""
+        if (
+            self.active_index_type == self.index_type
+            and self.active_quantization == self._target_quantization(self.index_type)
+        ) or len(self.index_to_id) < self.ann_threshold:
+            return
+        self._rebuild_task = self._maintenance.submit(self._task_key("rebuild"), self.rebuild_index)
+
+    def _maybe_merge(self):
+        """Start a background merge of the in-memory delta once it holds ``mmap_delta_limit`` vectors."""
+        if self.delta is None or self.delta.ntotal < self.mmap_delta_limit:
+            return
+        self._rebuild_task = self._maintenance.submit(
+            self._task_key("rebuild"), self._rebuild, self.active_index_type, self.active_quantization
+        )
+
+    def rebuild_index(self, index_type: Optional[str] = None) -> bool:
+        """
+        Rebuild the index from the live vectors, optionally as a different index type.
+
+        The new index is trained and filled without holding the lock, so searches and writes
+        continue against the old one; writes made in the meantime are carried over before swapping.
+        Vectors are compressed with the configured ``quantization``, and the recall lost to it is
+        measured afterwards (see ``measure_quantization``).
+
+        Args:
+            index_type (str, optional): One of INDEX_TYPES. Defaults to the configured index_type.
+
+        Returns:
+            bool: True if the index was rebuilt.
+        """
+        index_type = index_type or self.index_type
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported FAISS index type: {index_type}. Options: {', '.join(INDEX_TYPES)}")
+        return self._rebuild(index_type, self._target_quantization(index_type))
+
+    def _rebuild(self, index_type: str, quantization: Optional[str]) -> bool:
+        """Rebuild the index from the live vectors as ``index_type`` with ``quantization``; see rebuild_index."""
+        with self._rebuild_lock:
+            with self._lock.read():
+                if self.index is None:
+                    return False
+                metric_type = self.index.metric_type
+                live = np.fromiter(self.index_to_id, dtype=np.int64, count=len(self.index_to_id))
+                vectors = self._reconstruct(live)
+
+            if len(live) < self._min_training_size(index_type, quantization, len(live)):
+                logger.warning(f"Not enough vectors to train a {index_type} index for {self.collection_name}")
+                return False
+
+            t0 = time.time()
+            index = self._build_index(metric_type, index_type, training_vectors=vectors, quantization=quantization)
+            if len(live):
+                index.add_with_ids(vectors, live)
+
+            with self._lock:
+                current = set(self.index_to_id)
+                snapshot = set(live.tolist())
+                added = np.array(sorted(current - snapshot), dtype=np.int64)
+                removed = np.array(sorted(snapshot - current), dtype=np.int64)
+                if len(added):
+                    index.add_with_ids(self._reconstruct(added), added)
+
+                previous_type = self.active_index_type
+                dead = set(self.tombstones)
+                self.index = index
+                self._index_mapped = False
+                self._index_changed = True
+                self.delta = self._build_index(metric_type) if self.mmap else None
+                self.active_index_type = index_type
+                self.active_quantization = quantization
+                self.tombstones = set()
+                if len(removed):
+                    try:
+                        self._remove_ids(removed)
+                    except RuntimeError:
+                        self.tombstones = set(removed.tolist())
+                self._release_full_vectors(dead - self.tombstones)
+
+            if quantization is not None and self.vector_file is not None:
+                self.measure_quantization()
+
+        self._request_checkpoint()
+        logger.info(
+            f"Rebuilt collection {self.collection_name} from {previous_type} to {index_type} "
+            f"({quantization or 'float32'} vectors) "
+            f"with {len(current)} vectors in {round(time.time() - t0, 2)}s"
+        )
+        return True
+
+    def _reconstruct(self, internal_ids: np.ndarray) -> np.ndarray:
+        """Read stored vectors back, at full precision when they are kept on disk."""
+        if not len(internal_ids):
+            return np.empty((0, self.embedding_model_dims), dtype=np.float32)
+        if self.vector_file is not None:
+            rows = np.fromiter((self.vector_rows[i] for i in internal_ids.tolist()), dtype=np.int64)
+            return self.vector_file.read(rows)
+        return self._reconstruct_stored(internal_ids)
+
+    def _reconstruct_stored(self, internal_ids: np.ndarray) -> np.ndarray:
+        """Read vectors back from the index and the in-memory delta."""
+        if self.delta is None or not self.delta.ntotal:
+            return self.index.reconstruct_batch(internal_ids)
+
+        in_delta = np.isin(internal_ids, faiss.vector_to_array(self.delta.id_map))
+        vectors = np.empty((len(internal_ids), self.embedding_model_dims), dtype=np.float32)
+        if in_delta.any():
+            vectors[in_delta] = self.delta.reconstruct_batch(internal_ids[in_delta])
+        if not in_delta.all():
+            vectors[~in_delta] = self.index.reconstruct_batch(internal_ids[~in_delta])
+        return vectors
+
+    def measure_quantization(self, limit: int = 10, sample_size: int = 100) -> Dict:
+        """
+        Measure the recall lost by compressing the vectors, with and without re-ranking.
+
+        Stored vectors are sampled as queries and the results of the compressed index are compared
+        with an exact search over the full-precision vectors. The result is reported by ``col_info``.
+
+        Args:
+            limit (int, optional): Number of results per query. Defaults to 10.
+            sample_size (int, optional): Number of stored vectors sampled as queries. Defaults to 100.
+
+        Returns:
+            Dict: "recall" and "reranked_recall" at ``limit``, and the number of queries.
+        """
+        with self._lock.read():
+            live = np.fromiter(self.index_to_id, dtype=np.int64, count=len(self.index_to_id))
+            if not len(live):
+                return {}
+            sample = np.random.default_rng(0).choice(live, min(sample_size, len(live)), replace=False)
+            query_vectors = self._reconstruct(np.sort(sample))
+            truth = self._exact_topk(query_vectors, limit)
+
+        hits = {"recall": 0, "reranked_recall": 0}
+        for query_vector, expected in zip(query_vectors, truth):
+            expected = set(expected.tolist())
+            with self._lock.read():
+                selector = self._live_selector()
+                query_vector = query_vector.reshape(1, -1)
+                _, plain = self._search_index(query_vector, limit, selector, rerank=False)
+                _, reranked = self._search_index(query_vector, limit, selector)
+            hits["recall"] += len(set(plain[0].tolist()) & expected)
+            hits["reranked_recall"] += len(set(reranked[0].tolist()) & expected)
+
+        stats = {name: count / truth.size if truth.size else 1.0 for name, count in hits.items()}
+        stats["limit"] = limit
+        stats["queries"] = len(query_vectors)
+        with self._lock:
+            self.quantization_stats = stats
+        logger.info(f"Quantization recall of collection {self.collection_name}: {stats}")
+        return stats
+
+    def _exact_topk(self, query_vectors: np.ndarray, k: int, batch_size: int = 65536) -> np.ndarray:
+        """
+        Exact top-k internal ids over all live vectors, computed in batches.
+
+        Args:
+            query_vectors (np.ndarray): Query vectors.
+            k (int): Number of results per query.
+            batch_size (int, optional): Number of stored vectors scored at once. Defaults to 65536.
+
+        Returns:
+            np.ndarray: Internal ids of the exact top-k, shaped (len(query_vectors), k).
+        """
+        live = np.fromiter(self.index_to_id, dtype=np.int64, count=len(self.index_to_id))
+        best_scores = np.empty((len(query_vectors), 0), dtype=np.float32)
+        best_ids = np.empty((len(query_vectors), 0), dtype=np.int64)
+        for start in range(0, len(live), batch_size):
+            ids = live[start : start + batch_size]
+            scores, indices = self._search_exact(query_vectors, ids, k)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_ids = np.concatenate([best_ids, indices], axis=1)
+            if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                order = np.argsort(-best_scores, axis=1)[:, :k]
+            else:
+                order = np.argsort(best_scores, axis=1)[:, :k]
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            best_ids = np.take_along_axis(best_ids, order, axis=1)
+        return best_ids
+
+    def benchmark(
+        self,
+        queries: Optional[List[list]] = None,
+        limit: int = 10,
+        nprobe_values=(1, 4, 16, 64, 256),
+        ef_search_values=(16, 32, 64, 128, 256),
+        sample_size: int = 100,
+    ) -> List[Dict]:
+        """
+        Measure recall against exact search and per-query latency for a range of search settings.
+
+        The exact reference is computed from the full-precision vectors, and compressed results are
+        re-ranked like in ``search``.
+
+        Args:
+            queries (List[list], optional): Query vectors. Defaults to a sample of stored vectors.
+            limit (int, optional): Number of results per query. Defaults to 10.
+            nprobe_values (tuple, optional): nprobe values to try on IVF indexes.
+            ef_search_values (tuple, optional): ef_search values to try on HNSW indexes.
+            sample_size (int, optional): Number of stored vectors sampled as queries. Defaults to 100.
+
+        Returns:
+            List[Dict]: One row per setting with "index_type", "param", "value", "recall" and "latency_ms".
+        """
+        with self._lock.read():
+            if queries is None:
+                live = np.fromiter(self.index_to_id, dtype=np.int64, count=len(self.index_to_id))
+                if not len(live):
+                    return []
+                sample = np.random.default_rng(0).choice(live, min(sample_size, len(live)), replace=False)
+                query_vectors = self._reconstruct(np.sort(sample))
+            else:
+                query_vectors = np.array(queries, dtype=np.float32).reshape(-1, self.embedding_model_dims)
+            truth = self._exact_topk(query_vectors, limit)
+
+        if self.active_index_type == "hnsw":
+            settings = [("ef_search", value) for value in ef_search_values]
+        elif self.active_index_type.startswith("ivf"):
+            settings = [("nprobe", value) for value in nprobe_values]
+        else:
+            settings = [(None, None)]
+
+        rows = []
+        for param, value in settings:
+            kwargs = {param: value} if param else {}
+            hits = 0
+            t0 = time.perf_counter()
+            for query_vector, expected in zip(query_vectors, truth):
+                with self._lock.read():
+                    _, indices = self._search_index(query_vector.reshape(1, -1), limit, self._live_selector(), **kwargs)
+                hits += len(set(indices[0].tolist()) & set(expected.tolist()))
+            elapsed = time.perf_counter() - t0
+            rows.append(
+                {
+                    "index_type": self.active_index_type,
+                    "param": param,
+                    "value": value,
+                    "recall": hits / truth.size if truth.size else 1.0,
+                    "latency_ms": 1000 * elapsed / len(query_vectors),
+                }
+            )
+        return rows
+
     def update(
         self,
         vector_id: str,
@@ -326,23 +1867,75 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
-            raise ValueError(f"Vector {vector_id} not found")
-
-        current_payload = self.docstore[vector_id].copy()
+        with self._write():
+            if vector_id not in self.id_to_index:
+                raise ValueError(f"Vector {vector_id} not found")
 
-        if payload is not None:
-            self.docstore[vector_id] = payload.copy()
-            current_payload = self.docstore[vector_id].copy()
+            current_payload = payload.copy() if payload is not None else self.docstore.get(vector_id)
 
-        if vector is not None:
-            self.delete(vector_id)
-            self.insert([vector], [current_payload], [vector_id])
-        else:
-            self._save()
+            if vector is not None:
+                # insert() replaces the vector of an existing id in place
+                self.insert([vector], [current_payload], [vector_id])
+            else:
+                with self._mutation():
+                    self._apply_payload(vector_id, current_payload)
+                    self._log("payload", [vector_id], payloads=[current_payload])
 
         logger.info(f"Updated vector {vector_id} in collection {self.collection_name}")
 
+    def update_many(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[Optional[List[float]]]] = None,
+        payloads: Optional[List[Optional[Dict]]] = None,
+    ):
+        """
+        Update several vectors and their payloads in one write.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (Optional[List[Optional[List[float]]]], optional): Updated vectors, None to keep a vector.
+                Defaults to None.
+            payloads (Optional[List[Optional[Dict]]], optional): Updated payloads, None to keep a payload.
+                Defaults to None.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        vectors = vectors if vectors is not None else [None] * len(vector_ids)
+        payloads = payloads if payloads is not None else [None] * len(vector_ids)
+        if len(vectors) != len(vector_ids) or len(payloads) != len(vector_ids):
+            raise ValueError("Vectors, payloads, and IDs must have the same length")
+
+        with self._write():
+            missing = [vector_id for vector_id in vector_ids if vector_id not in self.id_to_index]
+            if missing:
+                raise ValueError(f"Vectors {', '.join(missing)} not found")
+
+            kept_payloads = [vector_id for vector_id, payload in zip(vector_ids, payloads) if payload is None]
+            current = self.docstore.get_many(kept_payloads)
+            new_payloads = [
+                payload.copy() if payload is not None else current[vector_id]
+                for vector_id, payload in zip(vector_ids, payloads)
+            ]
+
+            moved = [row for row, vector in enumerate(vectors) if vector is not None]
+            if moved:
+                # insert() replaces the vectors of existing ids in place
+                self.insert(
+                    [vectors[row] for row in moved],
+                    [new_payloads[row] for row in moved],
+                    [vector_ids[row] for row in moved],
+                )
+            kept = [row for row, vector in enumerate(vectors) if vector is None]
+            if kept:
+                with self._mutation():
+                    for row in kept:
+                        self._apply_payload(vector_ids[row], new_payloads[row])
+                    self._log("payload", [vector_ids[row] for row in kept], payloads=[new_payloads[row] for row in kept])
+
+        logger.info(f"Updated {len(vector_ids)} vectors in collection {self.collection_name}")
+
     def get(self, vector_id: str) -> OutputData:
         """
         Retrieve a vector by ID.
@@ -356,17 +1949,59 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
+        with self._read():
+            payload = self.docstore.get(vector_id)
+        if payload is None:
             return None
 
-        payload = self.docstore[vector_id].copy()
-
         return OutputData(
             id=vector_id,
             score=None,
             payload=payload,
         )
 
+    def get_many(self, vector_ids: List[str]) -> List[Optional[OutputData]]:
+        """
+        Retrieve several vectors by ID.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[Optional[OutputData]]: One result per id, None where the id does not exist.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        with self._read():
+            payloads = self.docstore.get_many(list(vector_ids))
+        return [
+            OutputData(id=vector_id, score=None, payload=payloads[vector_id]) if vector_id in payloads else None
+            for vector_id in vector_ids
+        ]
+
+    def get_vectors(self, vector_ids: List[str]) -> List[Optional[List[float]]]:
+        """
+        Read the stored vectors of several ids back, at full precision when they are kept on disk.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to read.
+
+        Returns:
+            List[Optional[List[float]]]: One vector per id, None where the id does not exist.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        with self._read():
+            rows = [row for row, vector_id in enumerate(vector_ids) if vector_id in self.id_to_index]
+            internal_ids = np.array([self.id_to_index[vector_ids[row]] for row in rows], dtype=np.int64)
+            stored = self._reconstruct(internal_ids)
+        vectors = [None] * len(vector_ids)
+        for row, vector in zip(rows, stored):
+            vectors[row] = vector.tolist()
+        return vectors
+
     def list_cols(self) -> List[str]:
         """
         List all collections.
@@ -392,22 +2027,44 @@ class FAISS(VectorStoreBase):
         Delete a collection.
         """
         if self.path:
-            try:
-                index_path = f"{self.path}/{self.collection_name}.faiss"
-                docstore_path = f"{self.path}/{self.collection_name}.pkl"
-
-                if os.path.exists(index_path):
-                    os.remove(index_path)
-                if os.path.exists(docstore_path):
-                    os.remove(docstore_path)
-
-                logger.info(f"Deleted collection {self.collection_name}")
-            except Exception as e:
-                logger.warning(f"Failed to delete collection: {e}")
-
-        self.index = None
-        self.docstore = {}
-        self.index_to_id = {}
+            # The lock files stay, so that processes still holding them keep excluding each other
+            with self._checkpoint_lock, self._file_lock:
+                try:
+                    index_path = f"{self.path}/{self.collection_name}.faiss"
+
+                    with self._lock:
+                        if self._wal is not None:
+                            self._wal.close()
+                            self._wal_ops = 0
+                        if self.vector_file is not None:
+                            self.vector_file.close()
+                            self.vector_file = None
+                        if self.docstore is not None:
+                            self.docstore.close()
+                            self.docstore = None
+
+                    db_files = [f"{self._db_path}{suffix}" for suffix in ("", "-wal", "-shm")]
+                    for file_path in (index_path, self._pickle_path, self._wal_path, self._vector_file_path, *db_files):
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+
+                    logger.info(f"Deleted collection {self.collection_name}")
+                except Exception as e:
+                    logger.warning(f"Failed to delete collection: {e}")
+
+        with self._lock:
+            self.index = None
+            self.delta = None
+            self._index_mapped = False
+            self.index_to_id = {}
+            self.tombstones = set()
+            self.next_idx = 0
+            self._listing = None
+            self.seq = 0
+            self.id_to_index = {}
+            self.vector_rows = {}
+            self.free_rows = []
+            self.quantization_stats = {}
 
     def col_info(self) -> Dict:
         """
@@ -419,13 +2076,42 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             return {"name": self.collection_name, "count": 0}
 
+        live = len(self.index_to_id)
+        dead = len(self.tombstones)
+        stored = self._stored_count()
+        delta = stored - self.index.ntotal
+        vector_bytes = self._code_size() * self.index.ntotal + 4 * self.index.d * delta
+        raw_vector_bytes = 4 * self.index.d * stored
         return {
             "name": self.collection_name,
-            "count": self.index.ntotal,
+            "count": live,
             "dimension": self.index.d,
             "distance": self.distance_strategy,
+            "stored": stored,
+            "live": live,
+            "dead": dead,
+            "tombstone_ratio": dead / stored if stored else 0.0,
+            "index_type": self.active_index_type,
+            "target_index_type": self.index_type,
+            "quantization": self.active_quantization,
+            "vector_bytes": vector_bytes,
+            "raw_vector_bytes": raw_vector_bytes,
+            "compression_ratio": raw_vector_bytes / vector_bytes if vector_bytes else 1.0,
+            "quantization_recall": self.quantization_stats.get("recall"),
+            "reranked_recall": self.quantization_stats.get("reranked_recall"),
+            "mmap": self._index_mapped,
+            "delta": delta,
         }
 
+    def _code_size(self) -> int:
+        """Bytes held in memory per stored vector, excluding graph links and ids."""
+        if not isinstance(self.index, faiss.IndexIDMap2):
+            return faiss.extract_index_ivf(self.index).code_size
+        index = faiss.downcast_index(self.index.index)
+        if isinstance(index, faiss.IndexHNSW):
+            index = faiss.downcast_index(index.storage)
+        return index.code_size
+
     def list(self, filters: Optional[Dict] = None, limit: int = 100) -> List[OutputData]:
         """
         List all vectors in a collection.
@@ -435,33 +2121,102 @@ class FAISS(VectorStoreBase):
             limit (int, optional): Number of vectors to return. Defaults to 100.
 
         Returns:
-            List[OutputData]: List of vectors.
+            List[OutputData]: List of vectors, as a flat list like the other stores. Until the
+                store was registered as a provider it returned the list wrapped in another list.
         """
         if self.index is None:
             return []
 
-        results = []
-        count = 0
+        with self._read():
+            if filters:
+                # Matches are returned in insertion order, like an unfiltered listing
+                internal_ids = heapq.nsmallest(limit, self._filter_ids(filters))
+            else:
+                internal_ids = itertools.islice(self.index_to_id, limit)
 
-        for vector_id, payload in self.docstore.items():
-            if filters and not self._apply_filters(payload, filters):
-                continue
+            vector_ids = [self.index_to_id[internal_id] for internal_id in internal_ids]
+            payloads = self.docstore.get_many(vector_ids)
+            results = [OutputData(id=vector_id, score=None, payload=payloads[vector_id]) for vector_id in vector_ids]
 
-            payload_copy = payload.copy()
+        return results
 
-            results.append(
-                OutputData(
-                    id=vector_id,
-                    score=None,
-                    payload=payload_copy,
-                )
-            )
+    def list_page(
+        self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[int] = None
+    ) -> Tuple[List[OutputData], Optional[int]]:
+        """
+        List one page of vectors in insertion order.
 
-            count += 1
-            if count >= limit:
-                break
+        The cursor is the internal id of the last vector of the previous page; internal ids are
+        never reused, so a listing stays consistent while vectors are added or deleted.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (Optional[int], optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[int]]: The page, and the next cursor or None after the last page.
+        """
+        if self.index is None or limit <= 0:
+            return [], None
 
-        return [results]
+        node = compile_filter(filters)
+        with self._read():
+            if node is None:
+                rows = self.docstore.page(cursor, limit)
+            else:
+                rows = self._filtered_page(filters, node, limit, cursor)
+
+        results = [OutputData(id=vector_id, score=None, payload=payload) for _, vector_id, payload in rows]
+        next_cursor = rows[-1][0] if len(rows) == limit else None
+        return results, next_cursor
+
+    def _filtered_page(self, filters: Dict, node: Node, limit: int, cursor: Optional[int]) -> List[tuple]:
+        """
+        Rows of one page of a filtered listing, as (internal id, vector id, payload).
+
+        The matching ids are resolved and sorted on the first page only; later pages bisect them
+        from the cursor, so walking a collection costs one resolution instead of one per page.
+        Ids deleted since are skipped, and payloads are checked again in case they were updated.
+        Vectors added since all have higher internal ids, so they are read from the payload store
+        once the resolved ids run out.
+
+        Args:
+            filters (Dict): Filters of the listing.
+            node (Node): The compiled filters.
+            limit (int): Page size.
+            cursor (Optional[int]): Cursor returned with the previous page.
+
+        Returns:
+            List[tuple]: Up to ``limit`` rows, in insertion order.
+        """
+        key = json.dumps(filters, sort_keys=True, default=str)
+        listing = self._listing
+        if cursor is None or listing is None or listing[0] != key:
+            matched = np.fromiter(sorted(self._filter_ids(filters)), dtype=np.int64)
+            listing = self._listing = (key, self.next_idx, matched)
+        _, resolved_until, matched = listing
+
+        rows = []
+        start = 0 if cursor is None else int(np.searchsorted(matched, cursor, side="right"))
+        while len(rows) < limit and start < len(matched):
+            internal_ids = matched[start : start + limit - len(rows)]
+            start += len(internal_ids)
+            vector_ids = [self.index_to_id.get(int(internal_id)) for internal_id in internal_ids]
+            payloads = self.docstore.get_many([vector_id for vector_id in vector_ids if vector_id is not None])
+            for internal_id, vector_id in zip(internal_ids, vector_ids):
+                payload = payloads.get(vector_id)
+                if payload is not None and matches(node, payload):
+                    rows.append((int(internal_id), vector_id, payload))
+
+        after = max(resolved_until - 1, -1 if cursor is None else cursor, rows[-1][0] if rows else -1)
+        while len(rows) < limit:
+            added = self.docstore.page(after, limit)
+            if not added:
+                break
+            after = added[-1][0]
+            rows.extend(row for row in added if matches(node, row[2]))
+        return rows[:limit]
 
     def reset(self):
         """Reset the index by deleting and recreating it."""
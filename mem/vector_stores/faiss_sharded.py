@@ -0,0 +1,720 @@
+from loguru import logger
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, model_validator
+
+from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.faiss import FAISS, OutputData
+from mem.vector_stores.maintenance import shared_maintenance
+
+# Rough resident size of the id maps of one stored vector (two dict entries with string keys)
+_ID_MAP_BYTES = 200
+
+_SAFE_SHARD_KEY = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class ShardedFAISSConfig(BaseModel):
+    collection_name: str = Field("mem0", description="Name of the collection")
+    path: Optional[str] = Field(None, description="Directory holding the collection's shards")
+    distance_strategy: str = Field(
+        "euclidean", description="Distance strategy: 'euclidean', 'inner_product' or 'cosine'"
+    )
+    normalize_L2: bool = Field(False, description="Normalize vectors for euclidean distance")
+    embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
+    shard_key: str = Field("user_id", description="Payload key whose value selects the shard")
+    num_buckets: Optional[int] = Field(None, description="Hash shard key values into this many shards")
+    memory_budget_mb: float = Field(512, description="Memory budget of the loaded shards")
+    max_open_shards: int = Field(256, description="Maximum number of shards loaded at once")
+    shard_options: Optional[Dict[str, Any]] = Field(None, description="Further FAISS options for every shard")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
+
+
+class _ShardDirectory:
+    """Which shard each vector id lives in, kept in SQLite next to the shards."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS shards (id TEXT PRIMARY KEY, shard TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS shards_shard ON shards (shard);
+            """
+        )
+        self._lock = threading.Lock()
+
+    def get(self, vector_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT shard FROM shards WHERE id = ?", (vector_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, vector_ids: List[str]) -> Dict[str, str]:
+        shards = {}
+        with self._lock:
+            for start in range(0, len(vector_ids), 500):
+                batch = vector_ids[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT id, shard FROM shards WHERE id IN ({','.join('?' * len(batch))})", batch
+                )
+                shards.update(rows)
+        return shards
+
+    def put(self, entries: List[tuple]):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO shards (id, shard) VALUES (?, ?)", entries)
+
+    def delete(self, vector_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM shards WHERE id = ?", (vector_id,))
+
+    def delete_many(self, vector_ids: List[str]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM shards WHERE id = ?", [(vector_id,) for vector_id in vector_ids])
+
+    def shards(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT shard FROM shards ORDER BY shard")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM shards").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ShardedFAISS(VectorStoreBase):
+    def __init__(
+        self,
+        collection_name: str,
+        path: Optional[str] = None,
+        distance_strategy: str = "euclidean",
+        normalize_L2: bool = False,
+        embedding_model_dims: int = 1536,
+        shard_key: str = "user_id",
+        num_buckets: Optional[int] = None,
+        memory_budget_mb: float = 512,
+        max_open_shards: int = 256,
+        shard_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a FAISS vector store split into one FAISS collection per tenant.
+
+        Searches filtered on ``shard_key`` only touch that tenant's shard, and a write only
+        checkpoints the shard it changed. Shards are loaded on demand and the least recently used
+        ones are closed once the loaded shards exceed ``memory_budget_mb`` or ``max_open_shards``.
+        Shards do not start threads of their own: their checkpoints and compactions, and the
+        closing of evicted shards, run on the maintenance threads shared by the process.
+
+        Args:
+            collection_name (str): Name of the collection.
+            path (str, optional): Directory holding the collection's shards. Defaults to None.
+            distance_strategy (str, optional): Distance strategy to use. Options: 'euclidean', 'inner_product', 'cosine'.
+                Defaults to "euclidean".
+            normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
+                Defaults to False.
+            embedding_model_dims (int, optional): Dimensions of the embedding model. Defaults to 1536.
+            shard_key (str, optional): Payload key whose value selects the shard. Vectors without it go
+                to a shared default shard. Defaults to "user_id".
+            num_buckets (int, optional): Hash shard key values into this many shards instead of keeping
+                one shard per value. Defaults to None.
+            memory_budget_mb (float, optional): Estimated memory of the loaded shards above which cold
+                shards are closed. Defaults to 512.
+            max_open_shards (int, optional): Number of loaded shards above which cold shards are closed,
+                whatever their size, as each holds open files. Defaults to 256.
+            shard_options (Dict, optional): Further FAISS options applied to every shard, e.g. index_type.
+                Defaults to None.
+        """
+        self.collection_name = collection_name
+        self.path = path or "/tmp/faiss_sharded"
+        self.distance_strategy = distance_strategy
+        self.normalize_L2 = normalize_L2
+        self.embedding_model_dims = embedding_model_dims
+        self.shard_key = shard_key
+        self.num_buckets = num_buckets
+        self.memory_budget_mb = memory_budget_mb
+        self.max_open_shards = max_open_shards
+        self.shard_options = dict(shard_options or {})
+
+        self.directory = None
+        # Loaded shards, least recently used first, their estimated sizes and the number of callers using each
+        self._shards = OrderedDict()
+        self._sizes = {}
+        self._pins = {}
+        # Shards being loaded, each with a future its other callers wait on
+        self._loading = {}
+        self._shards_lock = threading.Lock()
+        # Evicted shards are closed, and so checkpointed, in the background
+        self._maintenance = shared_maintenance()
+        self._closing = []
+
+        self.create_col(collection_name)
+
+    @property
+    def _shard_dir(self) -> str:
+        return f"{self.path}/{self.collection_name}"
+
+    def _shard_name(self, value) -> str:
+        """
+        Name of the shard holding vectors whose shard key has the given value.
+
+        Args:
+            value: Value of the shard key, or None.
+
+        Returns:
+            str: Shard name, usable as a file name.
+        """
+        if value is None:
+            return "default"
+        if self.num_buckets:
+            return f"b-{zlib.crc32(str(value).encode('utf-8')) % self.num_buckets}"
+        value = str(value)
+        if _SAFE_SHARD_KEY.fullmatch(value):
+            return f"t-{value}"
+        return f"h-{hashlib.sha1(value.encode('utf-8')).hexdigest()}"
+
+    def _target_shard(self, filters: Optional[Dict]) -> Optional[str]:
+        """The single shard a filter restricts a query to, or None if it may match any shard."""
+        if not filters or self.shard_key not in filters:
+            return None
+        value = filters[self.shard_key]
+        if isinstance(value, (list, dict)):
+            return None
+        return self._shard_name(value)
+
+    def _open_shard(self, name: str) -> FAISS:
+        options = dict(self.shard_options)
+        options.update(
+            collection_name=name,
+            path=self._shard_dir,
+            distance_strategy=self.distance_strategy,
+            normalize_L2=self.normalize_L2,
+            embedding_model_dims=self.embedding_model_dims,
+        )
+        return FAISS(**options)
+
+    @contextmanager
+    def _shard(self, name: str):
+        """
+        Use a shard, loading it if needed. It is not evicted while in use.
+
+        Args:
+            name (str): Shard name.
+
+        Yields:
+            FAISS: The shard.
+        """
+        while True:
+            with self._shards_lock:
+                shard = self._shards.get(name)
+                if shard is not None:
+                    self._shards.move_to_end(name)
+                    self._pins[name] = self._pins.get(name, 0) + 1
+                    break
+                loading = self._loading.get(name)
+                if loading is None:
+                    loading = self._loading[name] = Future()
+                    loader = True
+                else:
+                    loader = False
+            if not loader:
+                # Another caller is loading the shard; it may be evicted again before it is used here
+                loading.result()
+                continue
+
+            # Loading happens outside the lock, so that callers of other shards are not held up
+            try:
+                shard = self._open_shard(name)
+            except BaseException as e:
+                with self._shards_lock:
+                    del self._loading[name]
+                loading.set_exception(e)
+                raise
+            with self._shards_lock:
+                del self._loading[name]
+                self._shards[name] = shard
+                self._pins[name] = self._pins.get(name, 0) + 1
+            loading.set_result(shard)
+            break
+        try:
+            yield shard
+        finally:
+            size = self._shard_bytes(shard)
+            with self._shards_lock:
+                self._pins[name] -= 1
+                if not self._pins[name]:
+                    del self._pins[name]
+                if name in self._shards:
+                    self._sizes[name] = size
+            self._evict()
+
+    @staticmethod
+    def _shard_bytes(shard: FAISS) -> int:
+        """Approximate resident memory of a loaded shard: its vectors and id maps."""
+        info = shard.col_info()
+        return info.get("vector_bytes", 0) + _ID_MAP_BYTES * info.get("stored", 0)
+
+    def _evict(self):
+        """
+        Close the least recently used shards not in use until the loaded ones fit the memory budget
+        and ``max_open_shards``.
+        """
+        budget = self.memory_budget_mb * 1024 * 1024
+        evicted = []
+        with self._shards_lock:
+            total = sum(self._sizes.values())
+            count = len(self._shards)
+            for name in list(self._shards):
+                if total <= budget and count <= self.max_open_shards:
+                    break
+                if name in self._pins:
+                    continue
+                evicted.append(self._shards.pop(name))
+                total -= self._sizes.pop(name, 0)
+                count -= 1
+            self._closing = [task for task in self._closing if not task.done()]
+            # Closing checkpoints the shard if it changed, so it is left to the maintenance threads
+            for shard in evicted:
+                self._closing.append(self._maintenance.submit((id(shard), "close"), shard.close))
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} shards of collection {self.collection_name}")
+
+    def _close_shards(self):
+        """Close the loaded shards and wait for evicted ones to be closed."""
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            self._shards.clear()
+            self._sizes.clear()
+            closing, self._closing = self._closing, []
+        for shard in shards:
+            shard.close()
+        for task in closing:
+            try:
+                task.result()
+            except Exception as e:
+                logger.warning(f"Failed to close an evicted shard of collection {self.collection_name}: {e}")
+
+    def _shards_for(self, filters: Optional[Dict]) -> List[str]:
+        """Shards a query with these filters has to look at."""
+        target = self._target_shard(filters)
+        if target is None:
+            return self.directory.shards()
+        # A tenant without memories has no shard, and reading must not create one
+        if target in self._shards or os.path.exists(f"{self._shard_dir}/{target}.faiss"):
+            return [target]
+        return []
+
+    def _merge(self, results: List[List[OutputData]], limit: int) -> List[OutputData]:
+        """Merge per-shard results into the overall best ``limit``."""
+        hits = [hit for shard_hits in results for hit in shard_hits]
+        higher_is_better = self.distance_strategy.lower() in ("inner_product", "cosine")
+        hits.sort(key=lambda hit: hit.score, reverse=higher_is_better)
+        return hits[:limit]
+
+    def create_col(self, name: str, vector_size: int = None, distance: str = None):
+        """
+        Create a new collection, or open it if it exists.
+
+        Args:
+            name (str): Name of the collection.
+            vector_size (int, optional): Dimensions of the vectors. Defaults to embedding_model_dims.
+            distance (str, optional): Distance metric to use. Defaults to distance_strategy.
+
+        Returns:
+            self: The ShardedFAISS instance.
+        """
+        self.collection_name = name
+        if vector_size:
+            self.embedding_model_dims = vector_size
+        if distance:
+            self.distance_strategy = distance
+        os.makedirs(self._shard_dir, exist_ok=True)
+        self.directory = _ShardDirectory(f"{self._shard_dir}/_directory.db")
+        return self
+
+    def insert(
+        self,
+        vectors: List[list],
+        payloads: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Optional[dict[str, any]]
+    ):
+        """
+        Insert vectors, each into the shard of its payload's shard key.
+
+        Args:
+            vectors (List[list]): List of vectors to insert.
+            payloads (Optional[List[Dict]], optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (Optional[List[str]], optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        if payloads is None:
+            payloads = [{} for _ in range(len(vectors))]
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+        if len(vectors) != len(ids) or len(vectors) != len(payloads):
+            raise ValueError("Vectors, payloads, and IDs must have the same length")
+
+        # An id repeated in one insert keeps its last row, as in a single FAISS store
+        last_rows = {vector_id: row for row, vector_id in enumerate(ids)}
+        groups = {}
+        for vector_id, row in last_rows.items():
+            vector, payload = vectors[row], payloads[row]
+            name = self._shard_name(payload.get(self.shard_key))
+            previous = self.directory.get(vector_id)
+            if previous is not None and previous != name:
+                # The shard key changed: the old vector must not stay behind in its old shard
+                with self._shard(previous) as shard:
+                    shard.delete(vector_id)
+            groups.setdefault(name, ([], [], []))
+            groups[name][0].append(vector)
+            groups[name][1].append(payload)
+            groups[name][2].append(vector_id)
+
+        for name, (shard_vectors, shard_payloads, shard_ids) in groups.items():
+            # The directory is written first; an id it maps to a shard that lacks it reads as missing
+            self.directory.put([(vector_id, name) for vector_id in shard_ids])
+            with self._shard(name) as shard:
+                shard.insert(shard_vectors, payloads=shard_payloads, ids=shard_ids)
+
+    def search(self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None, **kwargs) -> List[OutputData]:
+        """
+        Search for similar vectors, in the filtered tenant's shard or else across all shards.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[list]): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            **kwargs: Further FAISS search options, e.g. threshold.
+
+        Returns:
+            List[OutputData]: Search results.
+        """
+        results = []
+        for name in self._shards_for(filters):
+            with self._shard(name) as shard:
+                results.append(shard.search(query, vectors, limit=limit, filters=filters, **kwargs))
+        return self._merge(results, limit)
+
+    def search_batch(self, queries: List[str], vectors: List[list], limits=None, filters=None, **kwargs) -> List[List[OutputData]]:
+        """
+        Search for several query vectors, with one batched search per shard involved.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[list]): One query vector per query.
+            limits (int | List[int], optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (Dict | List[Dict], optional): Filters, shared by all queries or per query. Defaults to None.
+            **kwargs: Further FAISS search options, e.g. threshold.
+
+        Returns:
+            List[List[OutputData]]: Search results, one list per query.
+        """
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        per_shard = {}
+        for row, query_filters in enumerate(filters):
+            for name in self._shards_for(query_filters):
+                per_shard.setdefault(name, []).append(row)
+
+        results = [[] for _ in vectors]
+        for name, rows in per_shard.items():
+            with self._shard(name) as shard:
+                shard_results = shard.search_batch(
+                    [queries[row] for row in rows],
+                    [vectors[row] for row in rows],
+                    limits=[limits[row] for row in rows],
+                    filters=[filters[row] for row in rows],
+                    **kwargs,
+                )
+            for row, hits in zip(rows, shard_results):
+                results[row].append(hits)
+        return [self._merge(shard_results, limit) for shard_results, limit in zip(results, limits)]
+
+    def delete(self, vector_id: str):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
+            return
+        with self._shard(name) as shard:
+            shard.delete(vector_id)
+        self.directory.delete(vector_id)
+
+    def _group_by_shard(self, vector_ids: List[str]) -> Dict[str, List[int]]:
+        """Positions of the stored ids, grouped by the shard they live in."""
+        shards = self.directory.get_many(list(vector_ids))
+        groups = {}
+        for row, vector_id in enumerate(vector_ids):
+            if vector_id in shards:
+                groups.setdefault(shards[vector_id], []).append(row)
+        return groups
+
+    def delete_many(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID, with one write per shard involved.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        for name, rows in self._group_by_shard(vector_ids).items():
+            shard_ids = [vector_ids[row] for row in rows]
+            with self._shard(name) as shard:
+                shard.delete_many(shard_ids)
+            self.directory.delete_many(shard_ids)
+
+    def update(self, vector_id: str, vector: Optional[List[float]] = None, payload: Optional[Dict] = None):
+        """
+        Update a vector and its payload, moving it to another shard if its shard key changed.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (Optional[List[float]], optional): Updated vector. Defaults to None.
+            payload (Optional[Dict], optional): Updated payload. Defaults to None.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            raise ValueError(f"Vector {vector_id} not found")
+
+        if payload is not None and self._shard_name(payload.get(self.shard_key)) != name:
+            if vector is None:
+                raise ValueError(f"Moving vector {vector_id} to another shard requires its vector")
+            # insert() removes it from its old shard
+            self.insert([vector], payloads=[payload], ids=[vector_id])
+            return
+
+        with self._shard(name) as shard:
+            shard.update(vector_id, vector=vector, payload=payload)
+
+    def update_many(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[Optional[List[float]]]] = None,
+        payloads: Optional[List[Optional[Dict]]] = None,
+    ):
+        """
+        Update several vectors, with one write per shard involved.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (Optional[List[Optional[List[float]]]], optional): Updated vectors, None to keep a vector.
+                Defaults to None.
+            payloads (Optional[List[Optional[Dict]]], optional): Updated payloads, None to keep a payload.
+                Defaults to None.
+        """
+        vectors = vectors if vectors is not None else [None] * len(vector_ids)
+        payloads = payloads if payloads is not None else [None] * len(vector_ids)
+        shards = self.directory.get_many(list(vector_ids))
+        missing = [vector_id for vector_id in vector_ids if vector_id not in shards]
+        if missing:
+            raise ValueError(f"Vectors {', '.join(missing)} not found")
+
+        moves, groups = [], {}
+        for row, (vector_id, vector, payload) in enumerate(zip(vector_ids, vectors, payloads)):
+            name = shards[vector_id]
+            if payload is not None and self._shard_name(payload.get(self.shard_key)) != name:
+                if vector is None:
+                    raise ValueError(f"Moving vector {vector_id} to another shard requires its vector")
+                moves.append(row)
+            else:
+                groups.setdefault(name, []).append(row)
+
+        for name, rows in groups.items():
+            with self._shard(name) as shard:
+                shard.update_many(
+                    [vector_ids[row] for row in rows],
+                    vectors=[vectors[row] for row in rows],
+                    payloads=[payloads[row] for row in rows],
+                )
+        if moves:
+            # insert() removes them from their old shards
+            self.insert(
+                [vectors[row] for row in moves],
+                payloads=[payloads[row] for row in moves],
+                ids=[vector_ids[row] for row in moves],
+            )
+
+    def get(self, vector_id: str) -> Optional[OutputData]:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            OutputData: Retrieved vector, or None if it is not stored.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            return None
+        with self._shard(name) as shard:
+            return shard.get(vector_id)
+
+    def get_many(self, vector_ids: List[str]) -> List[Optional[OutputData]]:
+        """
+        Retrieve several vectors by ID, with one lookup per shard involved.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[Optional[OutputData]]: One result per id, None where the id is not stored.
+        """
+        results = [None] * len(vector_ids)
+        for name, rows in self._group_by_shard(vector_ids).items():
+            with self._shard(name) as shard:
+                found = shard.get_many([vector_ids[row] for row in rows])
+            for row, result in zip(rows, found):
+                results[row] = result
+        return results
+
+    def get_vectors(self, vector_ids: List[str]) -> List[Optional[List[float]]]:
+        """
+        Read the stored vectors of several ids back, with one read per shard involved.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to read.
+
+        Returns:
+            List[Optional[List[float]]]: One vector per id, None where the id is not stored.
+        """
+        vectors = [None] * len(vector_ids)
+        for name, rows in self._group_by_shard(vector_ids).items():
+            with self._shard(name) as shard:
+                found = shard.get_vectors([vector_ids[row] for row in rows])
+            for row, vector in zip(rows, found):
+                vectors[row] = vector
+        return vectors
+
+    def list_cols(self) -> List[str]:
+        """
+        List all collections.
+
+        Returns:
+            List[str]: List of collection names.
+        """
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path) if os.path.isdir(f"{self.path}/{name}"))
+
+    def delete_col(self):
+        """Delete the collection and all of its shards."""
+        self._close_shards()
+        if self.directory is not None:
+            self.directory.close()
+            self.directory = None
+        shutil.rmtree(self._shard_dir, ignore_errors=True)
+        logger.info(f"Deleted collection {self.collection_name}")
+
+    def col_info(self) -> Dict:
+        """
+        Get information about a collection.
+
+        Returns:
+            Dict: Collection information.
+        """
+        with self._shards_lock:
+            loaded = dict(self._sizes)
+        return {
+            "name": self.collection_name,
+            "count": self.directory.count(),
+            "dimension": self.embedding_model_dims,
+            "distance": self.distance_strategy,
+            "shard_key": self.shard_key,
+            "shards": len(self.directory.shards()),
+            "loaded_shards": len(loaded),
+            "max_open_shards": self.max_open_shards,
+            "loaded_bytes": sum(loaded.values()),
+            "memory_budget_bytes": int(self.memory_budget_mb * 1024 * 1024),
+        }
+
+    def list(self, filters: Optional[Dict] = None, limit: int = 100) -> List[OutputData]:
+        """
+        List vectors, from the filtered tenant's shard or else shard by shard.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            List[OutputData]: List of vectors.
+        """
+        results = []
+        for name in self._shards_for(filters):
+            if len(results) >= limit:
+                break
+            with self._shard(name) as shard:
+                results.extend(shard.list(filters=filters, limit=limit - len(results)))
+        return results
+
+    def list_page(
+        self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[Tuple[str, int]] = None
+    ) -> Tuple[List[OutputData], Optional[Tuple[str, int]]]:
+        """
+        List one page of vectors, walking the shards in name order.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (Optional[Tuple[str, int]], optional): Cursor returned with the previous page,
+                a shard name and that shard's own cursor. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[Tuple[str, int]]]: The page, and the next cursor or None
+                after the last page.
+        """
+        names = sorted(self._shards_for(filters))
+        shard_cursor = None
+        if cursor is not None:
+            names = [name for name in names if name >= cursor[0]]
+            shard_cursor = cursor[1] if names and names[0] == cursor[0] else None
+
+        results = []
+        for name in names:
+            with self._shard(name) as shard:
+                page, shard_cursor = shard.list_page(filters=filters, limit=limit - len(results), cursor=shard_cursor)
+            results.extend(page)
+            if shard_cursor is not None:
+                return results, (name, shard_cursor)
+            if len(results) >= limit:
+                # This shard is exhausted; the next page starts at the following one
+                following = names[names.index(name) + 1:]
+                return results, (following[0], None) if following else None
+        return results, None
+
+    def close(self):
+        """Close the loaded shards, checkpointing those that changed."""
+        self._close_shards()
+
+    def reset(self):
+        """Reset the collection by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        self.delete_col()
+        self.create_col(self.collection_name)
@@ -0,0 +1,252 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class VectorFile:
+    """
+    Full-precision vectors kept on disk next to a compressed index.
+
+    Rows are written in place and read back through a read-only memory map, so only the pages
+    touched by re-ranking are held in memory.
+    """
+
+    def __init__(self, path: str, dims: int):
+        self.path = path
+        self.dims = dims
+        self.row_bytes = 4 * dims
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        self._file = open(path, "r+b")
+        self.rows = os.path.getsize(path) // self.row_bytes
+        self._mmap = None
+
+    def write(self, rows: List[int], vectors: np.ndarray):
+        """Write ``vectors`` at the given row numbers, growing the file as needed."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        for row, vector in zip(rows, vectors):
+            self._file.seek(row * self.row_bytes)
+            self._file.write(vector.tobytes())
+        self.rows = max(self.rows, max(rows) + 1)
+
+    def read(self, rows: np.ndarray) -> np.ndarray:
+        """Read the vectors at the given row numbers."""
+        self._file.flush()
+        if self._mmap is None or len(self._mmap) < self.rows:
+            self._mmap = np.memmap(self.path, dtype=np.float32, mode="r", shape=(self.rows, self.dims))
+        return np.array(self._mmap[rows])
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._mmap = None
+        self._file.close()
+
+
+class PayloadStore:
+    """
+    Payloads, the id mapping and the secondary payload index of a collection, kept in SQLite.
+
+    Payloads are only read for the vectors asked for, so memory use does not grow with their size.
+    Each mutation is committed together with the sequence number of its write-ahead log record,
+    which tells recovery which logged mutations the store already holds.
+    """
+
+    # SQLite limits the number of parameters of a statement
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str, mmap_size: int = 0):
+        self.path = path
+        self.mmap_size = mmap_size
+        # Writes go through this connection, under the exclusive lock of the owning FAISS store
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        if mmap_size:
+            self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        # Reads made under the shared lock use one connection per thread, so they run in parallel
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS payloads (
+                id TEXT PRIMARY KEY,
+                internal_id INTEGER NOT NULL UNIQUE,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS payload_index (
+                field TEXT NOT NULL,
+                value NOT NULL,
+                internal_id INTEGER NOT NULL,
+                PRIMARY KEY (field, value, internal_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS payload_index_internal_id ON payload_index (internal_id);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+            """
+        )
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """Group statements into one transaction; nested uses join the outer one."""
+        if self._depth == 0:
+            self._conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self._conn.execute("COMMIT")
+
+    def _reader(self) -> sqlite3.Connection:
+        """Connection for reads: the thread's own, unless a transaction must see its own writes."""
+        if self._depth:
+            return self._conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            if self.mmap_size:
+                conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def data_version(self) -> int:
+        """Changes whenever another connection, in this process or another, commits."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get(self, vector_id: str) -> Optional[Dict]:
+        row = self._reader().execute("SELECT payload FROM payloads WHERE id = ?", (vector_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, vector_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch the payloads of several vectors, in as few queries as possible."""
+        payloads = {}
+        for start in range(0, len(vector_ids), self.BATCH_SIZE):
+            batch = vector_ids[start : start + self.BATCH_SIZE]
+            rows = self._reader().execute(
+                f"SELECT id, payload FROM payloads WHERE id IN ({','.join('?' * len(batch))})", batch
+            )
+            payloads.update((vector_id, json.loads(payload)) for vector_id, payload in rows)
+        return payloads
+
+    def put(self, vector_id: str, internal_id: int, payload: Dict):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO payloads (id, internal_id, payload) VALUES (?, ?, ?)",
+            (vector_id, internal_id, json.dumps(payload, ensure_ascii=False, default=str)),
+        )
+
+    def set_payload(self, vector_id: str, payload: Dict):
+        self._conn.execute(
+            "UPDATE payloads SET payload = ? WHERE id = ?", (json.dumps(payload, ensure_ascii=False, default=str), vector_id)
+        )
+
+    def delete(self, vector_id: str):
+        self._conn.execute("DELETE FROM payloads WHERE id = ?", (vector_id,))
+
+    def ids(self):
+        """(internal id, vector id) of every stored vector, in insertion order."""
+        return self._conn.execute("SELECT internal_id, id FROM payloads ORDER BY internal_id").fetchall()
+
+    def items(self):
+        """(internal id, vector id, payload) of every stored vector, in insertion order."""
+        rows = self._conn.execute("SELECT internal_id, id, payload FROM payloads ORDER BY internal_id")
+        for internal_id, vector_id, payload in rows:
+            yield internal_id, vector_id, json.loads(payload)
+
+    def page(self, after: Optional[int], limit: int) -> List[tuple]:
+        """(internal id, vector id, payload) of up to ``limit`` stored vectors after internal id ``after``, in insertion order."""
+        rows = self._reader().execute(
+            "SELECT internal_id, id, payload FROM payloads WHERE internal_id > ? ORDER BY internal_id LIMIT ?",
+            (-1 if after is None else after, limit),
+        )
+        return [(internal_id, vector_id, json.loads(payload)) for internal_id, vector_id, payload in rows]
+
+    def index(self, internal_id: int, entries: List[tuple]):
+        """Add (field, value) entries of a vector to the payload index."""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO payload_index (field, value, internal_id) VALUES (?, ?, ?)",
+            [(field, value, internal_id) for field, value in entries],
+        )
+
+    def unindex(self, internal_id: int):
+        self._conn.execute("DELETE FROM payload_index WHERE internal_id = ?", (internal_id,))
+
+    def clear_index(self):
+        self._conn.execute("DELETE FROM payload_index")
+
+    def match(self, conditions: List[tuple]) -> set:
+        """
+        Internal ids whose indexed fields match all conditions.
+
+        Args:
+            conditions (List[tuple]): (field, accepted values) pairs.
+
+        Returns:
+            set: Matching internal ids.
+        """
+        queries, params = [], []
+        for field, values in conditions:
+            if not values:
+                return set()
+            queries.append(
+                f"SELECT internal_id FROM payload_index WHERE field = ? AND value IN ({','.join('?' * len(values))})"
+            )
+            params += [field, *values]
+        return {row[0] for row in self._reader().execute(" INTERSECT ".join(queries), params)}
+
+    def match_range(self, field: str, gte=None, gt=None, lte=None, lt=None) -> set:
+        """
+        Internal ids whose indexed field lies within a range.
+
+        Numbers are only compared with numbers and strings with strings, as SQLite would
+        otherwise order every string after every number.
+
+        Args:
+            field (str): Indexed field.
+            gte, gt, lte, lt (optional): Bounds; unset bounds are open.
+
+        Returns:
+            set: Matching internal ids.
+        """
+        bounds = [(op, bound) for op, bound in ((">=", gte), (">", gt), ("<=", lte), ("<", lt)) if bound is not None]
+        kinds = {isinstance(bound, str) for _, bound in bounds}
+        if len(kinds) != 1:
+            return set()
+        types = "'text'" if kinds == {True} else "'integer', 'real'"
+        query = f"SELECT internal_id FROM payload_index WHERE field = ? AND typeof(value) IN ({types})"
+        query += "".join(f" AND value {op} ?" for op, _ in bounds)
+        return {row[0] for row in self._reader().execute(query, [field, *(bound for _, bound in bounds)])}
+
+    def get_meta(self, key: str, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def clear(self):
+        with self.transaction():
+            for table in ("payloads", "payload_index", "meta"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+        self._conn.close()
@@ -0,0 +1,310 @@
+"""
+Backend-agnostic filter expressions.
+
+Filters keep the dict form the rest of the code already uses, and gain operators and logic:
+
+    {"user_id": "u1"}                               equality
+    {"type": ["profile", "style"]}                  membership
+    {"timestamp": {"gte": 1700000000, "lt": ...}}   range
+    {"role": {"ne": "system"}}                      negation, also "nin"
+    {"actor_id": {"exists": True}}                  presence
+    {"$or": [{...}, {...}]}, {"$and": [...]}, {"$not": {...}}
+
+`parse` turns them into a small AST, which each backend compiles to its native form, so the
+whole filter runs inside the engine. Parsed filters are cached by `compile_filter`.
+"""
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+
+class Node:
+    """Base class of the filter AST."""
+
+
+@dataclass(frozen=True)
+class Eq(Node):
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class In(Node):
+    field: str
+    values: Tuple
+
+
+@dataclass(frozen=True)
+class Range(Node):
+    field: str
+    gte: Any = None
+    gt: Any = None
+    lte: Any = None
+    lt: Any = None
+
+
+@dataclass(frozen=True)
+class Exists(Node):
+    field: str
+
+
+@dataclass(frozen=True)
+class Not(Node):
+    node: Node
+
+
+@dataclass(frozen=True)
+class And(Node):
+    nodes: Tuple[Node, ...]
+
+
+@dataclass(frozen=True)
+class Or(Node):
+    nodes: Tuple[Node, ...]
+
+
+_RANGE_KEYS = ("gte", "gt", "lte", "lt")
+_OPERATORS = {"eq", "ne", "in", "nin", "exists", *_RANGE_KEYS}
+
+
+def _all(nodes) -> Optional[Node]:
+    nodes = tuple(nodes)
+    if not nodes:
+        return None
+    return nodes[0] if len(nodes) == 1 else And(nodes)
+
+
+def _parse_field(field: str, value) -> Node:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return In(field, tuple(value))
+    if not isinstance(value, dict):
+        return Eq(field, value)
+
+    unknown = set(value) - _OPERATORS
+    if unknown:
+        raise ValueError(f"Unsupported filter operators for {field}: {', '.join(sorted(unknown))}")
+    nodes = []
+    if "eq" in value:
+        nodes.append(Eq(field, value["eq"]))
+    if "ne" in value:
+        nodes.append(Not(Eq(field, value["ne"])))
+    if "in" in value:
+        nodes.append(In(field, tuple(value["in"])))
+    if "nin" in value:
+        nodes.append(Not(In(field, tuple(value["nin"]))))
+    bounds = {key: value[key] for key in _RANGE_KEYS if key in value}
+    if bounds:
+        nodes.append(Range(field, **bounds))
+    if "exists" in value:
+        nodes.append(Exists(field) if value["exists"] else Not(Exists(field)))
+    if not nodes:
+        raise ValueError(f"Empty filter condition for {field}")
+    return _all(nodes)
+
+
+def _parse_operand(key: str, value) -> Node:
+    node = parse(value)
+    if node is None:
+        raise ValueError(f"Empty filter in {key}")
+    return node
+
+
+def parse(filters: Optional[Dict]) -> Optional[Node]:
+    """
+    Parse a filter dict into an AST.
+
+    Args:
+        filters (dict, optional): Filters; the conditions of one dict all have to hold.
+
+    Returns:
+        Node: The filter, or None when there is nothing to filter on.
+
+    Raises:
+        ValueError: If an operator is unknown, or a `$or` / `$not` operand is empty.
+    """
+    if not filters:
+        return None
+    nodes = []
+    for key, value in filters.items():
+        if key == "$and":
+            nodes.extend(node for node in map(parse, value) if node is not None)
+        elif key == "$or":
+            if not value:
+                raise ValueError("Empty filter in $or")
+            nodes.append(Or(tuple(_parse_operand(key, item) for item in value)))
+        elif key == "$not":
+            nodes.append(Not(_parse_operand(key, value)))
+        else:
+            nodes.append(_parse_field(key, value))
+    return _all(nodes)
+
+
+def matches(node: Optional[Node], payload: Dict) -> bool:
+    """
+    Evaluate a filter against a payload.
+
+    A missing field fails every condition on it except negated ones.
+
+    Args:
+        node (Node, optional): Filter.
+        payload (dict): Payload to check.
+
+    Returns:
+        bool: True if the payload passes the filter.
+    """
+    if node is None:
+        return True
+    if isinstance(node, And):
+        return all(matches(child, payload) for child in node.nodes)
+    if isinstance(node, Or):
+        return any(matches(child, payload) for child in node.nodes)
+    if isinstance(node, Not):
+        return not matches(node.node, payload)
+    if isinstance(node, Exists):
+        return payload.get(node.field) is not None
+    if node.field not in payload:
+        return False
+    value = payload[node.field]
+    if isinstance(node, Eq):
+        return value == node.value
+    if isinstance(node, In):
+        return value in node.values
+    try:
+        return (
+            (node.gte is None or value >= node.gte)
+            and (node.gt is None or value > node.gt)
+            and (node.lte is None or value <= node.lte)
+            and (node.lt is None or value < node.lt)
+        )
+    except TypeError:
+        return False
+
+
+def to_qdrant(node: Optional[Node]):
+    """
+    Compile a filter to a Qdrant `Filter`.
+
+    Args:
+        node (Node, optional): Filter.
+
+    Returns:
+        Filter: The Qdrant filter, or None for no filter.
+    """
+    if node is None:
+        return None
+    from qdrant_client.models import Filter
+
+    condition = _qdrant_condition(node)
+    return condition if isinstance(condition, Filter) else Filter(must=[condition])
+
+
+def _qdrant_condition(node: Node):
+    from qdrant_client.models import (
+        FieldCondition,
+        Filter,
+        IsEmptyCondition,
+        MatchAny,
+        MatchValue,
+        PayloadField,
+        Range as QdrantRange,
+    )
+
+    if isinstance(node, And):
+        return Filter(must=[_qdrant_condition(child) for child in node.nodes])
+    if isinstance(node, Or):
+        return Filter(should=[_qdrant_condition(child) for child in node.nodes])
+    if isinstance(node, Not):
+        return Filter(must_not=[_qdrant_condition(node.node)])
+    if isinstance(node, Exists):
+        return Filter(must_not=[IsEmptyCondition(is_empty=PayloadField(key=node.field))])
+    if isinstance(node, Eq):
+        return FieldCondition(key=node.field, match=MatchValue(value=node.value))
+    if isinstance(node, In):
+        return FieldCondition(key=node.field, match=MatchAny(any=list(node.values)))
+    return FieldCondition(key=node.field, range=QdrantRange(gte=node.gte, gt=node.gt, lte=node.lte, lt=node.lt))
+
+
+def _milvus_literal(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    raise ValueError(f"Unsupported filter value for Milvus: {value!r}")
+
+
+def to_milvus(node: Optional[Node], scalar_fields: FrozenSet[str] = frozenset()) -> str:
+    """
+    Compile a filter to a Milvus boolean expression.
+
+    Args:
+        node (Node, optional): Filter.
+        scalar_fields (FrozenSet[str], optional): Keys stored as scalar fields of the collection;
+            all other keys are read from the `metadata` JSON field.
+
+    Returns:
+        str: The expression, empty for no filter.
+    """
+    if node is None:
+        return ""
+
+    def field(name: str) -> str:
+        return name if name in scalar_fields else f"metadata[{json.dumps(name, ensure_ascii=False)}]"
+
+    def compile_node(node: Node) -> str:
+        if isinstance(node, And):
+            return "(" + " and ".join(compile_node(child) for child in node.nodes) + ")"
+        if isinstance(node, Or):
+            return "(" + " or ".join(compile_node(child) for child in node.nodes) + ")"
+        if isinstance(node, Not):
+            return f"(not {compile_node(node.node)})"
+        if isinstance(node, Exists):
+            # Presence is a property of the payload, so it is always checked on the JSON field
+            return f"(exists metadata[{json.dumps(node.field, ensure_ascii=False)}])"
+        if isinstance(node, Eq):
+            return f"({field(node.field)} == {_milvus_literal(node.value)})"
+        if isinstance(node, In):
+            return f"({field(node.field)} in [{', '.join(_milvus_literal(value) for value in node.values)}])"
+        bounds = [
+            f"({field(node.field)} {operator} {_milvus_literal(bound)})"
+            for operator, bound in ((">=", node.gte), (">", node.gt), ("<=", node.lte), ("<", node.lt))
+            if bound is not None
+        ]
+        return bounds[0] if len(bounds) == 1 else "(" + " and ".join(bounds) + ")"
+
+    return compile_node(node)
+
+
+_COMPILERS = {"ast": lambda node: node, "qdrant": to_qdrant, "milvus": to_milvus}
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(filters_json: str) -> Optional[Node]:
+    return parse(json.loads(filters_json))
+
+
+def compile_filter(filters: Optional[Dict], target: str = "ast", *options):
+    """
+    Parse and compile a filter dict, reusing the parsed AST for filters seen before.
+
+    Only the immutable AST is cached; the native filter is built for every call, so callers
+    are free to modify what they get back.
+
+    Args:
+        filters (dict, optional): Filters.
+        target (str, optional): "ast", "qdrant" or "milvus". Defaults to "ast".
+        *options: Further, hashable, arguments of the target's compiler.
+
+    Returns:
+        The compiled filter, or None / "" when there is nothing to filter on.
+    """
+    if not filters:
+        return _COMPILERS[target](None, *options)
+    try:
+        node = _parse_cached(json.dumps(filters, sort_keys=True))
+    except TypeError:
+        # Sets and other non-JSON containers are not cached
+        node = parse(filters)
+    return _COMPILERS[target](node, *options)
@@ -0,0 +1,120 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: collections are only locked within the process
+    fcntl = None
+
+
+class RWLock:
+    """
+    Reader-writer lock: shared by searches and reads, exclusive and re-entrant for writes.
+
+    ``with lock:`` takes it exclusively, like the RLock it replaces; ``with lock.read():`` shares
+    it. Waiting writers hold back new readers, so a steady stream of searches cannot starve them.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._local = threading.local()
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    def acquire(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if getattr(self._local, "reads", 0):
+                raise RuntimeError("Cannot take the write lock while holding the read lock")
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release(self):
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared; a thread already holding it, either way, just re-enters."""
+        reads = getattr(self._local, "reads", 0)
+        with self._cond:
+            if self._writer == threading.get_ident():
+                shared = False
+            else:
+                # Nested reads must not wait for writers, or a writer queued in between deadlocks
+                while not reads and (self._writer is not None or self._writers_waiting):
+                    self._cond.wait()
+                self._readers += 1
+                shared = True
+        self._local.reads = reads + 1
+        try:
+            yield
+        finally:
+            self._local.reads = reads
+            if shared:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+
+class FileLock:
+    """
+    Exclusive lock on a collection, held across threads, store instances and processes.
+
+    Re-entrant within a thread. It is an flock on a lock file, so the OS releases it when the
+    holding process dies.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            if not self._depth and self.path and fcntl is not None:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, "a+b")
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if not self._depth and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._lock.release()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
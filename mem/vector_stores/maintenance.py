@@ -0,0 +1,173 @@
+from loguru import logger
+import heapq
+import itertools
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Hashable, Optional
+
+
+class Maintenance:
+    """
+    Background threads shared by every store of the process for their maintenance work.
+
+    Checkpoints, compactions and index rebuilds of all collections and shards run on the same
+    few threads, instead of each store starting its own. Tasks are keyed: a task whose key is
+    already queued or running is not queued again. Periodic tasks hold their owner weakly, so
+    a store that is dropped without being closed does not stay alive for its timer.
+    """
+
+    def __init__(self, workers: int = 2, name: str = "vector-store-maintenance"):
+        self.workers = workers
+        self.name = name
+        self._init_state()
+        if hasattr(os, "register_at_fork"):
+            # Threads do not survive a fork; the child starts its own on its first task
+            os.register_at_fork(after_in_child=self._init_state)
+
+    def _init_state(self):
+        self._cond = threading.Condition()
+        self._ready = deque()
+        # Key -> future of every task that is queued or running
+        self._tasks = {}
+        self._running = set()
+        # Periodic tasks: key -> (interval, weak method), and a heap of (due time, tie breaker, key)
+        self._periodic = {}
+        self._timers = []
+        self._counter = itertools.count()
+        self._threads = []
+
+    def _start_workers(self):
+        """Start worker threads up to ``workers``. Must be called while holding the condition."""
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key: Hashable, fn: Callable, *args) -> Future:
+        """
+        Run ``fn(*args)`` on a maintenance thread, unless a task with the same key is queued or running.
+
+        Args:
+            key (Hashable): Identifies the task, e.g. (id of the store, "compact").
+            fn (Callable): Function to run.
+
+        Returns:
+            Future: Future of the task, or of the one already queued or running under ``key``.
+        """
+        with self._cond:
+            future = self._tasks.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._tasks[key] = future
+            self._ready.append((key, fn, args, future))
+            self._start_workers()
+            self._cond.notify()
+            return future
+
+    def every(self, key: Hashable, interval: float, method: Callable):
+        """
+        Run a bound method every ``interval`` seconds until cancelled or its owner is garbage collected.
+
+        Args:
+            key (Hashable): Identifies the task; ``cancel`` stops it.
+            interval (float): Seconds between runs.
+            method (Callable): Bound method to run.
+        """
+        with self._cond:
+            self._periodic[key] = (interval, weakref.WeakMethod(method))
+            heapq.heappush(self._timers, (time.monotonic() + interval, next(self._counter), key))
+            self._start_workers()
+            self._cond.notify()
+
+    def cancel(self, key: Hashable, wait: bool = True):
+        """
+        Stop a periodic task, drop it if it is queued, and wait for it if it is running.
+
+        Args:
+            key (Hashable): Key of the task.
+            wait (bool, optional): Wait for a running task to finish. Defaults to True.
+        """
+        with self._cond:
+            self._periodic.pop(key, None)
+            future = self._tasks.get(key)
+            if future is not None and key not in self._running:
+                del self._tasks[key]
+                self._ready = deque(task for task in self._ready if task[0] != key)
+                future.cancel()
+                future = None
+        if future is not None and wait and threading.current_thread() not in self._threads:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def _due(self):
+        """Queue periodic tasks whose time has come. Must be called while holding the condition."""
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, key = heapq.heappop(self._timers)
+            if key not in self._periodic:
+                continue
+            interval, ref = self._periodic[key]
+            method = ref()
+            if method is None:
+                del self._periodic[key]
+                continue
+            if key not in self._tasks:
+                future = Future()
+                self._tasks[key] = future
+                self._ready.append((key, method, (), future))
+            heapq.heappush(self._timers, (now + interval, next(self._counter), key))
+
+    def _next_task(self):
+        """Wait for a task to run and mark it running."""
+        with self._cond:
+            while True:
+                self._due()
+                if self._ready:
+                    task = self._ready.popleft()
+                    self._running.add(task[0])
+                    return task
+                timeout = self._timers[0][0] - time.monotonic() if self._timers else None
+                self._cond.wait(timeout)
+
+    def _work(self):
+        while True:
+            key, fn, args, future = self._next_task()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except Exception as e:
+                logger.warning(f"Maintenance task {key} failed: {e}")
+                outcome = (future.set_exception, e)
+            else:
+                outcome = (future.set_result, result)
+            finally:
+                del fn, args
+                with self._cond:
+                    # A task submitted from now on runs again instead of joining this one
+                    self._running.discard(key)
+                    if self._tasks.get(key) is future:
+                        del self._tasks[key]
+            outcome[0](outcome[1])
+            del outcome
+
+
+_MAINTENANCE: Optional[Maintenance] = None
+_MAINTENANCE_LOCK = threading.Lock()
+
+
+def shared_maintenance() -> Maintenance:
+    """The maintenance threads of the process, started on their first task."""
+    global _MAINTENANCE
+    with _MAINTENANCE_LOCK:
+        if _MAINTENANCE is None:
+            _MAINTENANCE = Maintenance()
+        return _MAINTENANCE
@@ -0,0 +1,240 @@
+"""
+Copy memories from one vector store to another, optionally re-embedding them.
+
+    python -m mem.vector_stores.migrate migration.json
+
+where migration.json holds a `MigrationConfig`, e.g.
+
+    {
+        "source": {"provider": "qdrant", "config": {"collection_name": "memory", "path": "./wks/qdrant"}},
+        "target": {"provider": "milvus", "config": {"collection_name": "memory", "url": "http://..."}},
+        "filters": {"user_id": "u1"},
+        "checkpoint_path": "./wks/migration.json"
+    }
+
+The source is read page by page, vectors are either read back from the source or recomputed by
+`embedder`, and every page is written to the target in bulk. Reading, embedding and writing run
+concurrently, with at most `queue_size` pages in flight between stages. After each page is
+written, the source cursor is saved to `checkpoint_path`, so an interrupted migration resumes where
+it stopped; re-running it for pages written but not yet checkpointed is harmless as writes reuse
+the source ids.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field, model_validator
+
+from mem.com.factory import EmbedderFactory, VectorStoreFactory
+from mem.embeddings.configs import EmbedderConfig
+from mem.vector_stores.configs import VectorStoreConfig
+
+
+class MigrationConfig(BaseModel):
+    source: VectorStoreConfig = Field(..., description="Store to copy memories from")
+    target: VectorStoreConfig = Field(..., description="Store to copy memories to")
+    embedder: Optional[EmbedderConfig] = Field(None, description="Re-embed memories with this embedder instead of copying vectors")
+    filters: Optional[Dict] = Field(None, description="Only migrate memories matching these filters")
+    text_field: str = Field("data", description="Payload key holding the text to re-embed")
+    page_size: int = Field(1000, description="Memories read and written per page")
+    embed_batch_size: int = Field(64, description="Texts per embedding request")
+    embed_workers: int = Field(4, description="Embedding requests in flight")
+    queue_size: int = Field(4, description="Pages buffered between pipeline stages")
+    checkpoint_path: Optional[str] = Field(None, description="File recording progress, to resume an interrupted run")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
+
+    @model_validator(mode="after")
+    def validate_sizes(self) -> "MigrationConfig":
+        for name in ("page_size", "embed_batch_size", "embed_workers", "queue_size"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1")
+        return self
+
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Migration:
+    def __init__(self, config: MigrationConfig, source=None, target=None, embedder=None):
+        """
+        Prepare a migration.
+
+        Args:
+            config (MigrationConfig): Migration settings.
+            source (VectorStoreBase, optional): Source store; created from `config.source` by default.
+            target (VectorStoreBase, optional): Target store; created from `config.target` by default.
+            embedder (EmbeddingBase, optional): Embedder; created from `config.embedder` by default.
+        """
+        self.config = config
+        self.source = source or VectorStoreFactory.create(config.source.provider, config.source.config)
+        self.target = target or VectorStoreFactory.create(config.target.provider, config.target.config)
+        if embedder is None and config.embedder is not None:
+            embedder = EmbedderFactory.create(config.embedder.provider, config.embedder.config, config.target.config)
+        self.embedder = embedder
+        self._stop = threading.Event()
+        self._pool = None
+
+    def _load_checkpoint(self) -> Dict:
+        path = self.config.checkpoint_path
+        if not path or not os.path.exists(path):
+            return {"cursor": None, "migrated": 0, "done": False}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, state: Dict):
+        path = self.config.checkpoint_path
+        if not path:
+            return
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _put(self, channel: queue.Queue, item):
+        """Hand an item to the next stage, giving up once the migration is aborted."""
+        while not self._stop.is_set():
+            try:
+                channel.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _stage(self, inbox: Optional[queue.Queue], outbox: queue.Queue, work):
+        """Run one pipeline stage: apply `work` to every item until the end marker, forwarding failures."""
+        try:
+            if inbox is None:
+                work()
+            else:
+                while not self._stop.is_set():
+                    try:
+                        item = inbox.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+                    if item is _DONE or isinstance(item, _Failed):
+                        self._put(outbox, item)
+                        return
+                    self._put(outbox, work(item))
+                return
+            self._put(outbox, _DONE)
+        except BaseException as e:
+            self._put(outbox, _Failed(e))
+
+    def _read(self, outbox: queue.Queue, cursor):
+        """Stream source pages, each tagged with the cursor that follows it."""
+        while not self._stop.is_set():
+            page, cursor = self.source.list_page(filters=self.config.filters, limit=self.config.page_size, cursor=cursor)
+            if page:
+                self._put(outbox, (page, cursor))
+            if cursor is None:
+                return
+
+    def _vectors(self, item):
+        """Attach vectors to a page: recomputed by the embedder, or read back from the source."""
+        page, cursor = item
+        ids = [str(record.id) for record in page]
+        payloads = [record.payload or {} for record in page]
+        vectors = [None] * len(page)
+        if self.embedder is not None:
+            field = self.config.text_field
+            rows = [row for row, payload in enumerate(payloads) if isinstance(payload.get(field), str)]
+            size = self.config.embed_batch_size
+            batches = [rows[start : start + size] for start in range(0, len(rows), size)]
+            texts = [[payloads[row][field] for row in batch] for batch in batches]
+            for batch, embeddings in zip(batches, self._pool.map(self._embed, texts)):
+                for row, embedding in zip(batch, embeddings):
+                    vectors[row] = embedding
+        missing = [row for row, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Memories without text keep their stored vector
+            for row, vector in zip(missing, self.source.get_vectors([ids[row] for row in missing])):
+                vectors[row] = vector
+        kept = [row for row, vector in enumerate(vectors) if vector is not None]
+        if len(kept) < len(page):
+            logger.warning(f"Skipping {len(page) - len(kept)} memories deleted from the source during the migration")
+        return [vectors[row] for row in kept], [payloads[row] for row in kept], [ids[row] for row in kept], cursor
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_batch(texts, "add").tolist()
+
+    def run(self) -> Dict:
+        """
+        Run, or resume, the migration.
+
+        Returns:
+            Dict: `migrated` memories in total, including earlier runs, and `seconds` spent in this run.
+        """
+        state = self._load_checkpoint()
+        if state["done"]:
+            logger.info(f"Migration already finished: {state['migrated']} memories")
+            return {"migrated": state["migrated"], "seconds": 0.0}
+        if state["cursor"] is not None:
+            logger.info(f"Resuming migration after {state['migrated']} memories")
+
+        started = time.time()
+        pages, vectors = queue.Queue(self.config.queue_size), queue.Queue(self.config.queue_size)
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.config.embed_workers)
+        stages = [
+            threading.Thread(target=self._stage, args=(None, pages, lambda: self._read(pages, state["cursor"])), daemon=True),
+            threading.Thread(target=self._stage, args=(pages, vectors, self._vectors), daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        try:
+            while True:
+                item = vectors.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failed):
+                    raise item.error
+                batch_vectors, payloads, ids, cursor = item
+                if ids:
+                    self.target.insert_many(batch_vectors, payloads=payloads, ids=ids)
+                state["migrated"] += len(ids)
+                state["cursor"] = cursor
+                state["done"] = cursor is None
+                self._save_checkpoint(state)
+                logger.info(f"Migrated {state['migrated']} memories ({time.time() - started:.1f}s)")
+            state["done"] = True
+            self._save_checkpoint(state)
+        finally:
+            self._stop.set()
+            for stage in stages:
+                stage.join()
+            self._pool.shutdown(wait=True)
+        return {"migrated": state["migrated"], "seconds": time.time() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy memories between vector stores")
+    parser.add_argument("config", help="JSON file holding a MigrationConfig")
+    args = parser.parse_args()
+    with open(args.config, encoding="utf-8") as f:
+        config = MigrationConfig(**json.load(f))
+    result = Migration(config).run()
+    logger.info(f"Migrated {result['migrated']} memories in {result['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
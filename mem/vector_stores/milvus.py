@@ -1,4 +1,6 @@
 from loguru import logger
+import json
+import uuid
 from typing import Dict, Optional
 
 import time
@@ -7,13 +9,14 @@ from enum import Enum
 from typing import Any, Dict
 from pydantic import BaseModel, Field, model_validator
 from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.filters import compile_filter
 
 try:
     import pymilvus  # noqa: F401
 except ImportError:
     raise ImportError("The 'pymilvus' library is required. Please install it using 'pip install pymilvus'.")
 
-from pymilvus import CollectionSchema, DataType, FieldSchema, MilvusClient
+from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, MilvusClient, connections
 
 
 class MetricType(str, Enum):
@@ -45,6 +48,8 @@ class MilvusDBConfig(BaseModel):
     collection_name: str = Field("mem0", description="Name of the collection")
     embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
     metric_type: str = Field("COSINE", description="Metric type for similarity search")
+    batch_size: int = Field(1000, description="Rows sent per request by bulk insert, upsert and delete")
+    async_flush: bool = Field(False, description="Trigger a non-blocking flush after each bulk write")
 
     @model_validator(mode="before")
     @classmethod
@@ -73,6 +78,8 @@ class MilvusDB(VectorStoreBase):
         collection_name: str,
         embedding_model_dims: int,
         metric_type: MetricType,
+        batch_size: int = 1000,
+        async_flush: bool = False,
     ) -> None:
         """Initialize the MilvusDB database.
 
@@ -82,14 +89,24 @@ class MilvusDB(VectorStoreBase):
             collection_name (str): Name of the collection (defaults to mem0).
             embedding_model_dims (int): Dimensions of the embedding model (defaults to 1536).
             metric_type (MetricType): Metric type for similarity search (defaults to L2).
+            batch_size (int): Rows sent per request by bulk insert, upsert and delete (defaults to 1000).
+            async_flush (bool): Trigger a non-blocking flush after each bulk write, so new rows are
+                sealed into indexed segments sooner (defaults to False).
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
         self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.async_flush = async_flush
         self.embedding_model_dims = embedding_model_dims
         self.metric_type = metric_type
         if token:
-            self.client = MilvusClient(uri=url, token=token)
+            self._connect_params = {"uri": url, "token": token}
         else:
-            self.client = MilvusClient(uri=url, user=user, password=password)
+            self._connect_params = {"uri": url, "user": user, "password": password}
+        self.client = MilvusClient(**self._connect_params)
+        # ORM connection for the calls MilvusClient lacks, opened on first use
+        self._alias = None
         self.create_col(
             collection_name=self.collection_name,
             vector_size=self.embedding_model_dims,
@@ -112,13 +129,20 @@ class MilvusDB(VectorStoreBase):
 
         if self.client.has_collection(collection_name):
             logger.info(f"Collection {collection_name} already exists. Skipping creation.")
+            fields = {field["name"] for field in self.client.describe_collection(collection_name)["fields"]}
+            self.has_tenant_field = "user_id" in fields
+            if not self.has_tenant_field:
+                logger.info(f"Collection {collection_name} has no user_id partition key; filtering on metadata")
         else:
             fields = [
                 FieldSchema(name="id", dtype=DataType.VARCHAR, is_primary=True, max_length=512),
                 FieldSchema(name="vectors", dtype=DataType.FLOAT_VECTOR, dim=vector_size),
                 FieldSchema(name="metadata", dtype=DataType.JSON),
                 FieldSchema(name="timestamp", dtype=DataType.INT32),
+                # Hashing tenants into partitions lets a user_id filter skip every other tenant's segments
+                FieldSchema(name="user_id", dtype=DataType.VARCHAR, max_length=512, is_partition_key=True),
             ]
+            self.has_tenant_field = True
 
             schema = CollectionSchema(fields, enable_dynamic_field=True)
 
@@ -159,35 +183,77 @@ class MilvusDB(VectorStoreBase):
                 sync=False  # Whether to wait for index creation to complete before returning. Defaults to True.
             )
 
+    def _rows(self, vectors, payloads=None, ids=None) -> list:
+        """Build the entity rows for a bulk write."""
+        timestamp = int(time.time())
+        payloads = payloads if payloads is not None else [{}] * len(vectors)
+        rows = []
+        for idx, embedding, metadata in zip(ids, vectors, payloads):
+            row = {"id": idx, "vectors": embedding, "metadata": metadata, "timestamp": timestamp}
+            if self.has_tenant_field:
+                row["user_id"] = (metadata or {}).get("user_id") or ""
+            rows.append(row)
+        return rows
+
+    def _batches(self, items: list):
+        """Split items into request-sized batches."""
+        for start in range(0, len(items), self.batch_size):
+            yield items[start : start + self.batch_size]
+
+    def _collection(self) -> Collection:
+        """ORM handle of the collection, on a connection of this store's own."""
+        if self._alias is None:
+            alias = f"mem-{uuid.uuid4().hex}"
+            connections.connect(alias=alias, **self._connect_params)
+            self._alias = alias
+        return Collection(self.collection_name, using=self._alias)
+
+    def _flush(self):
+        """Start a flush without waiting for it, if enabled."""
+        if self.async_flush:
+            self._collection().flush(_async=True)
+
     def insert(self, vectors, payloads=None, ids=None, **kwargs: Optional[dict[str, any]]):
-        """Insert vectors into a collection.
+        """Insert vectors into a collection, one request per batch of rows.
 
         Args:
             vectors (List[List[float]]): List of vectors to insert.
             payloads (list[dict], optional): List of payloads corresponding to vectors. Defaults to None.
             ids (list[str], optional): List of IDs corresponding to vectors. Defaults to None.
         """
-        for idx, embedding, metadata in zip(ids, vectors, payloads):
-            data = {"id": idx, "vectors": embedding, "metadata": metadata, "timestamp": int(time.time())}
-            self.client.insert(collection_name=self.collection_name, data=data, **kwargs)
+        rows = self._rows(vectors, payloads, ids)
+        for batch in self._batches(rows):
+            self.client.insert(collection_name=self.collection_name, data=batch, **kwargs)
+        self._flush()
+
+    def upsert(self, vectors, payloads=None, ids=None, **kwargs: Optional[dict[str, any]]):
+        """Insert or replace vectors, one request per batch of rows.
+
+        Args:
+            vectors (List[List[float]]): List of vectors to write.
+            payloads (list[dict], optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list[str], optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        rows = self._rows(vectors, payloads, ids)
+        for batch in self._batches(rows):
+            self.client.upsert(collection_name=self.collection_name, data=batch, **kwargs)
+        self._flush()
 
     def _create_filter(self, filters: dict):
         """Prepare filters for efficient query.
 
+        Filters are compiled by `mem.vector_stores.filters`, e.g. a scalar is equality, a list is IN
+        and `{"timestamp": {"gte": int(time.time()) - 7 * 86400}}` selects the last week. The
+        timestamp, and user_id when it is the partition key, are read from their scalar fields.
+
         Args:
-            filters (dict): filters [user_id, agent_id, run_id]
+            filters (dict): filters [user_id, agent_id, run_id, timestamp, ...]
 
         Returns:
             str: formated filter.
         """
-        operands = []
-        for key, value in filters.items():
-            if isinstance(value, str):
-                operands.append(f'(metadata["{key}"] == "{value}")')
-            else:
-                operands.append(f'(metadata["{key}"] == {value})')
-
-        return " and ".join(operands)
+        scalar_fields = frozenset({"timestamp", "user_id"} if self.has_tenant_field else {"timestamp"})
+        return compile_filter(filters, "milvus", scalar_fields)
 
     def _parse_output(self, data: list, threshold: float):
         """
@@ -240,6 +306,41 @@ class MilvusDB(VectorStoreBase):
         result = self._parse_output(data=hits[0], threshold=threshold)
         return result
 
+    def search_batch(self, queries: list, vectors: list, limits=None, filters=None, threshold: float = 0.4) -> list:
+        """
+        Search for several query vectors, with one request per distinct filter.
+
+        Args:
+            queries (list): Queries.
+            vectors (List[List[float]]): One query vector per query.
+            limits (int | list[int], optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (Dict | list[Dict], optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold: score_threshold
+
+        Returns:
+            list: Search results, one list per query.
+        """
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+
+        # A Milvus search takes many vectors but a single filter expression
+        groups = {}
+        for row, query_filters in enumerate(filters):
+            query_filter = self._create_filter(query_filters) if query_filters else None
+            groups.setdefault(query_filter, []).append(row)
+
+        results = [[] for _ in vectors]
+        for query_filter, rows in groups.items():
+            hits = self.client.search(
+                collection_name=self.collection_name,
+                data=[vectors[row] for row in rows],
+                limit=max(limits[row] for row in rows),
+                filter=query_filter,
+                output_fields=["*"],
+            )
+            for row, row_hits in zip(rows, hits):
+                results[row] = self._parse_output(data=row_hits[: limits[row]], threshold=threshold)
+        return results
+
     def delete(self, vector_id):
         """
         Delete a vector by ID.
@@ -247,7 +348,18 @@ class MilvusDB(VectorStoreBase):
         Args:
             vector_id (str): ID of the vector to delete.
         """
-        self.client.delete(collection_name=self.collection_name, ids=vector_id)
+        self.delete_many([vector_id])
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete vectors by ID, one request per batch of ids.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        for batch in self._batches(list(vector_ids)):
+            self.client.delete(collection_name=self.collection_name, ids=batch)
+        self._flush()
 
     def update(self, vector_id=None, vector=None, payload=None):
         """
@@ -258,8 +370,67 @@ class MilvusDB(VectorStoreBase):
             vector (List[float], optional): Updated vector.
             payload (Dict, optional): Updated payload.
         """
-        schema = {"id": vector_id, "vectors": vector, "metadata": payload, "timestamp": int(time.time())}
-        self.client.upsert(collection_name=self.collection_name, data=schema)
+        self.update_many([vector_id], vectors=[vector], payloads=[payload])
+
+    def update_many(self, vector_ids: list, vectors: list = None, payloads: list = None):
+        """
+        Update several vectors and their payloads with bulk upserts.
+
+        Milvus replaces whole rows, so vectors and payloads left as None are read back first.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[List[float]], optional): Updated vectors, None to keep a vector.
+            payloads (List[Dict], optional): Updated payloads, None to keep a payload.
+        """
+        vectors = list(vectors) if vectors is not None else [None] * len(vector_ids)
+        payloads = list(payloads) if payloads is not None else [None] * len(vector_ids)
+        incomplete = {
+            vector_id for vector_id, vector, payload in zip(vector_ids, vectors, payloads) if vector is None or payload is None
+        }
+        if incomplete:
+            rows = self.client.get(
+                collection_name=self.collection_name, ids=list(incomplete), output_fields=["id", "vectors", "metadata"]
+            )
+            current = {row["id"]: row for row in rows}
+            for position, vector_id in enumerate(vector_ids):
+                if vector_id not in incomplete:
+                    continue
+                if vector_id not in current:
+                    raise ValueError(f"Vector {vector_id} not found")
+                if vectors[position] is None:
+                    vectors[position] = current[vector_id]["vectors"]
+                if payloads[position] is None:
+                    payloads[position] = current[vector_id]["metadata"]
+        self.upsert(vectors, payloads=payloads, ids=list(vector_ids))
+
+    def get_many(self, vector_ids: list) -> list:
+        """
+        Retrieve several vectors by ID in one request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[OutputData]: One result per id, None where the id does not exist.
+        """
+        rows = self.client.get(collection_name=self.collection_name, ids=list(vector_ids))
+        by_id = {row.get("id"): OutputData(id=row.get("id"), score=None, payload=row.get("metadata")) for row in rows}
+        return [by_id.get(vector_id) for vector_id in vector_ids]
+
+    def get_vectors(self, vector_ids: list) -> list:
+        """
+        Read the stored vectors of several ids back in one request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to read.
+
+        Returns:
+            List[List[float]]: One vector per id, None where the id does not exist.
+        """
+        rows = self.client.get(collection_name=self.collection_name, ids=list(vector_ids), output_fields=["id", "vectors"])
+        by_id = {row["id"]: list(row["vectors"]) for row in rows}
+        return [by_id.get(vector_id) for vector_id in vector_ids]
 
     def get(self, vector_id):
         """
@@ -320,6 +491,63 @@ class MilvusDB(VectorStoreBase):
             memories.append(obj)
         return memories
 
+    def list_page(self, filters: dict = None, limit: int = 100, cursor: str = None) -> tuple:
+        """
+        List one page of vectors in primary key order.
+
+        Pages are queried the way pymilvus' query iterator does it: the query is flagged as an
+        iterator query, for which the server returns the smallest matching primary keys in order,
+        and the next page starts after the last key of this one.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (str, optional): Last id of the previous page. Defaults to None.
+
+        Returns:
+            tuple: The page, and the next cursor or None after the last page.
+        """
+        operands = [self._create_filter(filters)] if filters else []
+        if cursor is not None:
+            operands.append(f"(id > {json.dumps(cursor)})")
+        result = self.client.query(
+            collection_name=self.collection_name,
+            filter=" and ".join(operands),
+            output_fields=["id", "metadata"],
+            limit=limit,
+            iterator=True,
+        )
+        # Plain queries make no ordering promise, so the cursor never relies on the response order
+        result = sorted(result, key=lambda data: data.get("id"))
+        memories = [OutputData(id=data.get("id"), score=None, payload=data.get("metadata")) for data in result]
+        next_cursor = memories[-1].id if len(memories) == limit else None
+        return memories, next_cursor
+
+    def iter_list(self, filters: dict = None, page_size: int = 100):
+        """
+        Stream vectors page by page with a server-side query iterator.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list.
+            page_size (int, optional): Number of vectors per page. Defaults to 100.
+
+        Yields:
+            List[OutputData]: One page of vectors.
+        """
+        iterator = self._collection().query_iterator(
+            batch_size=page_size,
+            expr=self._create_filter(filters) if filters else None,
+            output_fields=["id", "metadata"],
+        )
+        try:
+            while True:
+                result = iterator.next()
+                if not result:
+                    return
+                yield [OutputData(id=data.get("id"), score=None, payload=data.get("metadata")) for data in result]
+        finally:
+            iterator.close()
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
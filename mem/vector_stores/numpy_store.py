@@ -0,0 +1,743 @@
+from loguru import logger
+import hashlib
+import heapq
+import io
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.filters import And, Eq, Exists, Node, Not, Or, compile_filter, matches
+from mem.vector_stores.locks import FileLock
+from mem.vector_stores.wal import WriteAheadLog, write_atomic
+
+# Journal size below which it is never compacted, however small the collection
+_MIN_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+class OutputData(BaseModel):
+    id: Optional[str]  # memory id
+    score: Optional[float]  # cosine similarity
+    payload: Optional[Dict]  # metadata
+
+
+class NumpyConfig(BaseModel):
+    collection_name: str = Field("mem0", description="Name of the collection")
+    path: Optional[str] = Field(None, description="Directory holding the collection files, None to keep it in memory")
+    embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
+    partition_key: str = Field("user_id", description="Payload key whose values get their own matrix")
+    mmap: bool = Field(True, description="Memory-map saved matrices until they are first written")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
+
+
+class _Partition:
+    """The vectors and payloads of one partition key value, as a contiguous float32 matrix."""
+
+    def __init__(self, key: Optional[str], dims: int):
+        self.key = key
+        self.vectors = np.empty((0, dims), dtype=np.float32)
+        self.size = 0
+        self.ids: List[str] = []
+        self.payloads: List[Dict] = []
+        self.row_of: Dict[str, int] = {}
+        # Payload columns built on first use by a filter, then kept in step with writes
+        self.columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.vectors[: self.size]
+
+    def _writable(self, capacity: int):
+        """Make the matrix an in-RAM array with room for ``capacity`` rows."""
+        if capacity > self.vectors.shape[0] or not self.vectors.flags.writeable:
+            grown = np.empty((max(capacity, 2 * self.vectors.shape[0], 16), self.vectors.shape[1]), dtype=np.float32)
+            grown[: self.size] = self.vectors[: self.size]
+            self.vectors = grown
+
+    def column(self, field: str) -> np.ndarray:
+        """Values of a payload field for every row, None where it is missing."""
+        column = self.columns.get(field)
+        if column is None:
+            column = np.empty(self.size, dtype=object)
+            column[:] = [payload.get(field) for payload in self.payloads]
+            self.columns[field] = column
+        return column
+
+    def put(self, vector_ids: List[str], vectors: np.ndarray, payloads: List[Dict]):
+        """Insert rows, or replace the rows of ids that are already stored."""
+        # Only the last occurrence of an id repeated within the batch is kept
+        last = list({vector_id: i for i, vector_id in enumerate(vector_ids)}.values())
+        self._writable(self.size + len(last))
+        old_size = self.size
+        rows = np.empty(len(last), dtype=np.int64)
+        for i, position in enumerate(last):
+            vector_id = vector_ids[position]
+            row = self.row_of.get(vector_id)
+            if row is None:
+                row = self.row_of[vector_id] = self.size
+                self.size += 1
+                self.ids.append(vector_id)
+                self.payloads.append(None)
+            rows[i] = row
+        self.vectors[rows] = vectors[last]
+        if self.size > old_size:
+            # Columns grow once per batch rather than once per row
+            added = np.full(self.size - old_size, None, dtype=object)
+            for field, column in self.columns.items():
+                self.columns[field] = np.concatenate([column, added])
+        for row, position in zip(rows.tolist(), last):
+            self.payloads[row] = payloads[position]
+            for field, column in self.columns.items():
+                column[row] = payloads[position].get(field)
+
+    def set_payload(self, vector_id: str, payload: Dict):
+        row = self.row_of[vector_id]
+        self.payloads[row] = payload
+        for field, column in self.columns.items():
+            column[row] = payload.get(field)
+
+    def remove(self, vector_id: str):
+        """Remove a row by moving the last row into its place, keeping the matrix contiguous."""
+        self._writable(self.size)
+        row = self.row_of.pop(vector_id)
+        last = self.size - 1
+        if row != last:
+            moved_id = self.ids[last]
+            self.vectors[row] = self.vectors[last]
+            self.ids[row] = moved_id
+            self.payloads[row] = self.payloads[last]
+            self.row_of[moved_id] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.ids.pop()
+        self.payloads.pop()
+        for field in self.columns:
+            self.columns[field] = self.columns[field][:last]
+        self.size = last
+
+
+class NumpyStore(VectorStoreBase):
+    def __init__(
+        self,
+        collection_name: str,
+        path: Optional[str] = None,
+        embedding_model_dims: int = 1536,
+        partition_key: str = "user_id",
+        mmap: bool = True,
+    ):
+        """
+        Initialize an in-process vector store doing exact cosine search with NumPy.
+
+        Vectors are kept as one contiguous float32 matrix per value of ``partition_key``, so a
+        search filtered on it scores that user's memories with a single matrix product.
+
+        On disk, a collection is a snapshot, one .npy matrix and one JSON file of ids and payloads
+        per partition listed in a manifest, and a journal of the writes made since. A write only
+        appends to the journal; once the journal outgrows the snapshot, the partitions it changed
+        are written anew and the journal is cut. Processes sharing the collection take turns
+        through a lock file and catch up with each other's writes through the journal.
+
+        Args:
+            collection_name (str): Name of the collection.
+            path (str, optional): Directory holding the collection files. Defaults to None (in memory only).
+            embedding_model_dims (int, optional): Dimensions of the embedding model. Defaults to 1536.
+            partition_key (str, optional): Payload key whose values get their own matrix. Defaults to "user_id".
+            mmap (bool, optional): Memory-map saved matrices until they are first written. Defaults to True.
+        """
+        self.path = path
+        self.embedding_model_dims = embedding_model_dims
+        self.partition_key = partition_key
+        self.mmap = mmap
+        self._lock = threading.RLock()
+        self._file_lock = None
+        self._journal = None
+        self.create_col(collection_name)
+
+    @property
+    def _manifest_path(self) -> str:
+        return f"{self._dir}/manifest.json"
+
+    def _partition_file(self, key: Optional[str]) -> str:
+        return hashlib.sha1(json.dumps(key).encode()).hexdigest()[:16]
+
+    def _read_manifest(self) -> Dict:
+        """The snapshot: its sequence number and the files of each partition, by partition file name."""
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        # Collections saved before the journal was added hold one file pair per partition
+        names = [name[:-5] for name in os.listdir(self._dir) if name.endswith(".json")]
+        return {"seq": 0, "partitions": {name: name for name in names}}
+
+    def _load(self):
+        """Load the snapshot of the collection, then replay its journal."""
+        self.partitions: Dict[Optional[str], _Partition] = {}
+        self.partition_of: Dict[str, Optional[str]] = {}
+        # Sequence number of the last write applied, and the partitions changed since the snapshot
+        self._seq = 0
+        self._dirty = set()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if not self._dir:
+            return
+
+        os.makedirs(self._dir, exist_ok=True)
+        manifest = self._read_manifest()
+        for base in manifest["partitions"].values():
+            with open(f"{self._dir}/{base}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            partition = _Partition(meta["key"], self.embedding_model_dims)
+            partition.vectors = np.load(f"{self._dir}/{base}.npy", mmap_mode="r" if self.mmap else None)
+            partition.size = len(meta["ids"])
+            partition.ids = meta["ids"]
+            partition.payloads = meta["payloads"]
+            partition.row_of = {vector_id: row for row, vector_id in enumerate(partition.ids)}
+            self.partitions[partition.key] = partition
+            self.partition_of.update((vector_id, partition.key) for vector_id in partition.ids)
+        self._seq = manifest["seq"]
+
+        self._journal = WriteAheadLog(f"{self._dir}/journal.wal", self.embedding_model_dims)
+        replayed = 0
+        for record, vectors in self._journal.records():
+            if record["seq"] > self._seq:
+                self._apply(record, vectors)
+                replayed += 1
+        self._journal.open()
+        if replayed:
+            logger.info(f"Replayed {replayed} journaled writes into collection {self.collection_name}")
+
+    def _sync(self):
+        """
+        Catch up with writes other processes made to the collection.
+
+        Must be called while holding the collection lock and the lock. Their journaled writes are
+        applied here; if the journal no longer has them because another process compacted it, the
+        collection is loaded again.
+        """
+        if self._journal is None or self._journal.is_current():
+            return
+        if not os.path.isdir(self._dir):
+            # Another process deleted the collection
+            self._load()
+            return
+        start = self._journal.applied_offset()
+        records = [(record, vectors) for record, vectors in self._journal.records(start) if record["seq"] > self._seq]
+        if (records and records[0][0]["seq"] != self._seq + 1) or (
+            not records and self._read_manifest()["seq"] > self._seq
+        ):
+            logger.info(f"Reloading collection {self.collection_name} after changes by another process")
+            self._load()
+            return
+        for record, vectors in records:
+            self._apply(record, vectors)
+        self._journal.seek_end()
+
+    @contextmanager
+    def _write(self):
+        """Hold the collection lock and the lock, caught up with other processes' writes."""
+        if self._file_lock is None:
+            with self._lock:
+                yield
+            return
+        with self._file_lock, self._lock:
+            self._sync()
+            yield
+
+    @contextmanager
+    def _read(self):
+        """Hold the lock, after catching up with writes other processes made since the last read."""
+        with self._lock:
+            stale = self._journal is not None and not self._journal.is_current()
+        if stale:
+            with self._file_lock, self._lock:
+                self._sync()
+        with self._lock:
+            yield
+
+    def _commit(self, record: Dict, vectors: Optional[np.ndarray] = None):
+        """
+        Journal a write and apply it. Must be called inside ``_write``.
+
+        Args:
+            record (Dict): "put" with ids and payloads, or "delete" with ids.
+            vectors (np.ndarray, optional): Normalized vectors of a "put".
+        """
+        record["seq"] = self._seq + 1
+        if self._journal is not None:
+            self._journal.append(record, vectors)
+        self._apply(record, vectors)
+        if self._journal is not None and self._journal.tell() > max(_MIN_COMPACT_BYTES, self._snapshot_bytes()):
+            self.compact()
+
+    def _apply(self, record: Dict, vectors: Optional[np.ndarray]):
+        """Apply a journaled write to the partitions."""
+        ids = record["ids"]
+        if record["op"] == "put":
+            payloads = record["payloads"]
+            # An id repeated in one write keeps its last row, whichever partition the others went to
+            last_rows = {vector_id: row for row, vector_id in enumerate(ids)}
+            groups = {}
+            for vector_id, row in last_rows.items():
+                key = self._key(payloads[row])
+                previous = self.partition_of.get(vector_id, key)
+                if previous != key:
+                    # The partition key changed: the row moves to its new partition
+                    self.partitions[previous].remove(vector_id)
+                    self.partition_of.pop(vector_id)
+                    groups.setdefault(previous, [])
+                groups.setdefault(key, []).append(row)
+            for key, rows in groups.items():
+                partition = self.partitions.get(key)
+                if partition is None:
+                    partition = self.partitions[key] = _Partition(key, self.embedding_model_dims)
+                if rows:
+                    partition.put([ids[row] for row in rows], vectors[rows], [payloads[row] for row in rows])
+                    self.partition_of.update((ids[row], key) for row in rows)
+        elif record["op"] == "delete":
+            groups = {}
+            for vector_id in ids:
+                if vector_id in self.partition_of:
+                    key = self.partition_of.pop(vector_id)
+                    self.partitions[key].remove(vector_id)
+                    groups[key] = []
+        else:
+            logger.warning(f"Skipping unknown journal record {record['op']}")
+            groups = {}
+
+        for key in groups:
+            self._dirty.add(key)
+            if self.partitions[key].size == 0:
+                del self.partitions[key]
+        self._seq = record["seq"]
+
+    def _snapshot_bytes(self) -> int:
+        """Approximate size of the snapshot, to which the size of the journal is compared."""
+        return 4 * self.embedding_model_dims * len(self.partition_of)
+
+    def compact(self):
+        """
+        Write the partitions changed since the last snapshot and cut the journal.
+
+        New files are written under new names and only then published by replacing the manifest,
+        so a crash at any point leaves a consistent snapshot and journal behind.
+        """
+        if not self._dir:
+            return
+        with self._write():
+            manifest = self._read_manifest()
+            files = dict(manifest["partitions"])
+            for key in self._dirty:
+                name = self._partition_file(key)
+                files.pop(name, None)
+                partition = self.partitions.get(key)
+                if partition is None:
+                    continue
+                base = f"{name}-{self._seq}"
+                buffer = io.BytesIO()
+                np.save(buffer, partition.matrix)
+                write_atomic(f"{self._dir}/{base}.npy", buffer.getbuffer())
+                meta = {"key": partition.key, "ids": partition.ids, "payloads": partition.payloads}
+                write_atomic(f"{self._dir}/{base}.json", json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"))
+                files[name] = base
+            write_atomic(self._manifest_path, json.dumps({"seq": self._seq, "partitions": files}).encode("utf-8"))
+            self._journal.truncate(self._journal.tell())
+            self._dirty = set()
+
+            # Files of earlier snapshots; processes still mapping them keep their pages
+            current = set(files.values())
+            for file_name in os.listdir(self._dir):
+                base, suffix = os.path.splitext(file_name)
+                if suffix in (".npy", ".json") and file_name != "manifest.json" and base not in current:
+                    os.remove(f"{self._dir}/{file_name}")
+        logger.info(f"Compacted the journal of collection {self.collection_name} at write {self._seq}")
+
+    def close(self):
+        """Release the journal and the collection lock file."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._file_lock is not None:
+                self._file_lock.close()
+
+    def _normalize(self, vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape[1] != self.embedding_model_dims:
+            raise ValueError(f"Expected vectors of dimension {self.embedding_model_dims}, got {vectors.shape[1]}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _key(self, payload: Optional[Dict]) -> Optional[str]:
+        value = (payload or {}).get(self.partition_key)
+        return None if value is None else str(value)
+
+    def _partitions_for(self, filters: Optional[Dict]) -> List[_Partition]:
+        """Partitions a query with these filters has to look at."""
+        if filters and self.partition_key in filters and not isinstance(filters[self.partition_key], (list, dict)):
+            partition = self.partitions.get(str(filters[self.partition_key]))
+            return [partition] if partition is not None else []
+        return list(self.partitions.values())
+
+    @staticmethod
+    def _mask(partition: _Partition, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        """Rows of a partition matching the filters, evaluated column by column."""
+        node = compile_filter(filters)
+        if node is None:
+            return None
+
+        def evaluate(node: Node) -> np.ndarray:
+            if isinstance(node, And):
+                return np.logical_and.reduce([evaluate(child) for child in node.nodes])
+            if isinstance(node, Or):
+                return np.logical_or.reduce([evaluate(child) for child in node.nodes])
+            if isinstance(node, Not):
+                return ~evaluate(node.node)
+            column = partition.column(node.field)
+            if isinstance(node, Exists):
+                return np.fromiter((item is not None for item in column), dtype=bool, count=partition.size)
+            if isinstance(node, Eq):
+                return np.asarray(column == node.value, dtype=bool)
+            return np.fromiter(
+                (item is not None and matches(node, {node.field: item}) for item in column),
+                dtype=bool,
+                count=partition.size,
+            )
+
+        return evaluate(node)
+
+    def _top_k(self, partition: _Partition, scores: np.ndarray, mask, limit: int, threshold) -> List[OutputData]:
+        """The ``limit`` best rows of one partition for one query."""
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        if limit < scores.shape[0]:
+            rows = np.argpartition(-scores, limit)[:limit]
+        else:
+            rows = np.arange(scores.shape[0])
+        rows = rows[np.argsort(-scores[rows])]
+        hits = []
+        for row in rows:
+            score = float(scores[row])
+            if score == -np.inf or (threshold is not None and score < threshold):
+                break
+            hits.append(OutputData(id=partition.ids[row], score=score, payload=partition.payloads[row]))
+        return hits
+
+    def create_col(self, name: str, vector_size: int = None, distance: str = None):
+        """
+        Create a new collection, or open it if it exists.
+
+        Args:
+            name (str): Name of the collection.
+            vector_size (int, optional): Dimensions of the vectors. Defaults to embedding_model_dims.
+            distance (str, optional): Ignored, the store always uses cosine similarity.
+
+        Returns:
+            self: The NumpyStore instance.
+        """
+        self.close()
+        with self._lock:
+            self.collection_name = name
+            if vector_size:
+                self.embedding_model_dims = vector_size
+            self._dir = f"{self.path}/{name}" if self.path else None
+            # The lock file lives next to the collection directory, so that it outlives delete_col
+            self._file_lock = FileLock(f"{self.path}/{name}.lock") if self.path else None
+        with self._write():
+            self._load()
+        return self
+
+    def insert(
+        self,
+        vectors: List[list],
+        payloads: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Optional[dict[str, any]]
+    ):
+        """
+        Insert vectors into a collection.
+
+        Args:
+            vectors (List[list]): List of vectors to insert.
+            payloads (Optional[List[Dict]], optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (Optional[List[str]], optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        if payloads is None:
+            payloads = [{} for _ in range(len(vectors))]
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+        if len(vectors) != len(ids) or len(vectors) != len(payloads):
+            raise ValueError("Vectors, payloads, and IDs must have the same length")
+
+        normalized = self._normalize(vectors)
+        with self._write():
+            self._commit({"op": "put", "ids": list(ids), "payloads": list(payloads)}, normalized)
+
+    def search(
+        self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None, threshold: float = None
+    ) -> List[OutputData]:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[float]): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            threshold (float, optional): Minimum cosine similarity of the results. Defaults to None.
+
+        Returns:
+            List[OutputData]: Search results.
+        """
+        return self.search_batch([query], [vectors], limits=limit, filters=filters, threshold=threshold)[0]
+
+    def search_batch(
+        self, queries: List[str], vectors: List[list], limits=None, filters=None, threshold: float = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for several query vectors, with one matrix product per partition involved.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[list]): One query vector per query.
+            limits (int | List[int], optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (Dict | List[Dict], optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold (float, optional): Minimum cosine similarity of the results. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results, one list per query.
+        """
+        if not vectors:
+            return []
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        query_vectors = self._normalize(vectors)
+
+        results = [[] for _ in vectors]
+        with self._read():
+            per_partition = {}
+            for row, query_filters in enumerate(filters):
+                for partition in self._partitions_for(query_filters):
+                    per_partition.setdefault(partition.key, []).append(row)
+
+            for key, rows in per_partition.items():
+                partition = self.partitions[key]
+                if partition.size == 0:
+                    continue
+                scores = query_vectors[rows] @ partition.matrix.T
+                # Queries usually share their filters, so each distinct filter is evaluated once
+                masks = {}
+                for row, row_scores in zip(rows, scores):
+                    filter_key = json.dumps(filters[row], sort_keys=True, default=str)
+                    if filter_key not in masks:
+                        masks[filter_key] = self._mask(partition, filters[row])
+                    mask = masks[filter_key]
+                    results[row].extend(self._top_k(partition, row_scores, mask, limits[row], threshold))
+
+        for row, hits in enumerate(results):
+            hits.sort(key=lambda hit: hit.score, reverse=True)
+            del hits[limits[row] :]
+        return results
+
+    def delete(self, vector_id: str):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+        """
+        self.delete_many([vector_id])
+
+    def delete_many(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID, as one journaled write.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        with self._write():
+            found = [vector_id for vector_id in dict.fromkeys(vector_ids) if vector_id in self.partition_of]
+            for vector_id in vector_ids:
+                if vector_id not in self.partition_of:
+                    logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
+            if found:
+                self._commit({"op": "delete", "ids": found})
+
+    def update(self, vector_id: str, vector: Optional[List[float]] = None, payload: Optional[Dict] = None):
+        """
+        Update a vector and its payload.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (Optional[List[float]], optional): Updated vector. Defaults to None.
+            payload (Optional[Dict], optional): Updated payload. Defaults to None.
+        """
+        with self._write():
+            if vector_id not in self.partition_of:
+                raise ValueError(f"Vector {vector_id} not found")
+            partition = self.partitions[self.partition_of[vector_id]]
+            row = partition.row_of[vector_id]
+            vector = partition.matrix[row : row + 1].copy() if vector is None else self._normalize([vector])
+            if payload is None:
+                payload = partition.payloads[row]
+            self._commit({"op": "put", "ids": [vector_id], "payloads": [payload]}, vector)
+
+    def get(self, vector_id: str) -> Optional[OutputData]:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            OutputData: Retrieved vector, or None if it is not stored.
+        """
+        with self._read():
+            if vector_id not in self.partition_of:
+                return None
+            partition = self.partitions[self.partition_of[vector_id]]
+            return OutputData(id=vector_id, score=None, payload=partition.payloads[partition.row_of[vector_id]])
+
+    def get_vectors(self, vector_ids: List[str]) -> List[Optional[List[float]]]:
+        """
+        Read the stored, normalized, vectors of several ids back.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to read.
+
+        Returns:
+            List[Optional[List[float]]]: One vector per id, None where the id is not stored.
+        """
+        vectors = []
+        with self._read():
+            for vector_id in vector_ids:
+                if vector_id not in self.partition_of:
+                    vectors.append(None)
+                    continue
+                partition = self.partitions[self.partition_of[vector_id]]
+                vectors.append(partition.matrix[partition.row_of[vector_id]].tolist())
+        return vectors
+
+    def list_cols(self) -> List[str]:
+        """
+        List all collections.
+
+        Returns:
+            List[str]: List of collection names.
+        """
+        if not self.path or not os.path.isdir(self.path):
+            return [self.collection_name]
+        return sorted(name for name in os.listdir(self.path) if os.path.isdir(f"{self.path}/{name}"))
+
+    def delete_col(self):
+        """Delete a collection."""
+        with self._write():
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._dir and os.path.isdir(self._dir):
+                shutil.rmtree(self._dir)
+            self.partitions = {}
+            self.partition_of = {}
+            self._dirty = set()
+
+    def col_info(self) -> Dict:
+        """
+        Get information about a collection.
+
+        Returns:
+            Dict: Collection information.
+        """
+        with self._read():
+            return {
+                "name": self.collection_name,
+                "count": len(self.partition_of),
+                "partitions": len(self.partitions),
+                "dimension": self.embedding_model_dims,
+                "distance": "cosine",
+            }
+
+    def list(self, filters: Optional[Dict] = None, limit: int = 100) -> List[OutputData]:
+        """
+        List all vectors in a collection.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            List[OutputData]: List of vectors.
+        """
+        results = []
+        with self._read():
+            for partition in self._partitions_for(filters):
+                mask = self._mask(partition, filters)
+                rows = range(partition.size) if mask is None else np.flatnonzero(mask)
+                for row in rows:
+                    if len(results) >= limit:
+                        return results
+                    results.append(OutputData(id=partition.ids[row], score=None, payload=partition.payloads[row]))
+        return results
+
+    def list_page(
+        self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[Tuple[Optional[str], str]] = None
+    ) -> Tuple[List[OutputData], Optional[Tuple[Optional[str], str]]]:
+        """
+        List one page of vectors, partition by partition and in id order within a partition.
+
+        Rows move within their partition when others are deleted, so the cursor holds the
+        partition key and the last id listed rather than a row number.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple: The page, and the next cursor or None after the last page.
+        """
+        def order(key: Optional[str]) -> tuple:
+            return key is not None, key or ""
+
+        results = []
+        with self._read():
+            partitions = sorted(self._partitions_for(filters), key=lambda partition: order(partition.key))
+            if cursor is not None:
+                partitions = [partition for partition in partitions if order(partition.key) >= order(cursor[0])]
+            for partition in partitions:
+                mask = self._mask(partition, filters)
+                rows = range(partition.size) if mask is None else np.flatnonzero(mask)
+                ids = (partition.ids[row] for row in rows)
+                if cursor is not None and partition.key == cursor[0]:
+                    ids = (vector_id for vector_id in ids if vector_id > cursor[1])
+                for vector_id in heapq.nsmallest(limit - len(results), ids):
+                    payload = partition.payloads[partition.row_of[vector_id]]
+                    results.append(OutputData(id=vector_id, score=None, payload=payload))
+                if len(results) >= limit:
+                    return results, (partition.key, results[-1].id)
+        return results, None
+
+    def reset(self):
+        """Reset the index by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        self.delete_col()
+        self.create_col(self.collection_name)
@@ -1,23 +1,106 @@
 from loguru import logger
 import os
 import shutil
-from typing import Any, ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
     Distance,
-    FieldCondition,
     Filter,
-    MatchValue,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    OverwritePayloadOperation,
     PointIdsList,
     PointStruct,
-    Range,
+    PointsList,
+    PointVectors,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SetPayload,
+    UpdateVectors,
+    UpdateVectorsOperation,
+    UpsertOperation,
     VectorParams,
 )
 
 from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.filters import compile_filter
+
+
+def _quantization_config(quantization: Optional[str], always_ram: bool = True):
+    """
+    Build the collection quantization config.
+
+    Args:
+        quantization (str, optional): "scalar" (int8, ~4x smaller), "binary" (1 bit, ~32x smaller) or None.
+        always_ram (bool, optional): Keep the quantized vectors in RAM. Defaults to True.
+
+    Returns:
+        The quantization config, or None when quantization is disabled.
+    """
+    if quantization is None:
+        return None
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+        )
+    if quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+    raise ValueError(f"Unsupported quantization: {quantization}. Use 'scalar', 'binary' or None.")
+
+
+def _search_params(quantized: bool, oversampling: Optional[float], rescore: Optional[bool], hnsw_ef: Optional[int]):
+    """
+    Build per-query search params.
+
+    Args:
+        quantized (bool): Whether the collection stores quantized vectors.
+        oversampling (float, optional): Candidate oversampling for quantized searches.
+        rescore (bool, optional): Rescore quantized candidates with the original vectors.
+        hnsw_ef (int, optional): HNSW search beam width.
+
+    Returns:
+        SearchParams: The params, or None when every setting is left to the server.
+    """
+    quantization = None
+    if quantized:
+        quantization = QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+    if quantization is None and hnsw_ef is None:
+        return None
+    return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+
+def _indexes_to_create(existing: Dict, indexed_fields: List[str], tenant_key: Optional[str], collection_name: str) -> List[str]:
+    """
+    Pick the payload keys that still need an index.
+
+    An existing collection whose tenant key was indexed without `is_tenant` keeps that index,
+    with a warning, as Qdrant cannot change the kind of an index in place.
+
+    Args:
+        existing (dict): Payload schema of the collection, by key.
+        indexed_fields (List[str]): Keys that should be indexed.
+        tenant_key (str, optional): Key that should have a tenant index.
+        collection_name (str): Name of the collection, for the log.
+
+    Returns:
+        List[str]: The keys without an index.
+    """
+    info = existing.get(tenant_key) if tenant_key else None
+    if info is not None and not getattr(info.params, "is_tenant", False):
+        logger.warning(
+            f"Collection {collection_name} has a plain index on {tenant_key}; tenant grouping is off "
+            f"until the index is dropped and recreated"
+        )
+    return [field for field in indexed_fields if field not in existing]
 
 
 class QdrantConfig(BaseModel):
@@ -34,6 +117,22 @@ class QdrantConfig(BaseModel):
     url: Optional[str] = Field(None, description="Full URL for Qdrant server")
     api_key: Optional[str] = Field(None, description="API key for Qdrant server")
     on_disk: Optional[bool] = Field(False, description="Enables persistent storage")
+    indexed_fields: Optional[List[str]] = Field(
+        ["user_id", "agent_id", "run_id", "actor_id", "role", "type"],
+        description="Payload keys that get a keyword index",
+    )
+    tenant_key: Optional[str] = Field("user_id", description="Indexed payload key that identifies the tenant")
+    prefer_grpc: Optional[bool] = Field(False, description="Use gRPC instead of REST for server connections")
+    grpc_port: Optional[int] = Field(6334, description="gRPC port for Qdrant server")
+    timeout: Optional[int] = Field(None, description="Request timeout in seconds")
+    pool_size: Optional[int] = Field(100, description="Maximum pooled REST connections for the async client")
+    max_retries: Optional[int] = Field(3, description="Retries for transient errors in the async client")
+    retry_backoff: Optional[float] = Field(0.2, description="Initial delay in seconds between async retries")
+    quantization: Optional[Literal["scalar", "binary"]] = Field(None, description="Vector quantization: 'scalar', 'binary' or None")
+    quantization_always_ram: bool = Field(True, description="Keep quantized vectors in RAM")
+    oversampling: float = Field(2.0, description="Candidate oversampling for quantized searches, at least 1")
+    rescore: bool = Field(True, description="Rescore quantized candidates with the original vectors")
+    hnsw_config: Optional[Dict[str, int]] = Field(None, description="HNSW overrides, e.g. {'m': 16, 'ef_construct': 100}")
 
 
     @model_validator(mode="before")
@@ -63,6 +162,21 @@ class QdrantConfig(BaseModel):
             )
         return values
 
+    @model_validator(mode="after")
+    def validate_search_settings(self) -> "QdrantConfig":
+        if self.oversampling < 1:
+            raise ValueError(f"oversampling must be at least 1, got {self.oversampling}")
+        if self.hnsw_config:
+            unknown = set(self.hnsw_config) - set(HnswConfigDiff.model_fields)
+            if unknown:
+                raise ValueError(
+                    f"Unsupported hnsw_config keys: {', '.join(sorted(unknown))}. Use: {', '.join(HnswConfigDiff.model_fields)}"
+                )
+            for key, value in self.hnsw_config.items():
+                if value < 0:
+                    raise ValueError(f"hnsw_config {key} must not be negative, got {value}")
+        return self
+
     model_config = {
         "arbitrary_types_allowed": True,
     }
@@ -80,6 +194,19 @@ class Qdrant(VectorStoreBase):
         url: str = None,
         api_key: str = None,
         on_disk: bool = False,
+        indexed_fields: Optional[List[str]] = None,
+        tenant_key: Optional[str] = "user_id",
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: Optional[int] = None,
+        quantization: Optional[str] = None,
+        quantization_always_ram: bool = True,
+        oversampling: float = 2.0,
+        rescore: bool = True,
+        hnsw_config: Optional[Dict[str, int]] = None,
+        pool_size: int = 100,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
     ):
         """
         Initialize the Qdrant vector store.
@@ -94,7 +221,25 @@ class Qdrant(VectorStoreBase):
             url (str, optional): Full URL for Qdrant server. Defaults to None.
             api_key (str, optional): API key for Qdrant server. Defaults to None.
             on_disk (bool, optional): Enables persistent storage. Defaults to False.
+            indexed_fields (List[str], optional): Payload keys that get a keyword index.
+                Defaults to the ids and the memory type used by `Memory` filters.
+            tenant_key (str, optional): Indexed key marked as the tenant so Qdrant groups
+                each tenant's points together. Defaults to "user_id".
+            prefer_grpc (bool, optional): Use gRPC instead of REST for server connections. Defaults to False.
+            grpc_port (int, optional): gRPC port for Qdrant server. Defaults to 6334.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            quantization (str, optional): "scalar" or "binary" to keep quantized vectors in RAM and
+                the originals on disk. Defaults to None.
+            quantization_always_ram (bool, optional): Keep quantized vectors in RAM. Defaults to True.
+            oversampling (float, optional): Default candidate oversampling for quantized searches. Defaults to 2.0.
+            rescore (bool, optional): Default rescoring of quantized candidates. Defaults to True.
+            hnsw_config (dict, optional): HNSW overrides such as `m` and `ef_construct`. Defaults to None.
+            pool_size (int, optional): Maximum pooled REST connections, used only by `AsyncQdrant`. Defaults to 100.
+            max_retries (int, optional): Retries for transient errors, used only by `AsyncQdrant`. Defaults to 3.
+            retry_backoff (float, optional): Initial delay between retries, used only by `AsyncQdrant`. Defaults to 0.2.
         """
+        # Local mode is known from the parameters only; a client passed in is taken as a server
+        self._local = False
         if client:
             self.client = client
         else:
@@ -106,8 +251,14 @@ class Qdrant(VectorStoreBase):
             if host and port:
                 params["host"] = host
                 params["port"] = port
-            if not params:
+            if params:
+                params["prefer_grpc"] = prefer_grpc
+                params["grpc_port"] = grpc_port
+                if timeout is not None:
+                    params["timeout"] = timeout
+            else:
                 params["path"] = path
+                self._local = True
                 if not on_disk:
                     if os.path.exists(path) and os.path.isdir(path):
                         shutil.rmtree(path)
@@ -117,6 +268,17 @@ class Qdrant(VectorStoreBase):
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
         self.on_disk = on_disk
+        if indexed_fields is None:
+            indexed_fields = ["user_id", "agent_id", "run_id", "actor_id", "role", "type"]
+        self.indexed_fields = list(indexed_fields)
+        self.tenant_key = tenant_key
+        if tenant_key and tenant_key not in self.indexed_fields:
+            self.indexed_fields.insert(0, tenant_key)
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.oversampling = oversampling
+        self.rescore = rescore
+        self.hnsw_config = hnsw_config
         self.create_col(self.embedding_model_dims, self.on_disk)
 
     def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
@@ -133,12 +295,39 @@ class Qdrant(VectorStoreBase):
         for collection in response.collections:
             if collection.name == self.collection_name:
                 logger.debug(f"Collection {self.collection_name} already exists. Skipping creation.")
+                self._create_payload_indexes()
                 return
 
+        quantization_config = _quantization_config(self.quantization, self.quantization_always_ram)
         self.client.create_collection(
             collection_name=self.collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=distance, on_disk=on_disk),
+            # With quantization the originals are only read for rescoring, so they live on disk.
+            vectors_config=VectorParams(
+                size=vector_size, distance=distance, on_disk=on_disk or quantization_config is not None
+            ),
+            quantization_config=quantization_config,
+            hnsw_config=HnswConfigDiff(**self.hnsw_config) if self.hnsw_config else None,
         )
+        self._create_payload_indexes()
+
+    def _create_payload_indexes(self):
+        """
+        Create keyword payload indexes for the filterable keys that are not indexed yet.
+
+        Qdrant builds extra HNSW links per value of an indexed keyword field, so filtered
+        searches on these keys stay on the graph instead of falling back to a full scan.
+        """
+        if self._local:
+            # Local mode scans payloads directly and ignores payload indexes.
+            return
+        existing = self.client.get_collection(self.collection_name).payload_schema or {}
+        for field in _indexes_to_create(existing, self.indexed_fields, self.tenant_key, self.collection_name):
+            logger.debug(f"Creating payload index on {field} in collection {self.collection_name}")
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field,
+                field_schema=KeywordIndexParams(type="keyword", is_tenant=field == self.tenant_key),
+            )
 
     def insert(self, vectors: list, payloads: list = None, ids: list = None, **kwargs: Optional[dict[str, any]]):
         """
@@ -165,20 +354,35 @@ class Qdrant(VectorStoreBase):
         Create a Filter object from the provided filters.
 
         Args:
-            filters (dict): Filters to apply.
+            filters (dict): Filters to apply, in the form compiled by `mem.vector_stores.filters`.
 
         Returns:
             Filter: The created Filter object.
         """
-        conditions = []
-        for key, value in filters.items():
-            if isinstance(value, dict) and "gte" in value and "lte" in value:
-                conditions.append(FieldCondition(key=key, range=Range(gte=value["gte"], lte=value["lte"])))
-            else:
-                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
-        return Filter(must=conditions) if conditions else None
+        return compile_filter(filters, "qdrant")
+
+    def _search_params(
+        self, oversampling: Optional[float] = None, rescore: Optional[bool] = None, hnsw_ef: Optional[int] = None
+    ) -> Optional[SearchParams]:
+        """Build search params, falling back to the store's quantization defaults."""
+        return _search_params(
+            self.quantization is not None,
+            self.oversampling if oversampling is None else oversampling,
+            self.rescore if rescore is None else rescore,
+            hnsw_ef,
+        )
 
-    def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None, threshold: float = 0.4) -> list:
+    def search(
+        self,
+        query: str,
+        vectors: list,
+        limit: int = 5,
+        filters: dict = None,
+        threshold: float = 0.4,
+        oversampling: float = None,
+        rescore: bool = None,
+        hnsw_ef: int = None,
+    ) -> list:
         """
         Search for similar vectors.
 
@@ -189,6 +393,9 @@ class Qdrant(VectorStoreBase):
             limit (int, optional): Number of results to return. Defaults to 5.
             filters (dict, optional): Filters to apply to the search. Defaults to None.
             threshold: score_threshold
+            oversampling (float, optional): Candidate oversampling for quantized collections. Defaults to the store's.
+            rescore (bool, optional): Rescore quantized candidates with the original vectors. Defaults to the store's.
+            hnsw_ef (int, optional): HNSW search beam width. Defaults to the server's.
 
         Returns:
             list: Search results.
@@ -198,11 +405,58 @@ class Qdrant(VectorStoreBase):
             collection_name=self.collection_name,
             query=vectors,
             query_filter=query_filter,
+            search_params=self._search_params(oversampling, rescore, hnsw_ef),
             score_threshold=threshold,
             limit=limit,
         )
         return hits.points
 
+    def search_batch(
+        self,
+        queries: list,
+        vectors: list,
+        limits=None,
+        filters=None,
+        threshold: float = 0.4,
+        oversampling: float = None,
+        rescore: bool = None,
+        hnsw_ef: int = None,
+    ) -> list:
+        """
+        Search for several query vectors in one request.
+
+        Args:
+            queries (list): Queries.
+            vectors (list): One query vector per query.
+            limits (int | list, optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (dict | list, optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold: score_threshold
+            oversampling (float, optional): Candidate oversampling for quantized collections. Defaults to the store's.
+            rescore (bool, optional): Rescore quantized candidates with the original vectors. Defaults to the store's.
+            hnsw_ef (int, optional): HNSW search beam width. Defaults to the server's.
+
+        Returns:
+            list: Search results, one list per query.
+        """
+        if not vectors:
+            return []
+
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        params = self._search_params(oversampling, rescore, hnsw_ef)
+        requests = [
+            QueryRequest(
+                query=vector,
+                filter=self._create_filter(query_filters) if query_filters else None,
+                params=params,
+                score_threshold=threshold,
+                limit=limit,
+                with_payload=True,
+            )
+            for vector, limit, query_filters in zip(vectors, limits, filters)
+        ]
+        responses = self.client.query_batch_points(collection_name=self.collection_name, requests=requests)
+        return [response.points for response in responses]
+
     def delete(self, vector_id: int):
         """
         Delete a vector by ID.
@@ -229,6 +483,76 @@ class Qdrant(VectorStoreBase):
         point = PointStruct(id=vector_id, vector=vector, payload=payload)
         self.client.upsert(collection_name=self.collection_name, points=[point])
 
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors by ID in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=list(vector_ids)),
+        )
+
+    def update_many(self, vector_ids: list, vectors: list = None, payloads: list = None):
+        """
+        Update several vectors and their payloads in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): Updated vectors, None to keep a vector. Defaults to None.
+            payloads (list, optional): Updated payloads, None to keep a payload. Defaults to None.
+        """
+        vectors = vectors if vectors is not None else [None] * len(vector_ids)
+        payloads = payloads if payloads is not None else [None] * len(vector_ids)
+        points, moved, operations = [], [], []
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            if vector is not None and payload is not None:
+                points.append(PointStruct(id=vector_id, vector=vector, payload=payload))
+            elif vector is not None:
+                moved.append(PointVectors(id=vector_id, vector=vector))
+            elif payload is not None:
+                operations.append(
+                    OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[vector_id]))
+                )
+        if points:
+            operations.append(UpsertOperation(upsert=PointsList(points=points)))
+        if moved:
+            operations.append(UpdateVectorsOperation(update_vectors=UpdateVectors(points=moved)))
+        if operations:
+            self.client.batch_update_points(collection_name=self.collection_name, update_operations=operations)
+
+    def get_many(self, vector_ids: list) -> list:
+        """
+        Retrieve several vectors by ID in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+
+        Returns:
+            list: One record per id, None where the id does not exist.
+        """
+        records = self.client.retrieve(collection_name=self.collection_name, ids=list(vector_ids), with_payload=True)
+        by_id = {str(record.id): record for record in records}
+        return [by_id.get(str(vector_id)) for vector_id in vector_ids]
+
+    def get_vectors(self, vector_ids: list) -> list:
+        """
+        Read the stored vectors of several ids back in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to read.
+
+        Returns:
+            list: One vector per id, None where the id does not exist.
+        """
+        records = self.client.retrieve(
+            collection_name=self.collection_name, ids=list(vector_ids), with_payload=False, with_vectors=True
+        )
+        by_id = {str(record.id): record.vector for record in records}
+        return [by_id.get(str(vector_id)) for vector_id in vector_ids]
+
     def get(self, vector_id: int) -> dict:
         """
         Retrieve a vector by ID.
@@ -285,6 +609,29 @@ class Qdrant(VectorStoreBase):
         )
         return result[0]
 
+    def list_page(self, filters: dict = None, limit: int = 100, cursor=None) -> tuple:
+        """
+        List one page of vectors.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page (Qdrant's next page offset). Defaults to None.
+
+        Returns:
+            tuple: The page, and the next cursor or None after the last page.
+        """
+        query_filter = self._create_filter(filters) if filters else None
+        points, next_offset = self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=query_filter,
+            limit=limit,
+            offset=cursor,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return points, next_offset
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
@@ -0,0 +1,530 @@
+from loguru import logger
+import asyncio
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+from qdrant_client.models import (
+    Distance,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    PointIdsList,
+    PointStruct,
+    QueryRequest,
+    VectorParams,
+)
+
+try:
+    import grpc
+except ImportError:  # gRPC transport is optional
+    grpc = None
+
+from mem.vector_stores.base import VectorStoreBase
+from mem.vector_stores.qdrant import Qdrant, _indexes_to_create, _quantization_config
+
+_RETRY_STATUS = {429, 502, 503, 504}
+# Pooled clients by event loop, as httpx and grpc.aio transports only work on the loop that
+# created them; local path mode has no transport and is shared by all loops under the None key
+_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_LOCAL_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Tell whether a failed request is worth retrying.
+
+    Args:
+        error (Exception): Error raised by the client.
+
+    Returns:
+        bool: True for connection errors, timeouts and overloaded-server responses.
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in _RETRY_STATUS
+    if isinstance(error, (ResponseHandlingException, httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    if grpc is not None and isinstance(error, grpc.aio.AioRpcError):
+        return error.code() in (
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.StatusCode.DEADLINE_EXCEEDED,
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+        )
+    return False
+
+
+def _shared_client(**params) -> AsyncQdrantClient:
+    """
+    Return the pooled client for a set of connection parameters, creating it on first use.
+
+    Every `AsyncQdrant` pointing at the same server shares one client per event loop, so
+    collections reuse the same gRPC channel or HTTP connection pool instead of opening their
+    own, and a new loop, e.g. one `asyncio.run` per call or a reloaded worker, gets a fresh one.
+    Must be called from a coroutine.
+
+    Returns:
+        AsyncQdrantClient: Shared client.
+    """
+    key = tuple(sorted((k, repr(v)) for k, v in params.items()))
+    with _CLIENTS_LOCK:
+        if "path" in params:
+            clients = _LOCAL_CLIENTS
+        else:
+            clients = _CLIENTS.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(key)
+        if client is None:
+            client = AsyncQdrantClient(**params)
+            clients[key] = client
+        return client
+
+
+async def close_clients():
+    """Close the pooled clients of the running event loop, e.g. from an application's shutdown hook."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.pop(asyncio.get_running_loop(), {}).values()) + list(_LOCAL_CLIENTS.values())
+        _LOCAL_CLIENTS.clear()
+    for client in clients:
+        await client.close()
+
+
+class AsyncQdrant:
+    """
+    Asyncio counterpart of `Qdrant` for use from async request handlers.
+
+    Takes the same settings as `QdrantConfig`, so `AsyncQdrant(**config.model_dump())` talks to
+    the same collection as the synchronous store. The collection and its payload indexes are
+    created on the first awaited call.
+
+    `Memory` and the server handlers are synchronous and go through `Qdrant`; this store is not
+    a `VectorStoreBase` nor registered in `VectorStoreFactory`, and is meant for async code
+    built directly on top of it.
+    """
+
+    _create_filter = Qdrant._create_filter
+    _search_params = Qdrant._search_params
+    _expand_batch_args = staticmethod(VectorStoreBase._expand_batch_args)
+
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model_dims: int,
+        client: AsyncQdrantClient = None,
+        host: str = None,
+        port: int = None,
+        path: str = None,
+        url: str = None,
+        api_key: str = None,
+        on_disk: bool = False,
+        indexed_fields: Optional[List[str]] = None,
+        tenant_key: Optional[str] = "user_id",
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: Optional[int] = None,
+        pool_size: int = 100,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
+        quantization: Optional[str] = None,
+        quantization_always_ram: bool = True,
+        oversampling: float = 2.0,
+        rescore: bool = True,
+        hnsw_config: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the async Qdrant vector store.
+
+        Args:
+            collection_name (str): Name of the collection.
+            embedding_model_dims (int): Dimensions of the embedding model.
+            client (AsyncQdrantClient, optional): Existing async client instance. Defaults to None.
+            host (str, optional): Host address for Qdrant server. Defaults to None.
+            port (int, optional): Port for Qdrant server. Defaults to None.
+            path (str, optional): Path for local Qdrant database. Defaults to None.
+            url (str, optional): Full URL for Qdrant server. Defaults to None.
+            api_key (str, optional): API key for Qdrant server. Defaults to None.
+            on_disk (bool, optional): Enables persistent storage. Defaults to False.
+            indexed_fields (List[str], optional): Payload keys that get a keyword index.
+            tenant_key (str, optional): Indexed key marked as the tenant. Defaults to "user_id".
+            prefer_grpc (bool, optional): Use gRPC instead of REST for server connections. Defaults to False.
+            grpc_port (int, optional): gRPC port for Qdrant server. Defaults to 6334.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            pool_size (int, optional): Maximum pooled REST connections. Defaults to 100.
+            max_retries (int, optional): Retries for transient errors. Defaults to 3.
+            retry_backoff (float, optional): Initial delay in seconds between retries, doubled
+                on each attempt. Defaults to 0.2.
+            quantization (str, optional): "scalar" or "binary" quantization. Defaults to None.
+            quantization_always_ram (bool, optional): Keep quantized vectors in RAM. Defaults to True.
+            oversampling (float, optional): Default candidate oversampling for quantized searches. Defaults to 2.0.
+            rescore (bool, optional): Default rescoring of quantized candidates. Defaults to True.
+            hnsw_config (dict, optional): HNSW overrides such as `m` and `ef_construct`. Defaults to None.
+        """
+        self._client = client
+        self._client_params = None
+        # Local mode is known from the parameters only; a client passed in is taken as a server
+        self._local = False
+        if not client:
+            params = {}
+            if api_key:
+                params["api_key"] = api_key
+            if url:
+                params["url"] = url
+            if host and port:
+                params["host"] = host
+                params["port"] = port
+            if params:
+                params["prefer_grpc"] = prefer_grpc
+                params["grpc_port"] = grpc_port
+                if timeout is not None:
+                    params["timeout"] = timeout
+                if not prefer_grpc:
+                    params["limits"] = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            else:
+                params["path"] = path
+                self._local = True
+            # The pooled client depends on the running loop, so it is looked up on every call
+            self._client_params = params
+
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.on_disk = on_disk
+        if indexed_fields is None:
+            indexed_fields = ["user_id", "agent_id", "run_id", "actor_id", "role", "type"]
+        self.indexed_fields = list(indexed_fields)
+        self.tenant_key = tenant_key
+        if tenant_key and tenant_key not in self.indexed_fields:
+            self.indexed_fields.insert(0, tenant_key)
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.oversampling = oversampling
+        self.rescore = rescore
+        self.hnsw_config = hnsw_config
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._ready = False
+        self._ready_lock = None
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        """The client given at construction, or the pooled client of the running event loop."""
+        if self._client is not None:
+            return self._client
+        return _shared_client(**self._client_params)
+
+    async def _call(self, method: str, **kwargs):
+        """
+        Call a client method, retrying transient failures with exponential backoff.
+
+        Args:
+            method (str): Name of the `AsyncQdrantClient` method.
+            **kwargs: Arguments for the method.
+
+        Returns:
+            The method's result.
+        """
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await getattr(self.client, method)(**kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    raise
+                logger.warning(f"Qdrant {method} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _ensure_col(self):
+        """Create the collection and its payload indexes once, on first use."""
+        if self._ready:
+            return
+        loop = asyncio.get_running_loop()
+        if self._ready_lock is None or self._ready_lock[0] is not loop:
+            # asyncio locks belong to one loop as well
+            self._ready_lock = (loop, asyncio.Lock())
+        async with self._ready_lock[1]:
+            if not self._ready:
+                await self.create_col(self.embedding_model_dims, self.on_disk)
+                self._ready = True
+
+    async def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
+        """
+        Create a new collection.
+
+        Args:
+            vector_size (int): Size of the vectors to be stored.
+            on_disk (bool): Enables persistent storage.
+            distance (Distance, optional): Distance metric for vector similarity. Defaults to Distance.COSINE.
+        """
+        if await self._call("collection_exists", collection_name=self.collection_name):
+            logger.debug(f"Collection {self.collection_name} already exists. Skipping creation.")
+        else:
+            quantization_config = _quantization_config(self.quantization, self.quantization_always_ram)
+            await self._call(
+                "create_collection",
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(
+                    size=vector_size, distance=distance, on_disk=on_disk or quantization_config is not None
+                ),
+                quantization_config=quantization_config,
+                hnsw_config=HnswConfigDiff(**self.hnsw_config) if self.hnsw_config else None,
+            )
+        await self._create_payload_indexes()
+
+    async def _create_payload_indexes(self):
+        """Create keyword payload indexes for the filterable keys that are not indexed yet."""
+        if self._local:
+            # Local mode scans payloads directly and ignores payload indexes.
+            return
+        info = await self._call("get_collection", collection_name=self.collection_name)
+        existing = info.payload_schema or {}
+        for field in _indexes_to_create(existing, self.indexed_fields, self.tenant_key, self.collection_name):
+            await self._call(
+                "create_payload_index",
+                collection_name=self.collection_name,
+                field_name=field,
+                field_schema=KeywordIndexParams(type="keyword", is_tenant=field == self.tenant_key),
+            )
+
+    async def insert(self, vectors: list, payloads: list = None, ids: list = None, **kwargs):
+        """
+        Insert vectors into a collection.
+
+        Args:
+            vectors (list): List of vectors to insert.
+            payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        await self._ensure_col()
+        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        points = [
+            PointStruct(
+                id=idx if ids is None else ids[idx],
+                vector=vector,
+                payload=payloads[idx] if payloads else {},
+            )
+            for idx, vector in enumerate(vectors)
+        ]
+        await self._call("upsert", collection_name=self.collection_name, points=points)
+
+    async def search(
+        self,
+        query: str,
+        vectors: list,
+        limit: int = 5,
+        filters: dict = None,
+        threshold: float = 0.4,
+        oversampling: float = None,
+        rescore: bool = None,
+        hnsw_ef: int = None,
+    ) -> list:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query.
+            vectors (list): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (dict, optional): Filters to apply to the search. Defaults to None.
+            threshold: score_threshold
+            oversampling (float, optional): Candidate oversampling for quantized collections. Defaults to the store's.
+            rescore (bool, optional): Rescore quantized candidates with the original vectors. Defaults to the store's.
+            hnsw_ef (int, optional): HNSW search beam width. Defaults to the server's.
+
+        Returns:
+            list: Search results.
+        """
+        await self._ensure_col()
+        hits = await self._call(
+            "query_points",
+            collection_name=self.collection_name,
+            query=vectors,
+            query_filter=self._create_filter(filters) if filters else None,
+            search_params=self._search_params(oversampling, rescore, hnsw_ef),
+            score_threshold=threshold,
+            limit=limit,
+        )
+        return hits.points
+
+    async def search_batch(
+        self,
+        queries: list,
+        vectors: list,
+        limits=None,
+        filters=None,
+        threshold: float = 0.4,
+        oversampling: float = None,
+        rescore: bool = None,
+        hnsw_ef: int = None,
+    ) -> list:
+        """
+        Search for several query vectors in one request.
+
+        Args:
+            queries (list): Queries.
+            vectors (list): One query vector per query.
+            limits (int | list, optional): Number of results, for all queries or per query. Defaults to 5.
+            filters (dict | list, optional): Filters, shared by all queries or per query. Defaults to None.
+            threshold: score_threshold
+            oversampling (float, optional): Candidate oversampling for quantized collections. Defaults to the store's.
+            rescore (bool, optional): Rescore quantized candidates with the original vectors. Defaults to the store's.
+            hnsw_ef (int, optional): HNSW search beam width. Defaults to the server's.
+
+        Returns:
+            list: Search results, one list per query.
+        """
+        if not vectors:
+            return []
+
+        await self._ensure_col()
+        limits, filters = self._expand_batch_args(len(vectors), limits, filters)
+        params = self._search_params(oversampling, rescore, hnsw_ef)
+        requests = [
+            QueryRequest(
+                query=vector,
+                filter=self._create_filter(query_filters) if query_filters else None,
+                params=params,
+                score_threshold=threshold,
+                limit=limit,
+                with_payload=True,
+            )
+            for vector, limit, query_filters in zip(vectors, limits, filters)
+        ]
+        responses = await self._call("query_batch_points", collection_name=self.collection_name, requests=requests)
+        return [response.points for response in responses]
+
+    async def delete(self, vector_id: int):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (int): ID of the vector to delete.
+        """
+        await self._ensure_col()
+        await self._call(
+            "delete",
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=[vector_id]),
+        )
+
+    async def update(self, vector_id: int, vector: list = None, payload: dict = None):
+        """
+        Update a vector and its payload.
+
+        Args:
+            vector_id (int): ID of the vector to update.
+            vector (list, optional): Updated vector. Defaults to None.
+            payload (dict, optional): Updated payload. Defaults to None.
+        """
+        await self._ensure_col()
+        point = PointStruct(id=vector_id, vector=vector, payload=payload)
+        await self._call("upsert", collection_name=self.collection_name, points=[point])
+
+    async def get(self, vector_id: int) -> dict:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (int): ID of the vector to retrieve.
+
+        Returns:
+            dict: Retrieved vector.
+        """
+        await self._ensure_col()
+        result = await self._call("retrieve", collection_name=self.collection_name, ids=[vector_id], with_payload=True)
+        return result[0] if result else None
+
+    async def list_cols(self) -> list:
+        """
+        List all collections.
+
+        Returns:
+            list: List of collection names.
+        """
+        return await self._call("get_collections")
+
+    async def delete_col(self):
+        """Delete a collection."""
+        await self._call("delete_collection", collection_name=self.collection_name)
+        self._ready = False
+
+    async def col_info(self) -> dict:
+        """
+        Get information about a collection.
+
+        Returns:
+            dict: Collection information.
+        """
+        await self._ensure_col()
+        return await self._call("get_collection", collection_name=self.collection_name)
+
+    async def list(self, filters: dict = None, limit: int = 100) -> list:
+        """
+        List all vectors in a collection.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            list: List of vectors.
+        """
+        await self._ensure_col()
+        result = await self._call(
+            "scroll",
+            collection_name=self.collection_name,
+            scroll_filter=self._create_filter(filters) if filters else None,
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return result[0]
+
+    async def list_page(self, filters: dict = None, limit: int = 100, cursor=None) -> tuple:
+        """
+        List one page of vectors.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple: The page, and the next cursor or None after the last page.
+        """
+        await self._ensure_col()
+        points, next_offset = await self._call(
+            "scroll",
+            collection_name=self.collection_name,
+            scroll_filter=self._create_filter(filters) if filters else None,
+            limit=limit,
+            offset=cursor,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return points, next_offset
+
+    async def iter_list(self, filters: dict = None, page_size: int = 100):
+        """
+        Stream vectors page by page, holding one page in memory at a time.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            page_size (int, optional): Number of vectors per page. Defaults to 100.
+
+        Yields:
+            list: One page of vectors.
+        """
+        cursor = None
+        while True:
+            page, cursor = await self.list_page(filters=filters, limit=page_size, cursor=cursor)
+            if page:
+                yield page
+            if cursor is None:
+                return
+
+    async def reset(self):
+        """Reset the index by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        await self.delete_col()
+        await self._ensure_col()
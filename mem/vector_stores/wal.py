@@ -0,0 +1,169 @@
+from loguru import logger
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Record header: body length and crc32 of the body
+_HEADER = struct.Struct("<II")
+
+
+def write_atomic(path: str, data):
+    """Write ``data`` to ``path`` through a temporary file, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WriteAheadLog:
+    """
+    Append-only log of mutations, fsynced on every append.
+
+    Each record is a JSON header, optionally followed by float32 vectors, framed by its length and
+    crc32 so that a record torn by a crash is detected and dropped. The append handle also tells
+    which records have been applied: everything before its position was written or read here.
+    """
+
+    def __init__(self, path: str, dims: int):
+        self.path = path
+        self.dims = dims
+        self._file = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def open(self):
+        """Open the append handle, at the end of the log."""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "ab")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Close the log and delete its file."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def records(self, start: int = 0) -> Iterator[Tuple[Dict, Optional[np.ndarray]]]:
+        """
+        Read the records of the log.
+
+        A torn or corrupt tail, left by a crash in the middle of an append, is truncated.
+
+        Args:
+            start (int, optional): Offset of the first record to read. Defaults to 0.
+
+        Yields:
+            tuple: The record header and its vectors (or None).
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, crc = _HEADER.unpack_from(data, offset)
+            body = data[offset + _HEADER.size : offset + _HEADER.size + length]
+            if len(body) < length or zlib.crc32(body) != crc:
+                break
+
+            header, _, raw_vectors = body.partition(b"\n")
+            record = json.loads(header)
+            vectors = None
+            if raw_vectors:
+                vectors = np.frombuffer(raw_vectors, dtype=np.float32).reshape(-1, self.dims)
+            yield record, vectors
+            offset += _HEADER.size + length
+
+        if offset < len(data):
+            logger.warning(f"Truncating {len(data) - offset} bytes of incomplete log in {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(start + offset)
+
+    def append(self, record: Dict, vectors: Optional[np.ndarray] = None) -> int:
+        """
+        Append a record and fsync it.
+
+        Args:
+            record (Dict): JSON-serializable record header.
+            vectors (np.ndarray, optional): Vectors stored with the record.
+
+        Returns:
+            int: Size of the appended record in bytes.
+        """
+        body = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        if vectors is not None:
+            body += np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+
+        self.open()
+        self._file.write(_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return _HEADER.size + len(body)
+
+    def tell(self) -> int:
+        """Position of the append handle, 0 when it is not open."""
+        return self._file.tell() if self._file is not None else 0
+
+    def is_current(self) -> bool:
+        """Whether every record of the log has been written or read through this handle."""
+        if self._file is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return os.path.samestat(os.fstat(self._file.fileno()), stat) and stat.st_size == self._file.tell()
+
+    def seek_end(self):
+        """Mark every record of the log as applied; appends go to the end whatever the position."""
+        if self._file is not None:
+            self._file.seek(0, os.SEEK_END)
+
+    def applied_offset(self) -> int:
+        """
+        Offset up to which this handle has applied the log.
+
+        If another process replaced the log while truncating it, the handle is reopened on the new
+        file and 0 is returned, as none of its records are known to have been applied here.
+        """
+        if self._file is None:
+            return 0
+        if os.path.exists(self.path) and os.path.samestat(os.fstat(self._file.fileno()), os.stat(self.path)):
+            return self._file.tell()
+        self._file.close()
+        self._file = open(self.path, "ab")
+        return 0
+
+    def truncate(self, offset: int):
+        """
+        Drop the first ``offset`` bytes of the log, replacing the file atomically.
+
+        Args:
+            offset (int): Size of the log prefix covered by a checkpoint.
+        """
+        self.close()
+
+        tail = b""
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+
+        write_atomic(self.path, tail)
+        self.open()
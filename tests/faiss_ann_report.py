@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../')))
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from mem.vector_stores.faiss import FAISS, INDEX_TYPES
+
+
+def clustered_vectors(n, dims, n_clusters=64, seed=0):
+    """Random vectors grouped around centroids, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(n_clusters, dims)).astype(np.float32)
+    vectors = centroids[rng.integers(0, n_clusters, n)] + 0.3 * rng.normal(size=(n, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def report(num_vectors, dims, limit, pq_m, quantization=None):
+    """Print recall@limit and per-query latency of every FAISS index type on the same data."""
+    vectors = clustered_vectors(num_vectors, dims)
+    ids = [str(i) for i in range(num_vectors)]
+
+    for index_type in INDEX_TYPES:
+        with tempfile.TemporaryDirectory() as path:
+            store = FAISS(
+                collection_name="ann_report",
+                path=path,
+                distance_strategy="cosine",
+                embedding_model_dims=dims,
+                index_type=index_type,
+                ann_threshold=num_vectors + 1,
+                pq_m=pq_m,
+                quantization=quantization,
+            )
+            store.insert(vectors.tolist(), ids=ids)
+
+            t0 = time.time()
+            store.rebuild_index(index_type)
+            build_time = time.time() - t0
+            info = store.col_info()
+            print(
+                f"{index_type:<9} vectors={info['quantization'] or 'float32'} "
+                f"memory={info['vector_bytes'] / 2**20:.1f}MiB ({info['compression_ratio']:.1f}x) "
+                f"recall@10={info['quantization_recall']} reranked={info['reranked_recall']}"
+            )
+
+            for row in store.benchmark(limit=limit):
+                print(
+                    f"{row['index_type']:<9} build={build_time:7.2f}s {str(row['param']):<9} {str(row['value']):<5} "
+                    f"recall@{limit}={row['recall']:.3f} latency={row['latency_ms']:.3f}ms"
+                )
+            store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall vs latency report for the FAISS index types")
+    parser.add_argument("--num", type=int, default=50000)
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--pq_m", type=int, default=32)
+    parser.add_argument("--quantization", choices=["sq8", "fp16", "pq"], default=None)
+    args = parser.parse_args()
+    report(args.num, args.dims, args.limit, args.pq_m, args.quantization)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from mem.vector_stores.faiss import FAISS
+
+# Size of the vectors the vector store tests work with
+DIMS = 16
+
+
+@pytest.fixture
+def dims():
+    return DIMS
+
+
+@pytest.fixture
+def random_vectors():
+    """Seeded random float32 vectors: ``random_vectors(n, seed=0, centered=False)``, centered around 0 if asked."""
+
+    def build(n, seed=0, centered=False):
+        vectors = np.random.default_rng(seed).random((n, DIMS)).astype(np.float32)
+        return vectors - 0.5 if centered else vectors
+
+    return build
+
+
+@pytest.fixture
+def store_class():
+    """Store built by ``make_store``; test modules override it with the backend they cover."""
+    return FAISS
+
+
+@pytest.fixture
+def make_store(tmp_path, store_class):
+    """A store of ``store_class``: ``make_store(path=tmp_path, **kwargs)``, kwargs overriding the defaults."""
+
+    def build(path=None, **kwargs):
+        config = {
+            "collection_name": "memory_test",
+            "path": str(path or tmp_path),
+            "embedding_model_dims": DIMS,
+        }
+        config.update(kwargs)
+        return store_class(**config)
+
+    return build
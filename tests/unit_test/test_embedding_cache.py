@@ -0,0 +1,65 @@
+import numpy as np
+
+from mem.com.factory import EmbedderFactory
+from mem.embeddings.base import EmbeddingBase
+from mem.embeddings.cache import CachedEmbedding, EmbeddingCache
+from mem.embeddings.configs import BaseEmbedderConfig
+
+
+class CountingEmbedder(EmbeddingBase):
+    max_batch_size = 100
+
+    def __init__(self, config=None):
+        super().__init__(config or BaseEmbedderConfig(model="test", embedding_dims=4))
+        self.embedded = []
+
+    def embed(self, text, memory_action=None):
+        self.embedded.append(text)
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0, 0.5]
+
+
+def test_cache_embeds_each_text_once(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    embedder = CountingEmbedder()
+    cached = CachedEmbedding(embedder, EmbeddingCache(max_bytes=1 << 20, path=path), provider="test")
+
+    first = cached.embed_batch(["alpha", "beta", "alpha", " alpha\n", "caf\u0065\u0301"])
+    assert embedder.embedded == ["alpha", "beta", " alpha\n", "caf\u0065\u0301"]
+    assert first.dtype == np.float32 and np.array_equal(first[0], first[2])
+    assert not np.array_equal(first[0], first[3])
+    assert cached.embed("beta", "search") == first[1].tolist()
+    assert cached.embed("caf\u00e9") == first[4].tolist()
+    assert len(embedder.embedded) == 4
+    stats = cached.stats()
+    assert stats["misses"] == 4 and stats["memory_hits"] == 2
+
+    # Another process sharing the file finds the embeddings on disk
+    other_embedder = CountingEmbedder()
+    other = CachedEmbedding(other_embedder, EmbeddingCache(max_bytes=1 << 20, path=path), provider="test")
+    assert np.array_equal(other.embed_batch(["beta", "gamma"])[0], first[1])
+    assert other_embedder.embedded == ["gamma"]
+    assert other.stats()["disk_hits"] == 1
+
+    # Other models do not share entries
+    other_model = CachedEmbedding(CountingEmbedder(BaseEmbedderConfig(model="other", embedding_dims=4)), other.cache, provider="test")
+    other_model.embed("beta")
+    assert other_model.embedder.embedded == ["beta"]
+
+
+def test_memory_tier_is_bounded_and_factory_wraps(tmp_path):
+    cache = EmbeddingCache(max_bytes=3 * (16 + 64))
+    cached = CachedEmbedding(CountingEmbedder(), cache)
+    cached.embed_batch([str(i) for i in range(10)])
+    assert cache.stats()["entries"] == 3 and cache.nbytes <= cache.max_bytes
+
+    embedder = EmbedderFactory.create("openai", {"api_key": "test", "cache_path": str(tmp_path / "e.db")}, None)
+    assert isinstance(embedder, CachedEmbedding) and embedder.provider == "openai"
+    assert embedder.config.model == "text-embedding-3-small"
+
+
+def test_embed_unique_returns_embeddings_by_text():
+    embedder = CountingEmbedder()
+    embeddings = embedder.embed_unique(["alpha", "beta", "alpha"], "add")
+    assert embedder.embedded == ["alpha", "beta"]
+    assert embeddings == {"alpha": embedder.embed("alpha"), "beta": embedder.embed("beta")}
+    assert embedder.embed_unique([]) == {}
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 from mem.embeddings.configs import BaseEmbedderConfig
 from mem.embeddings.openai_em import OpenAIEmbedding
 
@@ -19,5 +21,29 @@ def test_embed():
     print(result)
 
 
+class FakeEmbeddings:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, input, model, dimensions):
+        self.requests.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), float(i)]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+def test_embed_batch_chunks_and_keeps_order():
+    embedder = OpenAIEmbedding(BaseEmbedderConfig(api_key="test", embedding_dims=2, batch_size=3, max_batch_tokens=12))
+    embedder.client = SimpleNamespace(embeddings=FakeEmbeddings())
+    texts = ["a" * n for n in range(1, 9)]
+
+    result = embedder.embed_batch(texts)
+    assert result.dtype.name == "float32"
+    assert result[:, 0].tolist() == [float(n) for n in range(1, 9)]
+    requests = sorted(embedder.client.embeddings.requests)
+    assert all(len(chunk) <= 3 and sum(map(len, chunk)) <= 12 for chunk in requests)
+    assert sum(map(len, requests)) == 8
+    assert embedder.embed_batch([]).shape == (0, 2)
+
+
 if __name__ == "__main__":
     test_embed()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from mem.com.factory import VectorStoreFactory
+from mem.vector_stores.cached import CachedVectorStore
+from mem.vector_stores.configs import VectorStoreConfig
+from mem.vector_stores.numpy_store import NumpyStore
+
+
+class CountingStore(NumpyStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.reads = 0
+
+    def search(self, *args, **kwargs):
+        self.reads += 1
+        return super().search(*args, **kwargs)
+
+    def list_page(self, *args, **kwargs):
+        self.reads += 1
+        return super().list_page(*args, **kwargs)
+
+
+def test_cache_serves_tenants_and_stays_consistent(random_vectors, dims):
+    backend = CountingStore(collection_name="mem", embedding_model_dims=dims)
+    vectors = random_vectors(30, centered=True)
+    payloads = [{"user_id": f"u{i % 3}", "type": "profile" if i % 2 else "facts", "data": str(i)} for i in range(30)]
+    ids = [f"m{i:02d}" for i in range(30)]
+    backend.insert(vectors.tolist(), payloads=payloads, ids=ids)
+    store = CachedVectorStore(backend=backend, max_bytes=1 << 20)
+
+    query = random_vectors(1, seed=1, centered=True)[0].tolist()
+    filters = {"user_id": "u1", "type": "profile"}
+    expected = backend.search("", query, limit=4, filters=filters)
+    hits = store.search("", query, limit=4, filters=filters)
+    assert [hit.id for hit in hits] == [hit.id for hit in expected]
+    assert np.allclose([hit.score for hit in hits], [hit.score for hit in expected], atol=1e-5)
+
+    reads = backend.reads
+    for _ in range(3):
+        store.search("", query, limit=4, filters=filters)
+        assert len(store.list(filters={"user_id": "u1"}, limit=100)) == 10
+    assert backend.reads == reads
+
+    # Writes go through to the backend and are reflected in the cached tenant
+    store.insert([query], payloads=[{"user_id": "u1", "type": "profile", "data": "new"}], ids=["new"])
+    store.update("m01", payload={"user_id": "u2", "type": "profile", "data": "moved"})
+    store.delete("m04")
+    for filters in ({"user_id": "u1"}, {"user_id": "u2"}):
+        cached = sorted(item.id for item in store.list(filters=filters, limit=100))
+        assert cached == sorted(item.id for item in backend.list(filters=filters, limit=100))
+    assert store.search("", query, limit=1, filters={"user_id": "u1"})[0].id == "new"
+    assert store.get("m01").payload["data"] == "moved"
+
+    # Tenants are evicted least recently used first once the budget is exceeded
+    store.max_bytes = store.tenants["u1"].nbytes + store.tenants["u2"].nbytes
+    store.list(filters={"user_id": "u0"}, limit=1)
+    assert list(store.tenants)[-1] == "u0" and len(store.tenants) < 3
+    assert store.nbytes == sum(tenant.nbytes for tenant in store.tenants.values()) <= store.max_bytes
+
+
+def test_factory_builds_cached_store(tmp_path, random_vectors, dims):
+    config = VectorStoreConfig(
+        provider="cached",
+        config={"backend": {"provider": "numpy", "config": {"collection_name": "mem", "path": str(tmp_path), "embedding_model_dims": dims}}},
+    )
+    assert config.config.collection_name == "mem"
+    store = VectorStoreFactory.create(config.provider, config.config)
+    store.insert(random_vectors(2, centered=True).tolist(), payloads=[{"user_id": "u"}, {"user_id": "v"}], ids=["a", "b"])
+    assert [item.id for item in store.list(filters={"user_id": "u"})] == ["a"]
+    assert store.collection_name == "mem"
+
+
+def test_cache_scores_with_the_backend_metric(make_store, random_vectors):
+    # FAISS defaults to euclidean distance, where lower scores are better
+    backend = make_store()
+    vectors = random_vectors(20, centered=True)
+    payloads = [{"user_id": f"u{i % 2}"} for i in range(20)]
+    backend.insert(vectors.tolist(), payloads=payloads, ids=[f"m{i:02d}" for i in range(20)])
+    store = CachedVectorStore(backend=backend)
+    assert store.distance == "euclidean"
+
+    query = random_vectors(1, seed=1, centered=True)[0].tolist()
+    expected = backend.search("", query, limit=5, filters={"user_id": "u1"})
+    hits = store.search("", query, limit=5, filters={"user_id": "u1"})
+    assert "u1" in store.tenants
+    assert [hit.id for hit in hits] == [hit.id for hit in expected]
+    assert np.allclose([hit.score for hit in hits], [hit.score for hit in expected], atol=1e-4)
+
+    # Thresholds are a maximum distance, as in the backend
+    threshold = hits[2].score
+    assert [hit.id for hit in store.search("", query, limit=5, filters={"user_id": "u1"}, threshold=threshold)] == [
+        hit.id for hit in hits[:3]
+    ]
+
+    with pytest.raises(ValueError):
+        CachedVectorStore(backend=backend, distance="cosine")
@@ -0,0 +1,360 @@
+import pickle
+import threading
+
+import faiss
+import numpy as np
+
+
+def test_update_does_not_leave_dead_hits(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, compact_threshold=1.0)
+    vectors = random_vectors(10)
+    store.insert(vectors.tolist(), payloads=[{"n": i} for i in range(10)], ids=[str(i) for i in range(10)])
+
+    # Move memory "0" far away; its old vector must not be returned any more
+    store.update("0", vector=(vectors[0] + 100).tolist(), payload={"n": 0})
+    hits = store.search("", vectors[0].tolist(), limit=10)
+    assert [hit.id for hit in hits].count("0") == 1
+    assert hits[0].id != "0"
+
+    info = store.col_info()
+    assert info["live"] == 10
+    assert info["dead"] == 1
+
+
+def test_compact_removes_dead_vectors(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, compact_threshold=1.0)
+    vectors = random_vectors(10)
+    store.insert(vectors.tolist(), ids=[str(i) for i in range(10)])
+    for i in range(4):
+        store.delete(str(i))
+
+    assert store.compact() == 4
+    info = store.col_info()
+    assert info["stored"] == 6
+    assert info["dead"] == 0
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.col_info()["live"] == 6
+    assert reloaded.get("0") is None
+    assert reloaded.get("5") is not None
+
+
+def test_log_is_replayed_without_checkpoint(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, checkpoint_interval=3600)
+    vectors = random_vectors(5)
+    store.insert(vectors.tolist(), payloads=[{"n": i} for i in range(5)], ids=[str(i) for i in range(5)])
+    store.delete("1")
+    store.update("2", payload={"n": "two"})
+
+    # Simulate a crash: open the same path again without closing the first store
+    recovered = make_store(tmp_path)
+    assert recovered.get("1") is None
+    assert recovered.get("2").payload == {"n": "two"}
+    assert recovered.col_info()["live"] == 4
+
+
+def test_checkpoint_truncates_log(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, checkpoint_interval=3600)
+    store.insert(random_vectors(3).tolist(), ids=["a", "b", "c"])
+    assert (tmp_path / "memory_test.wal").stat().st_size > 0
+
+    store.checkpoint()
+    assert (tmp_path / "memory_test.wal").stat().st_size == 0
+    assert make_store(tmp_path).col_info()["live"] == 3
+
+
+def test_stores_sharing_a_collection_see_each_other(tmp_path, make_store, random_vectors):
+    # Two instances on one path behave like two worker processes: separate locks and memory
+    first = make_store(tmp_path, checkpoint_interval=3600)
+    second = make_store(tmp_path, checkpoint_interval=3600)
+    vectors = random_vectors(21)
+    first.insert(vectors[:10].tolist(), ids=[str(i) for i in range(10)])
+    second.insert(vectors[10:20].tolist(), ids=[str(i) for i in range(10, 20)])
+
+    assert first.search("", vectors[15].tolist(), limit=1)[0].id == "15"
+    first.delete("15")
+    assert second.search("", vectors[15].tolist(), limit=1)[0].id != "15"
+
+    # A checkpoint by one drops log records the other has applied, but not later ones
+    second.checkpoint()
+    first.insert([vectors[20].tolist()], ids=["20"])
+    assert second.get("20") is not None
+    assert second.col_info()["live"] == first.col_info()["live"] == 20
+    assert make_store(tmp_path).col_info()["live"] == 20
+
+
+def test_concurrent_searches_and_writes(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, checkpoint_ops=50)
+    vectors = random_vectors(400)
+    store.insert(vectors[:200].tolist(), ids=[str(i) for i in range(200)])
+    errors = []
+
+    def search():
+        try:
+            for i in range(100):
+                hits = store.search("", vectors[i].tolist(), limit=3)
+                assert len(hits) == 3 and len({hit.id for hit in hits}) == 3
+        except Exception as e:
+            errors.append(e)
+
+    def write(offset):
+        try:
+            for i in range(offset, offset + 100, 10):
+                store.insert(vectors[i : i + 10].tolist(), ids=[str(j) for j in range(i, i + 10)])
+                store.delete(str(i - 200))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    threads += [threading.Thread(target=write, args=(offset,)) for offset in (200, 300)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert store.col_info()["live"] == 380
+    assert len(set(store.id_to_index.values())) == 380
+
+
+def test_filtered_search_returns_full_page_for_small_tenant(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(205)
+    payloads = [{"user_id": "big", "type": "facts"} for _ in range(200)]
+    payloads += [{"user_id": "small", "type": "facts" if i % 2 else "profile"} for i in range(5)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(205)])
+
+    hits = store.search("", vectors[0].tolist(), limit=5, filters={"user_id": "small"})
+    assert sorted(hit.id for hit in hits) == ["200", "201", "202", "203", "204"]
+
+    hits = store.search("", vectors[0].tolist(), limit=5, filters={"user_id": "small", "type": "facts"})
+    assert sorted(hit.id for hit in hits) == ["201", "203"]
+
+    store.update("201", payload={"user_id": "small", "type": "profile"})
+    store.delete("203")
+    assert store.search("", vectors[0].tolist(), limit=5, filters={"user_id": "small", "type": "facts"}) == []
+
+
+def test_search_batch_matches_single_searches(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(60)
+    payloads = [{"user_id": f"u{i % 3}"} for i in range(60)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(60)])
+    store.delete("9")
+
+    queries = random_vectors(4, seed=1).tolist()
+    filters = [{"user_id": "u0"}, None, {"user_id": "u0"}, {"user_id": "u1"}]
+    results = store.search_batch([""] * 4, queries, limits=[3, 5, 1, 2], filters=filters)
+    for query, limit, query_filters, hits in zip(queries, [3, 5, 1, 2], filters, results):
+        expected = store.search("", query, limit=limit, filters=query_filters)
+        assert [hit.id for hit in hits] == [hit.id for hit in expected]
+        assert len(hits) == limit
+
+    assert store.search_batch([], []) == []
+
+
+def test_threshold_search_prunes_far_vectors(tmp_path, make_store, random_vectors):
+    vectors = random_vectors(50)
+    query = vectors[0] + 0.01
+
+    store = make_store(tmp_path / "l2")
+    store.insert(vectors.tolist(), payloads=[{"user_id": "u"}] * 50, ids=[str(i) for i in range(50)])
+    distances = ((vectors - query) ** 2).sum(axis=1)
+    radius = float(np.sort(distances)[3:5].mean())
+    hits = store.search("", query.tolist(), limit=10, threshold=radius)
+    assert [hit.id for hit in hits] == [str(i) for i in np.argsort(distances)[:4]]
+    assert all(hit.score <= radius for hit in hits)
+    filtered = store.search("", query.tolist(), limit=10, filters={"user_id": "u"}, threshold=radius)
+    assert [hit.id for hit in filtered] == [hit.id for hit in hits]
+
+    # Cosine scores are similarities of normalized vectors, whatever the input norms
+    store = make_store(tmp_path / "cos", distance_strategy="cosine")
+    store.insert((vectors * 3).tolist(), ids=[str(i) for i in range(50)])
+    hit = store.search("", vectors[0].tolist(), limit=1, threshold=0.99)[0]
+    assert hit.id == "0" and abs(hit.score - 1.0) < 1e-5
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    assert len(store.search("", vectors[0].tolist(), limit=50, threshold=0.9)) == int((unit @ unit[0] >= 0.9).sum())
+
+
+def test_list_uses_payload_index_and_survives_reload(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    payloads = [{"user_id": f"u{i % 3}", "type": "profile", "data": str(i)} for i in range(30)]
+    store.insert(random_vectors(30).tolist(), payloads=payloads, ids=[str(i) for i in range(30)])
+    store.delete("3")
+    store.checkpoint()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.id_to_index == store.id_to_index
+    listed = reloaded.list(filters={"user_id": "u0", "type": "profile"}, limit=4)
+    assert [item.id for item in listed] == ["0", "6", "9", "12"]
+    assert len(reloaded.list(limit=100)) == 29
+
+
+def test_flat_index_is_upgraded_to_hnsw(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, index_type="hnsw", ann_threshold=500)
+    vectors = random_vectors(600)
+    payloads = [{"user_id": f"u{i % 10}"} for i in range(600)]
+    store.insert(vectors[:400].tolist(), payloads=payloads[:400], ids=[str(i) for i in range(400)])
+    assert store.col_info()["index_type"] == "flat"
+
+    store.insert(vectors[400:].tolist(), payloads=payloads[400:], ids=[str(i) for i in range(400, 600)])
+    store._rebuild_task.result()
+    assert store.col_info()["index_type"] == "hnsw"
+    assert store.search("", vectors[42].tolist(), limit=1, ef_search=128)[0].id == "42"
+    assert len(store.search("", vectors[42].tolist(), limit=10, filters={"user_id": "u2"})) == 10
+
+    report = store.benchmark(limit=5, ef_search_values=(16, 128), sample_size=20)
+    assert [row["value"] for row in report] == [16, 128]
+    assert report[-1]["recall"] > 0.9
+
+
+def test_quantized_index_reranks_with_full_vectors(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, quantization="sq8", ann_threshold=300)
+    vectors = random_vectors(400)
+    store.insert(vectors.tolist(), ids=[str(i) for i in range(400)])
+    store._rebuild_task.result()
+
+    info = store.col_info()
+    assert info["quantization"] == "sq8"
+    assert info["compression_ratio"] == 4.0
+    assert info["reranked_recall"] >= info["quantization_recall"]
+    assert store.search("", vectors[7].tolist(), limit=1)[0].id == "7"
+
+    store.delete("7")
+    store.compact()
+    store.insert([vectors[7].tolist()], ids=["new"])
+    store.close()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.col_info()["quantization"] == "sq8"
+    hit = reloaded.search("", vectors[7].tolist(), limit=1)[0]
+    assert hit.id == "new"
+    assert abs(hit.score) < 1e-3
+
+
+def test_mmap_store_keeps_writes_in_delta(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, mmap=True, mmap_delta_limit=150, checkpoint_interval=3600)
+    vectors = random_vectors(200)
+    payloads = [{"user_id": f"u{i % 2}"} for i in range(200)]
+    store.insert(vectors[:100].tolist(), payloads=payloads[:100], ids=[str(i) for i in range(100)])
+    assert store.col_info()["mmap"] and store.col_info()["delta"] == 100
+
+    store.insert(vectors[100:].tolist(), payloads=payloads[100:], ids=[str(i) for i in range(100, 200)])
+    store._rebuild_task.result()
+    store.checkpoint()
+    assert store.col_info()["mmap"] and store.col_info()["delta"] == 0
+
+    store.update("3", vector=vectors[150].tolist(), payload={"user_id": "u9"})
+    assert [hit.id for hit in store.search("", vectors[150].tolist(), limit=2)] in (["3", "150"], ["150", "3"])
+    assert store.search("", vectors[3].tolist(), limit=1)[0].id != "3"
+
+    # Another process opening the collection sees the base index and the logged delta
+    other = make_store(tmp_path, mmap=True)
+    assert other.get("3").payload == {"user_id": "u9"}
+    assert len(other.list(filters={"user_id": "u1"}, limit=200)) == 99
+
+    assert store.compact() == 1
+    assert store.col_info()["stored"] == 200
+
+
+def test_pickled_store_is_moved_to_payload_store(tmp_path, make_store, random_vectors, dims):
+    # Layout written by the original positional implementation: a flat index and a pickled
+    # (docstore, index_to_id) tuple, with position 1 left behind by a delete
+    vectors = random_vectors(3)
+    index = faiss.IndexFlatL2(dims)
+    index.add(vectors)
+    faiss.write_index(index, str(tmp_path / "memory_test.faiss"))
+    docstore = {"a": {"user_id": "u1", "data": "x"}, "c": {"user_id": "u2", "data": "z"}}
+    with open(tmp_path / "memory_test.pkl", "wb") as f:
+        pickle.dump((docstore, {0: "a", 2: "c"}), f)
+
+    store = make_store(tmp_path)
+    assert not (tmp_path / "memory_test.pkl").exists()
+    assert store.get("c").payload == {"user_id": "u2", "data": "z"}
+    assert [hit.id for hit in store.search("", vectors[1].tolist(), limit=2, filters={"user_id": "u1"})] == ["a"]
+
+    store.insert([vectors[1].tolist()], payloads=[{"user_id": "u1"}], ids=["b"])
+    store.close()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.col_info()["live"] == 3
+    assert [item.id for item in reloaded.list(filters={"user_id": "u1"})] == ["a", "b"]
+
+
+def test_iter_list_pages_through_everything(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(25)
+    payloads = [{"user_id": f"u{i % 2}"} for i in range(25)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(25)])
+
+    page, cursor = store.list_page(limit=10)
+    assert [hit.id for hit in page] == [str(i) for i in range(10)]
+
+    # Deleting an already listed vector does not shift the following pages
+    store.delete("3")
+    page, cursor = store.list_page(limit=10, cursor=cursor)
+    assert [hit.id for hit in page] == [str(i) for i in range(10, 20)]
+
+    pages = list(store.iter_list(filters={"user_id": "u0"}, page_size=4))
+    assert [len(page) for page in pages] == [4, 4, 4, 1]
+    assert {hit.id for page in pages for hit in page} == {str(i) for i in range(0, 25, 2)}
+
+
+def test_filtered_pages_follow_writes_made_during_the_walk(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(30)
+    store.insert(vectors[:20].tolist(), payloads=[{"user_id": f"u{i % 2}"} for i in range(20)], ids=[str(i) for i in range(20)])
+    assert store.list_page(limit=0) == ([], None)
+    assert store.list_page(filters={"user_id": "u0"}, limit=0) == ([], None)
+
+    page, cursor = store.list_page(filters={"user_id": "u0"}, limit=4)
+    assert [hit.id for hit in page] == ["0", "2", "4", "6"]
+
+    # Deleted and updated vectors drop out of the pages not listed yet, added ones show up
+    store.delete_many(["0", "8"])
+    store.update("10", payload={"user_id": "u1"})
+    store.insert(vectors[20:].tolist(), payloads=[{"user_id": "u0"}] * 10, ids=[str(i) for i in range(20, 30)])
+    listed = []
+    while cursor is not None:
+        page, cursor = store.list_page(filters={"user_id": "u0"}, limit=4, cursor=cursor)
+        listed.extend(hit.id for hit in page)
+    assert listed == ["12", "14", "16", "18"] + [str(i) for i in range(20, 30)]
+
+
+def test_batch_get_update_delete(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(6)
+    store.insert_many(vectors.tolist(), payloads=[{"n": i} for i in range(6)], ids=[str(i) for i in range(6)])
+
+    store.update_many(["1", "2"], vectors=[(vectors[5] + 50).tolist(), None], payloads=[{"n": 10}, {"n": 20}])
+    store.delete_many(["3", "4", "missing"])
+
+    results = store.get_many(["1", "2", "3", "missing"])
+    assert [result.payload if result else None for result in results] == [{"n": 10}, {"n": 20}, None, None]
+    assert store.search("", (vectors[5] + 50).tolist(), limit=1)[0].id == "1"
+    assert store.col_info()["live"] == 4
+
+    # The batched mutations replay from the log like single ones
+    store.close()
+    reopened = make_store(tmp_path)
+    assert [result.payload["n"] for result in reopened.get_many(["0", "1", "2", "5"])] == [0, 10, 20, 5]
+
+
+def test_stores_share_maintenance_threads(tmp_path, make_store, random_vectors):
+    stores = [make_store(tmp_path / str(n), compact_threshold=0.1) for n in range(5)]
+    for store in stores:
+        store.insert(random_vectors(10).tolist(), ids=[str(i) for i in range(10)])
+        store.delete_many(["0", "1"])
+
+    maintenance = stores[0]._maintenance
+    for store in stores:
+        assert store._maintenance is maintenance
+        store._compact_task.result()
+        assert store.col_info()["dead"] == 0
+    threads = [thread for thread in threading.enumerate() if thread.name.startswith(maintenance.name)]
+    assert len(threads) <= maintenance.workers
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("faiss-")]
+
+    for store in stores:
+        store.close()
+    assert make_store(tmp_path / "0").col_info()["live"] == 8
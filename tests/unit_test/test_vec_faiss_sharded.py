@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+
+from mem.vector_stores.faiss_sharded import ShardedFAISS
+
+
+@pytest.fixture
+def store_class():
+    return ShardedFAISS
+
+
+def test_each_tenant_gets_its_own_shard(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(30)
+    payloads = [{"user_id": f"u{i % 3}", "data": str(i)} for i in range(30)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(30)])
+
+    assert store.col_info()["shards"] == 3
+    hits = store.search("", vectors[4].tolist(), limit=5, filters={"user_id": "u1"})
+    assert hits[0].id == "4"
+    assert {hit.payload["user_id"] for hit in hits} == {"u1"}
+    assert store.search("", vectors[4].tolist(), limit=1, filters={"user_id": "nobody"}) == []
+    assert store.search("", vectors[5].tolist(), limit=1)[0].id == "5"
+
+    # Changing the shard key moves the memory to the other tenant's shard
+    store.update("4", vector=vectors[4].tolist(), payload={"user_id": "u2", "data": "4"})
+    assert store.get("4").payload["user_id"] == "u2"
+    assert [hit.id for hit in store.search("", vectors[4].tolist(), limit=1, filters={"user_id": "u2"})] == ["4"]
+    assert "4" not in [hit.id for hit in store.search("", vectors[4].tolist(), limit=10, filters={"user_id": "u1"})]
+
+    store.delete("4")
+    assert store.get("4") is None
+    assert len(store.list(filters={"user_id": "u0"})) == 10
+    assert len(store.list(limit=100)) == 29
+
+
+def test_cold_shards_are_evicted_and_reloaded(tmp_path, make_store, random_vectors):
+    # Each shard holds about 4 KiB; the budget fits two of them
+    store = make_store(tmp_path, memory_budget_mb=8 / 1024)
+    vectors = random_vectors(100)
+    for tenant in range(5):
+        rows = range(tenant * 20, tenant * 20 + 20)
+        store.insert(
+            vectors[rows.start : rows.stop].tolist(),
+            payloads=[{"user_id": f"u{tenant}"} for _ in rows],
+            ids=[str(i) for i in rows],
+        )
+
+    info = store.col_info()
+    assert info["shards"] == 5
+    assert info["loaded_shards"] <= 2
+    assert info["loaded_bytes"] <= info["memory_budget_bytes"]
+
+    results = store.search_batch(
+        ["", ""], [vectors[3].tolist(), vectors[85].tolist()], limits=1, filters=[{"user_id": "u0"}, {"user_id": "u4"}]
+    )
+    assert [hits[0].id for hits in results] == ["3", "85"]
+
+    store.close()
+    assert make_store(tmp_path).col_info()["count"] == 100
+
+
+def test_iter_list_walks_every_shard(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(30)
+    payloads = [{"user_id": f"u{i % 3}"} for i in range(30)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(30)])
+
+    pages = list(store.iter_list(page_size=7))
+    assert [len(page) for page in pages] == [7, 7, 7, 7, 2]
+    assert sorted(hit.id for page in pages for hit in page) == sorted(str(i) for i in range(30))
+
+
+def test_batch_updates_move_between_shards(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(4)
+    payloads = [{"user_id": "u0"}, {"user_id": "u0"}, {"user_id": "u1"}, {"user_id": "u1"}]
+    store.insert(vectors.tolist(), payloads=payloads, ids=["a", "b", "c", "d"])
+
+    store.update_many(["a", "c"], vectors=[vectors[0].tolist(), None], payloads=[{"user_id": "u1"}, {"user_id": "u1", "x": 1}])
+    store.delete_many(["b", "d"])
+
+    assert [hit.payload for hit in store.get_many(["a", "b", "c"]) if hit] == [{"user_id": "u1"}, {"user_id": "u1", "x": 1}]
+    assert store.list(filters={"user_id": "u0"}) == []
+    assert {hit.id for hit in store.list(filters={"user_id": "u1"})} == {"a", "c"}
+
+
+def test_open_shards_are_capped_and_loaded_outside_the_lock(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path, max_open_shards=2)
+    vectors = random_vectors(40)
+    store.insert(vectors.tolist(), payloads=[{"user_id": f"u{i % 4}"} for i in range(40)], ids=[str(i) for i in range(40)])
+    for tenant in range(4):
+        store.search("", vectors[tenant].tolist(), limit=1, filters={"user_id": f"u{tenant}"})
+    assert store.col_info()["loaded_shards"] <= 2
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("faiss-")]
+
+    # While one shard loads slowly, callers of other shards go on and callers of the same shard wait for it
+    store.close()
+    loading, release = threading.Event(), threading.Event()
+    open_shard = store._open_shard
+
+    def slow_open(name):
+        if name == "t-u0":
+            loading.set()
+            release.wait(5)
+        return open_shard(name)
+
+    store._open_shard = slow_open
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(store.get("0"))) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    assert loading.wait(5)
+    assert store.get("1").payload == {"user_id": "u1"}
+    release.set()
+    for reader in readers:
+        reader.join()
+    assert [result.id for result in results] == ["0", "0"]
+    assert store._loading == {}
+
+
+def test_repeated_id_keeps_its_last_shard(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(2)
+    store.insert(vectors.tolist(), payloads=[{"user_id": "a"}, {"user_id": "b"}], ids=["x", "x"])
+    assert store.get("x").payload == {"user_id": "b"}
+    assert store.search("", vectors[0].tolist(), limit=5, filters={"user_id": "a"}) == []
+
+    store.delete("x")
+    assert store.list(limit=10) == []
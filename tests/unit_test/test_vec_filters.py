@@ -0,0 +1,83 @@
+from qdrant_client.models import FieldCondition, Filter, IsEmptyCondition
+
+from mem.vector_stores.faiss import FAISS
+from mem.vector_stores.filters import And, Eq, In, Not, Or, Range, compile_filter, matches, parse, to_milvus
+from mem.vector_stores.numpy_store import NumpyStore
+
+FILTERS = [
+    {"user_id": "u1"},
+    {"user_id": ["u0", "u2"], "type": "profile"},
+    {"timestamp": {"gte": 10, "lt": 20}},
+    {"user_id": "u1", "timestamp": {"gt": 25}, "note": {"exists": True}},
+    {"$or": [{"user_id": "u0"}, {"type": "facts", "note": "x"}]},
+    {"$not": {"user_id": "u1"}, "type": {"ne": "profile"}},
+    {"user_id": {"nin": ["u0"]}, "timestamp": {"lte": 5}},
+    {"note": {"exists": False}, "$or": [{"timestamp": {"gte": 35}}, {"user_id": "u2"}]},
+]
+
+
+def make_payloads(n):
+    payloads = []
+    for i in range(n):
+        payload = {"user_id": f"u{i % 3}", "type": "profile" if i % 2 else "facts", "timestamp": i}
+        if i % 4 == 0:
+            payload["note"] = "x"
+        payloads.append(payload)
+    return payloads
+
+
+def test_parse_and_compile():
+    node = parse({"user_id": ["a", "b"], "timestamp": {"gte": 1, "lt": 5}, "$or": [{"role": "user"}, {"$not": {"type": "x"}}]})
+    assert node == And(
+        (
+            In("user_id", ("a", "b")),
+            Range("timestamp", gte=1, lt=5),
+            Or((Eq("role", "user"), Not(Eq("type", "x")))),
+        )
+    )
+
+    expr = to_milvus(parse({"user_id": 'a"b', "role": {"ne": "user"}, "timestamp": {"gte": 1}}), frozenset({"user_id", "timestamp"}))
+    assert expr == '((user_id == "a\\"b") and (not (metadata["role"] == "user")) and (timestamp >= 1))'
+
+    qdrant_filter = compile_filter({"user_id": "a", "note": {"exists": True}}, "qdrant")
+    assert isinstance(qdrant_filter, Filter)
+    conditions = sorted(qdrant_filter.must, key=lambda condition: isinstance(condition, Filter))
+    assert isinstance(conditions[0], FieldCondition)
+    assert isinstance(conditions[1].must_not[0], IsEmptyCondition)
+    # The parsed filter is cached, but every caller gets its own Qdrant filter
+    again = compile_filter({"note": {"exists": True}, "user_id": "a"}, "qdrant")
+    assert again == qdrant_filter and again is not qdrant_filter
+    qdrant_filter.must.clear()
+    assert len(compile_filter({"user_id": "a", "note": {"exists": True}}, "qdrant").must) == 2
+
+    assert parse({"$and": [{}, {"user_id": "u"}]}) == Eq("user_id", "u")
+    for invalid in ({"timestamp": {"between": [1, 2]}}, {"$or": [{}, {"user_id": "u"}]}, {"$or": []}, {"$not": {}}):
+        try:
+            parse(invalid)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{invalid} must be rejected")
+
+
+def test_backends_agree_with_reference(tmp_path, random_vectors, dims):
+    payloads = make_payloads(40)
+    vectors = random_vectors(40)
+    ids = [str(i) for i in range(40)]
+    faiss_store = FAISS(
+        collection_name="filters",
+        path=str(tmp_path / "faiss"),
+        embedding_model_dims=dims,
+        indexed_fields=["user_id", "type", "timestamp"],
+    )
+    numpy_store = NumpyStore(collection_name="filters", path=str(tmp_path / "numpy"), embedding_model_dims=dims)
+    for store in (faiss_store, numpy_store):
+        store.insert(vectors.tolist(), payloads=payloads, ids=ids)
+
+    for filters in FILTERS:
+        expected = {str(i) for i, payload in enumerate(payloads) if matches(parse(filters), payload)}
+        assert expected, filters
+        for store in (faiss_store, numpy_store):
+            assert {item.id for item in store.list(filters=filters, limit=100)} == expected, (store, filters)
+            hits = store.search("", vectors[0].tolist(), limit=100, filters=filters)
+            assert {hit.id for hit in hits} == expected, (store, filters)
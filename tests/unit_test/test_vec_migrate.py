@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from mem.embeddings.base import EmbeddingBase
+from mem.vector_stores.faiss import FAISS
+from mem.vector_stores.migrate import Migration, MigrationConfig
+from mem.vector_stores.numpy_store import NumpyStore
+
+
+class FakeEmbedder(EmbeddingBase):
+    def __init__(self, dims):
+        super().__init__()
+        self.dims = dims
+
+    def embed(self, text, memory_action=None):
+        return np.random.default_rng(int(text)).random(self.dims).tolist()
+
+
+class FlakyTarget(NumpyStore):
+    fail_after = None
+
+    def insert_many(self, vectors, payloads=None, ids=None):
+        if self.fail_after is not None and self.fail_after <= 0:
+            raise RuntimeError("target went away")
+        if self.fail_after is not None:
+            self.fail_after -= 1
+        return super().insert_many(vectors, payloads=payloads, ids=ids)
+
+
+def make_config(tmp_path, dims, **kwargs):
+    cfg = {
+        "source": {"provider": "faiss", "config": {"collection_name": "src", "path": str(tmp_path / "src"), "embedding_model_dims": dims}},
+        "target": {"provider": "numpy", "config": {"collection_name": "dst", "path": str(tmp_path / "dst"), "embedding_model_dims": dims}},
+        "page_size": 7,
+        "embed_batch_size": 3,
+        "checkpoint_path": str(tmp_path / "checkpoint.json"),
+    }
+    cfg.update(kwargs)
+    return MigrationConfig(**cfg)
+
+
+def test_migration_copies_and_resumes(tmp_path, random_vectors, dims):
+    source = FAISS(collection_name="src", path=str(tmp_path / "src"), embedding_model_dims=dims)
+    vectors = random_vectors(50)
+    payloads = [{"user_id": f"u{i % 2}", "data": str(i)} for i in range(50)]
+    source.insert(vectors.tolist(), payloads=payloads, ids=[f"m{i:02d}" for i in range(50)])
+
+    target = FlakyTarget(collection_name="dst", path=str(tmp_path / "dst"), embedding_model_dims=dims)
+    target.fail_after = 2
+    config = make_config(tmp_path, dims, filters={"user_id": "u0"})
+    with pytest.raises(RuntimeError, match="target went away"):
+        Migration(config, source=source, target=target).run()
+    assert len(target.list(limit=100)) == 14
+
+    target.fail_after = None
+    result = Migration(config, source=source, target=target).run()
+    assert result["migrated"] == 25
+    copied = target.get_vectors([f"m{i:02d}" for i in range(0, 50, 2)])
+    expected = vectors[::2] / np.linalg.norm(vectors[::2], axis=1, keepdims=True)
+    assert np.allclose(copied, expected, atol=1e-5)
+    assert target.get("m01") is None
+    assert Migration(config, source=source, target=target).run()["seconds"] == 0.0
+
+    reembedded = NumpyStore(collection_name="dst", path=str(tmp_path / "dst2"), embedding_model_dims=dims)
+    config = make_config(tmp_path, dims, embedder={"provider": "openai", "config": {}}, checkpoint_path=None)
+    assert Migration(config, source=source, target=reembedded, embedder=FakeEmbedder(dims)).run()["migrated"] == 50
+    vector = np.asarray(FakeEmbedder(dims).embed("7"))
+    assert np.allclose(reembedded.get_vectors(["m07"])[0], vector / np.linalg.norm(vector), atol=1e-5)
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from mem.vector_stores.numpy_store import NumpyStore
+
+
+@pytest.fixture
+def store_class():
+    return NumpyStore
+
+
+def test_search_matches_brute_force(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(60, centered=True)
+    payloads = [{"user_id": f"u{i % 3}", "type": "profile" if i % 2 else "facts"} for i in range(60)]
+    store.insert(vectors.tolist(), payloads=payloads, ids=[str(i) for i in range(60)])
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = normalized[7]
+    rows = [i for i in range(60) if i % 3 == 1 and i % 2 == 1]
+    expected = sorted(rows, key=lambda i: -float(normalized[i] @ query))[:5]
+
+    hits = store.search("", vectors[7].tolist(), limit=5, filters={"user_id": "u1", "type": "profile"})
+    assert [hit.id for hit in hits] == [str(i) for i in expected]
+    assert abs(hits[0].score - 1.0) < 1e-5
+
+    batch = store.search_batch(["", ""], [vectors[7].tolist()] * 2, limits=[5, 3], filters=[{"user_id": "u1", "type": "profile"}, None])
+    assert [hit.id for hit in batch[0]] == [hit.id for hit in hits]
+    assert len(batch[1]) == 3
+
+    assert all(hit.score >= 0.5 for hit in store.search("", vectors[7].tolist(), limit=60, threshold=0.5))
+
+
+def test_writes_persist_and_reload(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(10, centered=True)
+    store.insert(vectors.tolist(), payloads=[{"user_id": f"u{i % 2}", "n": i} for i in range(10)], ids=[str(i) for i in range(10)])
+    store.delete_many(["0", "3"])
+    store.update("4", payload={"user_id": "u1", "n": 40})
+    store.update("5", vector=vectors[9].tolist())
+
+    reopened = make_store(tmp_path)
+    assert reopened.col_info()["count"] == 8
+    assert reopened.get("0") is None
+    assert reopened.get("4").payload == {"user_id": "u1", "n": 40}
+    assert {hit.id for hit in reopened.list(filters={"user_id": "u1"})} == {"1", "4", "5", "7", "9"}
+    assert reopened.search("", vectors[9].tolist(), limit=2, filters={"user_id": "u1"})[1].id in ("5", "9")
+
+    # Writing to a memory-mapped partition copies it to RAM first
+    reopened.insert([vectors[0].tolist()], payloads=[{"user_id": "u1"}], ids=["10"])
+    assert make_store(tmp_path).col_info()["count"] == 9
+
+
+def test_iter_list_pages_across_partitions(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    payloads = [{"user_id": f"u{i % 3}"} if i % 5 else {} for i in range(40)]
+    store.insert(random_vectors(40, centered=True).tolist(), payloads=payloads, ids=[f"{i:02d}" for i in range(40)])
+
+    pages = list(store.iter_list(page_size=6))
+    listed = [item.id for page in pages for item in page]
+    assert sorted(listed) == [f"{i:02d}" for i in range(40)]
+    assert all(len(page) <= 6 for page in pages)
+
+    page, cursor = store.list_page(filters={"user_id": "u1"}, limit=100)
+    assert cursor is None
+    assert {item.id for item in page} == {f"{i:02d}" for i in range(40) if i % 5 and i % 3 == 1}
+
+
+def test_writes_are_journaled_then_compacted(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(50, centered=True)
+    for i in range(50):
+        store.insert([vectors[i].tolist()], payloads=[{"user_id": f"u{i % 2}", "n": i}])
+    # Generated ids, appended to the journal without rewriting any partition
+    ids = [item.id for item in store.list(limit=100)]
+    assert len(set(ids)) == 50
+    assert not (tmp_path / "memory_test" / "manifest.json").exists()
+
+    store.insert([vectors[0].tolist(), vectors[1].tolist()], payloads=[{"user_id": "u0"}, {"user_id": "u0", "n": "last"}], ids=["x", "x"])
+    assert store.get("x").payload == {"user_id": "u0", "n": "last"}
+    store.compact()
+    assert (tmp_path / "memory_test" / "journal.wal").stat().st_size == 0
+    store.delete(ids[0])
+
+    reopened = make_store(tmp_path)
+    assert reopened.col_info()["count"] == 50
+    assert reopened.get(ids[0]) is None
+    assert reopened.search("", vectors[1].tolist(), limit=1, filters={"user_id": "u0"})[0].id in ("x", ids[1])
+
+
+def test_repeated_id_keeps_its_last_row_across_users(tmp_path, make_store, random_vectors):
+    store = make_store(tmp_path)
+    vectors = random_vectors(2, centered=True)
+    store.insert(vectors.tolist(), payloads=[{"user_id": "a"}, {"user_id": "b"}], ids=["x", "x"])
+    assert store.col_info()["count"] == 1
+    assert [(item.id, item.payload) for item in store.list()] == [("x", {"user_id": "b"})]
+    assert store.search("", vectors[0].tolist(), limit=5, filters={"user_id": "a"}) == []
+
+    store.delete("x")
+    assert store.list() == []
+    assert make_store(tmp_path).list() == []
+
+
+def test_stores_sharing_a_path_see_each_others_writes(tmp_path, make_store, random_vectors):
+    first, second = make_store(tmp_path), make_store(tmp_path)
+    vectors = random_vectors(20, centered=True)
+    first.insert(vectors[:10].tolist(), payloads=[{"user_id": "u0"}] * 10, ids=[str(i) for i in range(10)])
+    second.insert(vectors[10:].tolist(), payloads=[{"user_id": "u1"}] * 10, ids=[str(i) for i in range(10, 20)])
+    assert first.col_info()["count"] == 20
+    assert second.get("3").payload == {"user_id": "u0"}
+
+    # A compaction by one replaces the journal; the other loads the new snapshot
+    first.compact()
+    second.delete("3")
+    first.update("4", payload={"user_id": "u1"})
+    assert first.get("3") is None
+    assert {item.id for item in second.list(filters={"user_id": "u1"})} == {"4", *(str(i) for i in range(10, 20))}
+    assert make_store(tmp_path).col_info()["count"] == 19
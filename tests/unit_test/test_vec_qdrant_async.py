@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+
+from mem.vector_stores.qdrant import QdrantConfig
+from mem.vector_stores.qdrant_async import AsyncQdrant, close_clients
+
+
+def test_async_store_shares_client_and_filters(tmp_path):
+    config = QdrantConfig(collection_name="memory_test", embedding_model_dims=4, path=str(tmp_path))
+
+    async def run():
+        store = AsyncQdrant(**config.model_dump())
+        other = AsyncQdrant(**{**config.model_dump(), "collection_name": "other"})
+        assert store.client is other.client
+        assert store._local and other._local
+
+        await store.insert(
+            [[0.1, 0.2, 0.3, 0.4], [0.4, 0.3, 0.2, 0.1]],
+            payloads=[{"user_id": "u1", "data": "a"}, {"user_id": "u2", "data": "b"}],
+            ids=[1, 2],
+        )
+        single, batch = await asyncio.gather(
+            store.search("", [0.4, 0.3, 0.2, 0.1], filters={"user_id": "u1"}),
+            store.search_batch(["", ""], [[0.1, 0.2, 0.3, 0.4]] * 2, limits=[1, 2]),
+        )
+        await close_clients()
+        return single, batch
+
+    single, batch = asyncio.run(run())
+    assert [hit.id for hit in single] == [1]
+    assert [len(hits) for hits in batch] == [1, 2]
+
+
+def test_server_clients_are_pooled_per_event_loop():
+    for settings in ({"url": "https://qdrant.invalid:6333"}, {"host": "qdrant.invalid", "port": 6333, "prefer_grpc": True}):
+        config = QdrantConfig(collection_name="memory_test", embedding_model_dims=4, path=None, api_key="k", **settings)
+
+        async def clients():
+            first = AsyncQdrant(**config.model_dump())
+            second = AsyncQdrant(**{**config.model_dump(), "collection_name": "other"})
+            assert first.client is second.client and not first._local
+            return first.client
+
+        # A new loop gets its own client even if the previous loop did not close its clients
+        assert asyncio.run(clients()) is not asyncio.run(clients())
+
+
+class FlakyClient:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def get_collections(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise httpx.ConnectError("connection refused")
+        return "collections"
+
+
+def test_transient_errors_are_retried():
+    store = AsyncQdrant(collection_name="c", embedding_model_dims=4, client=FlakyClient(2), retry_backoff=0)
+    assert asyncio.run(store.list_cols()) == "collections"
+
+    store = AsyncQdrant(collection_name="c", embedding_model_dims=4, client=FlakyClient(5), max_retries=1, retry_backoff=0)
+    try:
+        asyncio.run(store.list_cols())
+    except httpx.ConnectError:
+        assert store.client.calls == 2
+    else:
+        raise AssertionError("errors beyond max_retries must be raised")